@@ -1,5 +1,7 @@
 from neo4j import GraphDatabase
+import neo4j.exceptions
 import csv
+from itertools import islice
 
 class Neo4jManager:
     def __init__(self, uri, user, password):
@@ -13,10 +15,18 @@ class Neo4jManager:
             result = session.run(query, params)
             return list(result)
 
-    def delete_all_nodes(self):
-        query = "MATCH (n) DETACH DELETE n"
-        self.execute_query(query)
-        print("All nodes and relationships have been deleted.")
+    def delete_all_nodes(self, batch_size=10000):
+        # A batch of nodes per transaction, so a large graph does not exhaust transaction memory
+        query = "MATCH (n) WITH n LIMIT $limit DETACH DELETE n RETURN count(*) AS deleted"
+        deleted = 0
+        with self.driver.session() as session:
+            while True:
+                count = session.execute_write(lambda tx: tx.run(query, limit=batch_size).single()['deleted'])
+                if not count:
+                    break
+                deleted += count
+                print(f"Deleted {deleted} nodes...")
+        print(f"All nodes and relationships have been deleted ({deleted} nodes).")
 
     def create_node(self, label, properties):
         query = f"CREATE (n:{label} $props) RETURN n"
@@ -59,22 +69,41 @@ class Neo4jManager:
         return node_properties
 
 
-    def download_nodes_as_csv(self, label):
-        query = f"MATCH (n:{label}) RETURN properties(n) AS props"
-        result = self.execute_query(query)
-        
-        if not result:
+    def get_node_property_keys(self, label, sample_size=1000):
+        # Header for an export: schema metadata, or the keys of a sample of nodes
+        try:
+            result = self.execute_query("""
+                CALL db.schema.nodeTypeProperties() YIELD nodeLabels, propertyName
+                WHERE $label IN nodeLabels AND propertyName IS NOT NULL
+                RETURN collect(DISTINCT propertyName) AS keys
+            """, {"label": label})
+            if result[0]["keys"]:
+                return sorted(result[0]["keys"])
+        except Exception:
+            pass
+        result = self.execute_query(f"""
+            MATCH (n:`{label}`)
+            WITH n LIMIT $sample_size
+            UNWIND keys(n) AS key
+            RETURN collect(DISTINCT key) AS keys
+        """, {"sample_size": sample_size})
+        return result[0]["keys"]
+
+    def download_nodes_as_csv(self, label, fetch_size=1000):
+        properties = self.get_node_property_keys(label)
+        if not properties:
             print(f"No nodes found with label '{label}'")
             return
 
-        properties = self.get_node_properties(label)
-        
-        with open(f'{label}.csv', 'w', newline='') as f:
-            writer = csv.DictWriter(f, fieldnames=properties)
-            writer.writeheader()
-            for record in result:
-                writer.writerow(record["props"])
-        
+        # Records are written as the cursor yields them, fetch_size at a time, instead of listing the label first
+        with self.driver.session(fetch_size=fetch_size) as session:
+            result = session.run(f"MATCH (n:`{label}`) RETURN properties(n) AS props")
+            with open(f'{label}.csv', 'w', newline='') as f:
+                writer = csv.DictWriter(f, fieldnames=properties, extrasaction='ignore')
+                writer.writeheader()
+                for record in result:
+                    writer.writerow(record["props"])
+
         print(f"Nodes with label '{label}' downloaded as CSV.")
 
     def download_nodes_as_csv_v1(self, label):
@@ -106,15 +135,34 @@ class Neo4jManager:
         result = self.execute_query(query)
         return [record["props"] for record in result]
 
-    def upload_csv_to_nodes(self, csv_file_name):
+    def create_unique_constraint(self, label, key):
+        try:
+            self.execute_query(f"CREATE CONSTRAINT IF NOT EXISTS FOR (n:`{label}`) REQUIRE n.`{key}` IS UNIQUE")
+        except neo4j.exceptions.CypherSyntaxError:
+            # Neo4j before 4.4 only knows the older syntax
+            self.execute_query(f"CREATE CONSTRAINT ON (n:`{label}`) ASSERT n.`{key}` IS UNIQUE")
+
+    def upload_csv_to_nodes(self, csv_file_name, key=None, batch_size=10000):
         label = csv_file_name.replace('.csv', '').capitalize()
-        
-        with open(csv_file_name, 'r') as f:
-            reader = csv.DictReader(f)
-            for row in reader:
-                self.create_node(label, row)
 
-        print(f"Data from '{csv_file_name}' uploaded as nodes with label '{label}'.")
+        # One UNWIND per batch_size rows in an explicit write transaction, instead of a CREATE per row
+        if key:
+            self.create_unique_constraint(label, key)
+            query = f"UNWIND $rows AS row MERGE (n:`{label}` {{`{key}`: row.`{key}`}}) SET n += row"
+        else:
+            query = f"UNWIND $rows AS row CREATE (n:`{label}`) SET n += row"
+
+        total = 0
+        with open(csv_file_name, 'r', newline='') as f, self.driver.session() as session:
+            reader = csv.DictReader(f)
+            while True:
+                rows = list(islice(reader, batch_size))
+                if not rows:
+                    break
+                session.execute_write(lambda tx: tx.run(query, rows=rows).consume())
+                total += len(rows)
+
+        print(f"Data from '{csv_file_name}' uploaded as {total} nodes with label '{label}'.")
 
     def display_node_structure(self, label):
         properties = self.get_node_properties(label)
@@ -6,10 +6,12 @@ from PyQt5.QtWidgets import (QApplication, QWidget, QLabel, QLineEdit, QPushButt
                              QVBoxLayout, QHBoxLayout, QTableWidget, QTableWidgetItem, 
                              QGroupBox, QTextEdit, QMessageBox, QComboBox, QProgressBar,
                              QMainWindow, QAction, QMenu, QDialog, QGridLayout, QInputDialog,
-                             QScrollArea, QDialogButtonBox)
-from PyQt5.QtCore import Qt, QSize
+                             QScrollArea, QDialogButtonBox, QCheckBox, QSpinBox)
+from PyQt5.QtCore import Qt, QSize, QThread, pyqtSignal
 import sqlparse
 import re
+import time
+from itertools import islice
 
 class QueryEditDialog(QDialog):
     def __init__(self, parent=None, query_text=""):
@@ -39,6 +41,7 @@ class DatabaseMigrationGUI(QMainWindow):
         self.neo4j_connections = self.load_neo4j_connections('neo4j.ini')
         self.saved_sql_queries = self.load_queries('sql.ini')
         self.saved_cypher_queries = self.load_queries('cypher.ini')
+        self.row_count_worker = None
         self.load_style('style_light.ini')  # Load the style
         self.initUI()
 
@@ -105,11 +108,43 @@ class DatabaseMigrationGUI(QMainWindow):
         self.migrate_all_button.clicked.connect(self.migrate_all_tables)
         migration_layout.addWidget(self.migrate_all_button)
 
+        self.batch_mode_checkbox = QCheckBox("Batched writes")
+        self.batch_mode_checkbox.setChecked(True)
+        migration_layout.addWidget(self.batch_mode_checkbox)
+
+        migration_layout.addWidget(QLabel("Batch size:"))
+        self.batch_size_spin = QSpinBox()
+        self.batch_size_spin.setRange(1, 100000)
+        self.batch_size_spin.setValue(5000)
+        migration_layout.addWidget(self.batch_size_spin)
+
+        self.stream_reads_checkbox = QCheckBox("Stream reads")
+        self.stream_reads_checkbox.setChecked(True)
+        migration_layout.addWidget(self.stream_reads_checkbox)
+
+        migration_layout.addWidget(QLabel("Fetch size:"))
+        self.itersize_spin = QSpinBox()
+        self.itersize_spin.setRange(100, 1000000)
+        self.itersize_spin.setValue(10000)
+        migration_layout.addWidget(self.itersize_spin)
+
+        migration_layout.addWidget(QLabel("Parallel tables:"))
+        self.parallel_tables_spin = QSpinBox()
+        self.parallel_tables_spin.setRange(1, 32)
+        self.parallel_tables_spin.setValue(4)
+        migration_layout.addWidget(self.parallel_tables_spin)
+
         main_layout.addLayout(migration_layout)
 
         self.progress_bar = QProgressBar(self)
         main_layout.addWidget(self.progress_bar)
 
+        # Live per-table status of "Migrate all tables"
+        self.migration_status_table = QTableWidget(0, 5)
+        self.migration_status_table.setHorizontalHeaderLabels(["table", "est. rows", "status", "migrated", "rows/sec"])
+        self.migration_status_table.hide()
+        main_layout.addWidget(self.migration_status_table)
+
         welcome_text = ("Welcome to PostgreSQL to Neo4j migration tool.\n"
                         "Test connection to each DBMS and select a table to migrate or migrate all tables:")
         welcome_label = QLabel(welcome_text)
@@ -338,6 +373,17 @@ class DatabaseMigrationGUI(QMainWindow):
         if self.neo4j_connections:
             self.update_neo4j_fields(next(iter(self.neo4j_connections)))
 
+        # Property discovery: schema metadata by default, or the keys of a few nodes per label
+        sample_layout = QHBoxLayout()
+        self.neo_sample_checkbox = QCheckBox("Sample properties")
+        sample_layout.addWidget(self.neo_sample_checkbox)
+        sample_layout.addWidget(QLabel("Nodes per label:"))
+        self.neo_sample_spin = QSpinBox()
+        self.neo_sample_spin.setRange(1, 1000000)
+        self.neo_sample_spin.setValue(1000)
+        sample_layout.addWidget(self.neo_sample_spin)
+        layout.addLayout(sample_layout)
+
         self.neo_test_btn = QPushButton("Test Connection")
         self.neo_test_btn.clicked.connect(self.test_neo_connection)
         layout.addWidget(self.neo_test_btn)
@@ -503,45 +549,53 @@ class DatabaseMigrationGUI(QMainWindow):
 
             cur = conn.cursor()
 
-            # Step 1: Get table names and column counts
+            # Table names, column counts and planner row estimates in one query.
+            # reltuples is -1 until the table is first analyzed; the stats collector covers that case.
             self.status_box.append("Fetching table information...")
             QApplication.processEvents()
             cur.execute("""
-                SELECT table_name, COUNT(column_name) as column_count
-                FROM information_schema.columns
-                WHERE table_schema = 'public'
-                GROUP BY table_name
-                ORDER BY table_name ASC
+                SELECT col.table_name, COUNT(col.column_name) AS column_count,
+                       CASE WHEN c.reltuples >= 0 THEN c.reltuples::bigint
+                            ELSE pg_stat_get_live_tuples(c.oid) END AS estimate
+                FROM information_schema.columns col
+                LEFT JOIN pg_class c ON c.oid = format('%I.%I', col.table_schema, col.table_name)::regclass
+                WHERE col.table_schema = 'public'
+                GROUP BY col.table_schema, col.table_name, c.oid, c.reltuples
+                ORDER BY col.table_name ASC
             """)
             tables_info = cur.fetchall()
+            conn.close()
 
-            # Step 2: Get row counts for each table
-            table_row_counts = {}
-            for table_name, _ in tables_info:
-                self.status_box.append(f'Counting rows in table: "{table_name}"')
-                QApplication.processEvents()
-                cur.execute(f'SELECT COUNT(*) FROM "{table_name}"')
-                row_count = cur.fetchone()[0]
-                table_row_counts[table_name] = row_count
-
-            # Populate the table widget
+            # Populate the table widget with the estimates; exact counts follow from a background thread
             self.status_box.append("Populating table widget...")
             QApplication.processEvents()
-            for i, (table_name, column_count) in enumerate(tables_info):
-                row_count = table_row_counts.get(table_name, 0)
+            for i, (table_name, column_count, estimate) in enumerate(tables_info):
                 self.pg_table.insertRow(i)
                 self.pg_table.setItem(i, 0, QTableWidgetItem(table_name))
                 self.pg_table.setItem(i, 1, QTableWidgetItem(str(column_count)))
-                self.pg_table.setItem(i, 2, QTableWidgetItem(str(row_count)))
+                self.pg_table.setItem(i, 2, QTableWidgetItem(f"~{estimate or 0} (estimate)"))
                 self.table_dropdown.addItem(table_name)
-                self.status_box.append(f'Added table: "{table_name}"')
-                QApplication.processEvents()
 
-            conn.close()
-            self.status_box.append("PostgreSQL connection successful")
+            self.status_box.append(f"PostgreSQL connection successful: {len(tables_info)} tables")
+            self.start_row_counts([table_name for table_name, _, _ in tables_info])
         except Exception as e:
             self.status_box.append(f"PostgreSQL connection error: {str(e)}")
             
+    def start_row_counts(self, tables):
+        if self.row_count_worker is not None:
+            self.row_count_worker.counted.disconnect()
+            self.row_count_worker.requestInterruption()
+        self.row_count_worker = RowCountWorker(self.pg_connection_params(), tables, self)
+        self.row_count_worker.counted.connect(self.on_row_counted)
+        self.row_count_worker.log.connect(self.status_box.append)
+        self.row_count_worker.start()
+
+    def on_row_counted(self, table_name, row_count):
+        matches = self.pg_table.findItems(table_name, Qt.MatchExactly)
+        for item in matches:
+            if item.column() == 0:
+                self.pg_table.setItem(item.row(), 2, QTableWidgetItem(str(row_count)))
+
     def test_neo_connection(self):
         try:
             # Clear existing contents
@@ -558,33 +612,65 @@ class DatabaseMigrationGUI(QMainWindow):
             QApplication.processEvents()
 
             with driver.session() as session:
-                result = session.run("""
-                    CALL db.labels() YIELD label
-                    CALL apoc.cypher.run('MATCH (n:`' + label + '`) 
-                                        RETURN count(n) as nodeCount, 
-                                                size(apoc.coll.toSet(reduce(s = [], n IN collect(n) | s + keys(n)))) as propCount', 
-                                        {}) YIELD value
-                    RETURN label, value.nodeCount AS count, value.propCount AS propCount
-                    ORDER BY label ASC
-                """)
-                labels = list(result)
-                
+                labels = sorted(record['label'] for record in session.run("CALL db.labels() YIELD label"))
+
+                # Node counts of a single label come from the count store, without touching the nodes
+                counts = {}
+                for label in labels:
+                    counts[label] = session.run(f"MATCH (n:`{label}`) RETURN count(n) AS count").single()['count']
+
+                if self.neo_sample_checkbox.isChecked():
+                    properties = self.sample_neo4j_properties(session, labels, self.neo_sample_spin.value())
+                else:
+                    try:
+                        properties = self.neo4j_schema_properties(session)
+                    except Exception as e:
+                        self.status_box.append(f"db.schema.nodeTypeProperties() unavailable ({e}), sampling nodes instead")
+                        properties = self.sample_neo4j_properties(session, labels, self.neo_sample_spin.value())
+
                 self.status_box.append(f"Found {len(labels)} labels. Populating table...")
                 QApplication.processEvents()
 
-                for i, record in enumerate(labels):
+                for i, label in enumerate(labels):
                     self.neo_table.insertRow(i)
-                    self.neo_table.setItem(i, 0, QTableWidgetItem(record['label']))
-                    self.neo_table.setItem(i, 1, QTableWidgetItem(str(record['propCount'])))
-                    self.neo_table.setItem(i, 2, QTableWidgetItem(str(record['count'])))
-                    self.status_box.append(f"Added label: {record['label']}")
-                    QApplication.processEvents()
-            
+                    self.neo_table.setItem(i, 0, QTableWidgetItem(label))
+                    self.neo_table.setItem(i, 1, QTableWidgetItem(str(len(properties.get(label, ())))))
+                    self.neo_table.setItem(i, 2, QTableWidgetItem(str(counts[label])))
+
             driver.close()
             self.status_box.append("Neo4j connection successful")
         except Exception as e:
             self.status_box.append(f"Neo4j connection error: {e}")
 
+    @staticmethod
+    def neo4j_schema_properties(session):
+        # Label -> property names, from the schema metadata instead of scanning the nodes
+        properties = {}
+        result = session.run("""
+            CALL db.schema.nodeTypeProperties() YIELD nodeLabels, propertyName
+            RETURN nodeLabels, propertyName
+        """)
+        for record in result:
+            for label in record['nodeLabels']:
+                names = properties.setdefault(label, set())
+                if record['propertyName'] is not None:
+                    names.add(record['propertyName'])
+        return properties
+
+    @staticmethod
+    def sample_neo4j_properties(session, labels, sample_size):
+        # Keys of the first sample_size nodes per label; properties only found beyond the sample are missed
+        properties = {}
+        for label in labels:
+            result = session.run(f"""
+                MATCH (n:`{label}`)
+                WITH n LIMIT $sample_size
+                UNWIND keys(n) AS key
+                RETURN collect(DISTINCT key) AS keys
+            """, sample_size=sample_size)
+            properties[label] = set(result.single()['keys'])
+        return properties
+
     def test_neo_connection_v1(self):
         try:
             driver = GraphDatabase.driver(self.neo_inputs['url'].text(), 
@@ -761,19 +847,27 @@ class DatabaseMigrationGUI(QMainWindow):
         except Exception as e:
             self.status_box.append(f"Cypher Query Error: {str(e)}")
 
+    def pg_connection_params(self):
+        return {
+            'dsn': f"{self.pg_inputs['url'].text()}?client_encoding=utf8",
+            'user': self.pg_inputs['user'].text(),
+            'password': self.pg_inputs['password'].text()
+        }
+
+    def migration_options(self):
+        return {
+            'batch_mode': self.batch_mode_checkbox.isChecked(),
+            'batch_size': self.batch_size_spin.value(),
+            'stream_reads': self.stream_reads_checkbox.isChecked(),
+            'itersize': self.itersize_spin.value()
+        }
+
     def migrate_data(self, specific_table=None):
         self.status_box.append("Starting migration...")
         self.progress_bar.setValue(0)
         try:
             # PostgreSQL connection
-            # conn = psycopg2.connect(self.pg_inputs['url'].text(),
-            #                         user=self.pg_inputs['user'].text(),
-            #                         password=self.pg_inputs['password'].text())
-            pg_conn = psycopg2.connect(
-                f"{self.pg_inputs['url'].text()}?client_encoding=utf8",
-                user=self.pg_inputs['user'].text(),
-                password=self.pg_inputs['password'].text()
-            )
+            pg_conn = psycopg2.connect(**self.pg_connection_params())
 
             pg_cur = pg_conn.cursor()
 
@@ -795,46 +889,21 @@ class DatabaseMigrationGUI(QMainWindow):
 
             total_tables = len(tables)
             table_progress_step = 100 // total_tables if total_tables > 0 else 100
+            options = self.migration_options()
 
             with neo4j_driver.session() as neo4j_session:
                 for table_index, table in enumerate(tables):
                     table_name = table[0]
                     self.status_box.append(f'Migrating table: "{table_name}"')
 
-                    # Get data from PostgreSQL
-                    pg_cur.execute(f'SELECT * FROM "{table_name}"')
-                    rows = pg_cur.fetchall()
-
-                    # Get column names
-                    pg_cur.execute(f'SELECT column_name FROM information_schema.columns WHERE table_name = %s', (table_name,))
-                    columns = [col[0] for col in pg_cur.fetchall()]
-
-                    # Migrate data to Neo4j
-                    total_rows = len(rows)
-                    update_interval = max(1, total_rows // 10)  # Ensure we don't divide by zero
-
-                    for row_index, row in enumerate(rows):
-                        try:
-                            properties = dict(zip(columns, row))
-                            cypher_query = f'CREATE (n:`{table_name}` $properties)'
-                            neo4j_session.run(cypher_query, properties=properties)
-
-                            # Update progress
-                            row_progress = (row_index + 1) / total_rows
-                            overall_progress = (table_index * table_progress_step) + (row_progress * table_progress_step)
-                            self.progress_bar.setValue(int(overall_progress))
-                            
-                            # Update status at regular intervals
-                            if (row_index + 1) % update_interval == 0 or row_index == total_rows - 1:
-                                self.status_box.append(f'Migrated {row_index + 1}/{total_rows} rows from "{table_name}"')
-                            
-                            # Process events to keep the UI responsive
-                            QApplication.processEvents()
-                        except Exception as row_error:
-                            self.status_box.append(f'Error migrating row {row_index + 1} from "{table_name}": {str(row_error)}')
-                            # Optionally, you can choose to continue with the next row or break the loop
-
-                    self.status_box.append(f'Completed migrating {total_rows} rows from "{table_name}"')
+                    def on_progress(done, total_rows, table_index=table_index):
+                        row_progress = done / max(total_rows, done, 1)
+                        overall_progress = (table_index * table_progress_step) + (row_progress * table_progress_step)
+                        self.progress_bar.setValue(int(overall_progress))
+
+                    migration = TableMigration(table_name, options, log=self.status_box.append, progress=on_progress,
+                                               keep_alive=QApplication.processEvents)
+                    migration.run(pg_conn, neo4j_session)
             pg_conn.close()
             neo4j_driver.close()
             self.progress_bar.setValue(100)
@@ -852,7 +921,282 @@ class DatabaseMigrationGUI(QMainWindow):
         self.migrate_data(selected_table)
 
     def migrate_all_tables(self):
-        self.migrate_data()
+        self.status_box.append("Starting migration of all tables...")
+        self.progress_bar.setValue(0)
+        try:
+            pg_params = self.pg_connection_params()
+            pg_conn = psycopg2.connect(**pg_params)
+            pg_cur = pg_conn.cursor()
+            # Planner row estimates, largest first: the longest tables start immediately
+            # instead of being the last ones still running
+            pg_cur.execute("""
+                SELECT t.table_name, GREATEST(COALESCE(c.reltuples, 0), 0)::bigint AS estimate
+                FROM information_schema.tables t
+                LEFT JOIN pg_class c ON c.oid = format('%I.%I', t.table_schema, t.table_name)::regclass
+                WHERE t.table_schema = 'public'
+                ORDER BY estimate DESC, t.table_name ASC
+            """)
+            tables = pg_cur.fetchall()
+            pg_conn.close()
+        except Exception as e:
+            self.status_box.append(f"Migration error: {str(e)}")
+            return
+
+        if not tables:
+            self.status_box.append("No tables to migrate.")
+            return
+
+        self.neo4j_migration_driver = GraphDatabase.driver(self.neo_inputs['url'].text(),
+                                                           auth=(self.neo_inputs['user'].text(),
+                                                                 self.neo_inputs['password'].text()))
+        self.pending_tables = list(tables)
+        self.running_workers = {}
+        self.finished_tables = 0
+        self.total_tables = len(tables)
+        self.migration_pg_params = pg_params
+        self.migration_run_options = self.migration_options()
+
+        self.migration_status_table.setRowCount(len(tables))
+        self.migration_status_rows = {}
+        for i, (table_name, estimate) in enumerate(tables):
+            self.migration_status_rows[table_name] = i
+            self.migration_status_table.setItem(i, 0, QTableWidgetItem(table_name))
+            self.migration_status_table.setItem(i, 1, QTableWidgetItem(str(estimate)))
+            self.set_migration_status(table_name, "Queued", 0, 0)
+        self.migration_status_table.show()
+
+        self.migrate_all_button.setEnabled(False)
+        self.migrate_selected_button.setEnabled(False)
+        self.start_pending_tables()
+
+    def start_pending_tables(self):
+        while self.pending_tables and len(self.running_workers) < self.parallel_tables_spin.value():
+            table_name, _ = self.pending_tables.pop(0)
+            worker = TableMigrationWorker(self.migration_pg_params, self.neo4j_migration_driver, table_name,
+                                          self.migration_run_options)
+            worker.log.connect(self.status_box.append)
+            worker.progress.connect(self.on_table_progress)
+            worker.done.connect(self.on_table_done)
+            self.running_workers[table_name] = worker
+            self.set_migration_status(table_name, "Running", 0, 0)
+            worker.start()
+
+    def set_migration_status(self, table_name, status, migrated, rows_per_sec):
+        row = self.migration_status_rows[table_name]
+        self.migration_status_table.setItem(row, 2, QTableWidgetItem(status))
+        self.migration_status_table.setItem(row, 3, QTableWidgetItem(str(migrated)))
+        self.migration_status_table.setItem(row, 4, QTableWidgetItem(f"{rows_per_sec:,.0f}"))
+
+    def on_table_progress(self, table_name, done, rows_per_sec):
+        self.set_migration_status(table_name, "Running", done, rows_per_sec)
+
+    def on_table_done(self, table_name, migrated, rows_read, elapsed, error):
+        worker = self.running_workers.pop(table_name)
+        worker.wait()
+        rows_per_sec = migrated / elapsed if elapsed > 0 else 0
+        if error:
+            status = f"Error: {error}"
+        elif migrated == rows_read:
+            status = "OK"
+        else:
+            status = f"Partial ({migrated}/{rows_read})"
+        self.set_migration_status(table_name, status, migrated, rows_per_sec)
+
+        self.finished_tables += 1
+        self.progress_bar.setValue(int(self.finished_tables / self.total_tables * 100))
+        self.start_pending_tables()
+
+        if not self.running_workers and not self.pending_tables:
+            self.neo4j_migration_driver.close()
+            self.migrate_all_button.setEnabled(True)
+            self.migrate_selected_button.setEnabled(True)
+            self.status_box.append("Migration completed successfully.")
+
+
+class TableMigration:
+    """Copies one PostgreSQL table into Neo4j nodes labelled with the table name."""
+
+    def __init__(self, table_name, options, log=print, progress=None, keep_alive=None):
+        self.table_name = table_name
+        self.batch_mode = options.get('batch_mode', True)
+        self.batch_size = options.get('batch_size', 5000)
+        self.stream_reads = options.get('stream_reads', True)
+        self.itersize = options.get('itersize', 10000)
+        self.log = log
+        self.progress = progress
+        self.keep_alive = keep_alive
+        self.total_rows = 0
+        self.rows_read = 0
+        self.migrated = 0
+        self.elapsed = 0.0
+        self.last_reported = 0
+
+    def run(self, pg_conn, neo4j_session):
+        pg_cur = pg_conn.cursor()
+
+        # Get data from PostgreSQL
+        if self.stream_reads:
+            self.total_rows = self.estimate_row_count(pg_cur, self.table_name)
+            chunks = self.iter_table_chunks(pg_conn, self.table_name, self.batch_size, self.itersize)
+        else:
+            pg_cur.execute(f'SELECT * FROM "{self.table_name}"')
+            rows = pg_cur.fetchall()
+            # Column names in the same order as the SELECT * result
+            columns = [desc[0] for desc in pg_cur.description]
+            self.total_rows = len(rows)
+            chunks = [(columns, rows)]
+
+        # Migrate data to Neo4j
+        table_start = time.time()
+        for columns, rows in chunks:
+            if self.batch_mode:
+                self.migrated += self.write_rows_batched(neo4j_session, columns, rows, self.rows_read)
+            else:
+                self.migrated += self.write_rows_per_row(neo4j_session, columns, rows, self.rows_read)
+            self.rows_read += len(rows)
+        self.elapsed = time.time() - table_start
+        rows_per_sec = self.migrated / self.elapsed if self.elapsed > 0 else 0
+
+        self.log(f'Completed migrating {self.migrated}/{self.rows_read} rows from "{self.table_name}" '
+                 f'in {self.elapsed:.1f}s ({rows_per_sec:,.0f} rows/sec)')
+        return self.migrated
+
+    def on_progress(self, done):
+        total_rows = max(self.total_rows, done)
+        if self.progress:
+            self.progress(done, total_rows)
+
+        # Update status at regular intervals
+        update_interval = max(1, self.total_rows // 10)  # Ensure we don't divide by zero
+        if done // update_interval > self.last_reported // update_interval or done == self.total_rows:
+            self.log(f'Migrated {done}/{total_rows} rows from "{self.table_name}"')
+        self.last_reported = done
+
+        # Process events to keep the UI responsive
+        if self.keep_alive:
+            self.keep_alive()
+
+    @staticmethod
+    def estimate_row_count(pg_cur, table_name):
+        # Planner statistics; -1 (never analyzed) is treated as unknown
+        pg_cur.execute("SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass", (f'"{table_name}"',))
+        row = pg_cur.fetchone()
+        return max(row[0], 0) if row else 0
+
+    @staticmethod
+    def iter_table_chunks(pg_conn, table_name, chunk_size, itersize):
+        # Named (server-side) cursor: rows stay on the server and arrive itersize at a time,
+        # so only one chunk of the table is ever held in memory
+        with pg_conn.cursor(name=f"migrate_{table_name}") as cur:
+            cur.itersize = itersize
+            cur.execute(f'SELECT * FROM "{table_name}"')
+            columns = None
+            while True:
+                rows = list(islice(cur, chunk_size))
+                if not rows:
+                    break
+                if columns is None:
+                    columns = [desc[0] for desc in cur.description]
+                yield columns, rows
+        pg_conn.rollback()  # End the read transaction that held the cursor open
+
+    def write_rows_per_row(self, neo4j_session, columns, rows, offset, report=True):
+        # One CREATE per row; slow, but isolates the rows Neo4j rejects
+        migrated = 0
+        cypher_query = f'CREATE (n:`{self.table_name}` $properties)'
+        for row_index, row in enumerate(rows, start=offset):
+            try:
+                properties = dict(zip(columns, row))
+                neo4j_session.run(cypher_query, properties=properties)
+                migrated += 1
+            except Exception as row_error:
+                self.log(f'Error migrating row {row_index + 1} from "{self.table_name}": {str(row_error)}')
+
+            if report:
+                self.on_progress(row_index + 1)
+        return migrated
+
+    @staticmethod
+    def create_nodes_batch(tx, cypher_query, batch):
+        tx.run(cypher_query, rows=batch).consume()
+
+    def write_rows_batched(self, neo4j_session, columns, rows, offset):
+        # One UNWIND per chunk, each chunk in its own write transaction
+        migrated = 0
+        cypher_query = f'UNWIND $rows AS row CREATE (n:`{self.table_name}`) SET n = row'
+        for start in range(offset, offset + len(rows), self.batch_size):
+            chunk = rows[start - offset:start - offset + self.batch_size]
+            batch = [dict(zip(columns, row)) for row in chunk]
+            try:
+                neo4j_session.execute_write(self.create_nodes_batch, cypher_query, batch)
+                migrated += len(batch)
+            except Exception as batch_error:
+                self.log(f'Batch at row {start + 1} of "{self.table_name}" failed ({batch_error}), '
+                         f'retrying {len(chunk)} rows one by one')
+                migrated += self.write_rows_per_row(neo4j_session, columns, chunk, start, report=False)
+
+            self.on_progress(start + len(chunk))
+        return migrated
+
+
+class TableMigrationWorker(QThread):
+    log = pyqtSignal(str)
+    progress = pyqtSignal(str, int, float)  # table, rows migrated, rows/sec
+    done = pyqtSignal(str, int, int, float, str)  # table, migrated, rows read, elapsed, error
+
+    def __init__(self, pg_params, neo4j_driver, table_name, options):
+        super().__init__()
+        self.pg_params = pg_params
+        self.neo4j_driver = neo4j_driver
+        self.table_name = table_name
+        self.options = options
+        self.started_at = 0.0
+
+    def on_progress(self, done, total_rows):
+        elapsed = time.time() - self.started_at
+        self.progress.emit(self.table_name, done, done / elapsed if elapsed > 0 else 0.0)
+
+    def run(self):
+        self.started_at = time.time()
+        migration = TableMigration(self.table_name, self.options, log=self.log.emit, progress=self.on_progress)
+        error = ""
+        try:
+            # Each worker has its own PostgreSQL connection and Neo4j session; the driver is shared
+            pg_conn = psycopg2.connect(**self.pg_params)
+            try:
+                with self.neo4j_driver.session() as neo4j_session:
+                    migration.run(pg_conn, neo4j_session)
+            finally:
+                pg_conn.close()
+        except Exception as e:
+            error = str(e)
+            self.log.emit(f'Migration error in "{self.table_name}": {error}')
+        self.done.emit(self.table_name, migration.migrated, migration.rows_read, time.time() - self.started_at, error)
+
+class RowCountWorker(QThread):
+    log = pyqtSignal(str)
+    counted = pyqtSignal(str, int)  # table, exact row count
+
+    def __init__(self, pg_params, tables, parent=None):
+        super().__init__(parent)  # Owned by the window, so an interrupted worker can finish on its own
+        self.pg_params = pg_params
+        self.tables = tables
+
+    def run(self):
+        try:
+            pg_conn = psycopg2.connect(**self.pg_params)
+            pg_conn.autocommit = True
+            try:
+                with pg_conn.cursor() as cur:
+                    for table_name in self.tables:
+                        if self.isInterruptionRequested():
+                            break
+                        cur.execute(f'SELECT COUNT(*) FROM "{table_name}"')
+                        self.counted.emit(table_name, cur.fetchone()[0])
+            finally:
+                pg_conn.close()
+        except Exception as e:
+            self.log.emit(f"Row count error: {str(e)}")
 
 if __name__ == '__main__':
     app = QApplication(sys.argv)
@@ -2,6 +2,7 @@ import psycopg2
 from psycopg2 import OperationalError, DatabaseError
 from psycopg2.extensions import ISOLATION_LEVEL_AUTOCOMMIT
 import csv
+from pgload import load_csv
 
 class PostgreSQLManager:
     def __init__(self, dbname, user, password, host, port):
@@ -133,20 +134,14 @@ class PostgreSQLManager:
         
         print(f"Table '{table_name}' downloaded as CSV.")
 
-    def upload_csv_to_table(self, csv_file_name):
+    def upload_csv_to_table(self, csv_file_name, index_columns=()):
         table_name = csv_file_name.replace('.csv', '')
-        with open(csv_file_name, 'r') as f:
-            reader = csv.reader(f)
-            header = next(reader)
-            columns = ', '.join(header)
-
-        self.create_table(table_name, columns)
-
-        with self.connect() as conn:
-            with conn.cursor() as cur:
-                with open(csv_file_name, 'r') as f:
-                    cur.copy_expert(f'COPY "{table_name}" ({columns}) FROM STDIN CSV HEADER', f)
-        print(f'Data from "{csv_file_name}" uploaded to PostgreSQL table "{table_name}".')
+        conn = self.connect()
+        try:
+            rows = load_csv(conn, csv_file_name, table_name, index_columns=index_columns)
+        finally:
+            conn.close()
+        print(f'{rows} rows from "{csv_file_name}" uploaded to PostgreSQL table "{table_name}".')
 
     def list_tables(self):
         query = """
@@ -0,0 +1,84 @@
+import json
+import os
+import tempfile
+import threading
+import time
+
+from bson import ObjectId
+
+
+# Every store shares the state file, so they all share one lock as well
+STATE_LOCK = threading.Lock()
+
+
+class CheckpointStore:
+    """Per-table migration checkpoints kept in a local JSON state file."""
+
+    def __init__(self, path="migration_state.json"):
+        self.path = path
+        self.lock = STATE_LOCK
+
+    @staticmethod
+    def key(source_db, source_table, target_db, target_table):
+        return f"{source_db}.{source_table}->{target_db}.{target_table}".lower()
+
+    @staticmethod
+    def encode_watermark(value):
+        if isinstance(value, (int, float)) and not isinstance(value, bool):
+            return {'value': value, 'type': 'number'}
+        if isinstance(value, ObjectId):
+            return {'value': str(value), 'type': 'ObjectId'}
+        # Strings, UUIDs, dates...: PostgreSQL casts the text back to the key column type
+        return {'value': str(value), 'type': 'text'}
+
+    @staticmethod
+    def decode_watermark(data):
+        if data['type'] == 'ObjectId':
+            return ObjectId(data['value'])
+        return data['value']
+
+    def read_all(self):
+        if not os.path.exists(self.path):
+            return {}
+        with open(self.path, 'r', encoding='utf-8') as file:
+            return json.load(file)
+
+    def write_all(self, state):
+        # Write to a temp file first, so a crash mid-write never leaves a truncated state file
+        fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(self.path)),
+                                         prefix=os.path.basename(self.path), suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as file:
+                json.dump(state, file, indent=2)
+            os.replace(temp_path, self.path)
+        except Exception:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+
+    def load(self, key):
+        with self.lock:
+            checkpoint = self.read_all().get(key)
+        if checkpoint is None:
+            return None
+        checkpoint = dict(checkpoint)
+        checkpoint['watermark'] = self.decode_watermark(checkpoint['watermark'])
+        return checkpoint
+
+    def save(self, key, key_column, watermark, rows, migrated):
+        with self.lock:
+            state = self.read_all()
+            state[key] = {
+                'key_column': key_column,
+                'watermark': self.encode_watermark(watermark),
+                'rows': rows,
+                'migrated': migrated,
+                'updated': time.strftime('%Y-%m-%d %H:%M:%S'),
+            }
+            self.write_all(state)
+
+    def clear(self, key):
+        with self.lock:
+            state = self.read_all()
+            if state.pop(key, None) is not None:
+                self.write_all(state)
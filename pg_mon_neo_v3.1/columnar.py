@@ -0,0 +1,115 @@
+from datetime import date, datetime
+from decimal import Decimal
+
+import pytz
+from neo4j.time import DateTime, Date
+
+
+def neo4j_datetime_column(values):
+    converted = []
+    for value in values:
+        if value is not None:
+            value = value.to_native()
+            if value.tzinfo is None:
+                value = value.replace(tzinfo=pytz.UTC)
+        converted.append(value)
+    return converted
+
+
+def neo4j_date_column(values):
+    return [date(value.year, value.month, value.day) if value is not None else None for value in values]
+
+
+def decimal_float_column(values):
+    return [float(value) if value is not None else None for value in values]
+
+
+def decimal_number_column(values):
+    # Integral decimals become ints, the rest floats (same rule as custom_decimal_conversion)
+    return [None if value is None else int(value) if value.as_tuple().exponent >= 0 else float(value)
+            for value in values]
+
+
+def date_datetime_column(values):
+    return [datetime.combine(value, datetime.min.time()) if value is not None else None for value in values]
+
+
+# Target database -> {source value type: whole-column converter}.
+# Types not listed are passed through untouched, without visiting the values.
+COLUMN_CONVERTERS = {
+    "postgresql": {
+        DateTime: neo4j_datetime_column,
+        Date: neo4j_date_column,
+        Decimal: decimal_float_column,
+    },
+    "mongodb": {
+        Decimal: decimal_float_column,
+        date: date_datetime_column,
+    },
+    "neo4j": {
+        Decimal: decimal_number_column,
+    },
+}
+
+
+class ColumnBatch:
+    """A chunk of rows held column by column, so conversions run once per column instead of once per value."""
+
+    __slots__ = ("columns", "data")
+
+    def __init__(self, columns, data):
+        self.columns = columns
+        self.data = data
+
+    @classmethod
+    def from_rows(cls, rows, source_columns, target_columns):
+        if rows and isinstance(rows[0], dict):
+            data = [[row.get(col) for row in rows] for col in source_columns]
+        else:
+            # zip(*rows) transposes in C; extra trailing fields (e.g. a keyset watermark) are dropped
+            data = [list(values) for values in zip(*rows)][:len(target_columns)]
+            if not data:
+                data = [[] for _ in target_columns]
+        return cls(list(target_columns), data)
+
+    def __len__(self):
+        return len(self.data[0]) if self.data else 0
+
+    def convert(self, target_db, fallback, plan=None):
+        """Convert every column for target_db. Columns with a known type in the plan (typemap.ColumnMapping
+        per column) use its compiled converter. Otherwise a column holding a single value type gets that
+        type's column converter, and mixed columns fall back to the scalar converter."""
+        converters = COLUMN_CONVERTERS.get(target_db.lower(), {})
+        for i, values in enumerate(self.data):
+            mapping = plan[i] if plan else None
+            if mapping is not None and mapping.logical.name != "unknown":
+                if mapping.converter is not None:
+                    convert = mapping.converter
+                    self.data[i] = [convert(value) if value is not None else None for value in values]
+                continue
+
+            types = set(map(type, values))
+            types.discard(type(None))
+            if not types:
+                continue
+            if len(types) == 1:
+                value_type = types.pop()
+                if value_type in converters:
+                    self.data[i] = converters[value_type](values)
+                elif not any(issubclass(value_type, known) for known in converters):
+                    continue  # Nothing to convert in this column
+                else:
+                    self.data[i] = list(map(fallback, values))
+            else:
+                self.data[i] = list(map(fallback, values))
+        return self
+
+    def column(self, name):
+        return self.data[self.columns.index(name)]
+
+    def rows(self):
+        return zip(*self.data)
+
+    def to_dicts(self):
+        # Only for writers whose driver API takes one mapping per row
+        return [dict(zip(self.columns, values)) for values in zip(*self.data)]
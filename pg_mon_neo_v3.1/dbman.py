@@ -5,6 +5,9 @@ from psycopg2.extras import execute_values
 from neo4j import GraphDatabase
 from pymongo import MongoClient
 import csv
+from pgload import load_csv
+from sinks import delete_nodes_in_batches, ensure_unique_constraint
+from itertools import islice
 import configparser
 from colorama import init, Fore, Style
 
@@ -132,20 +135,14 @@ class PostgreSQLManager:
         
         print(f"Table '{table_name}' downloaded as CSV.")
 
-    def upload_csv_to_table(self, csv_file_name):
+    def upload_csv_to_table(self, csv_file_name, index_columns=()):
         table_name = csv_file_name.replace('.csv', '')
-        with open(csv_file_name, 'r') as f:
-            reader = csv.reader(f)
-            header = next(reader)
-            columns = ', '.join(header)
-
-        self.create_table(table_name, columns)
-
-        with self.connect() as conn:
-            with conn.cursor() as cur:
-                with open(csv_file_name, 'r') as f:
-                    cur.copy_expert(f'COPY "{table_name}" ({columns}) FROM STDIN CSV HEADER', f)
-        print(f'Data from "{csv_file_name}" uploaded to PostgreSQL table "{table_name}".')
+        conn = self.connect()
+        try:
+            rows = load_csv(conn, csv_file_name, table_name, index_columns=index_columns)
+        finally:
+            conn.close()
+        print(f'{rows} rows from "{csv_file_name}" uploaded to PostgreSQL table "{table_name}".')
 
     def display_table_structure(self, table_name):
         query = """
@@ -201,10 +198,11 @@ class Neo4jManager:
             result = session.run(query, params)
             return list(result)
 
-    def delete_all_nodes(self):
-        query = "MATCH (n) DETACH DELETE n"
-        self.execute_query(query)
-        print("All nodes and relationships have been deleted.")
+    def delete_all_nodes(self, batch_size=10000):
+        # A batch of nodes per transaction, so a large graph does not exhaust transaction memory
+        deleted = delete_nodes_in_batches(self.driver, batch_size=batch_size,
+                                          progress=lambda deleted: print(f"Deleted {deleted} nodes..."))
+        print(f"All nodes and relationships have been deleted ({deleted} nodes).")
 
     def create_node(self, label, properties):
         query = f"CREATE (n:{label} $props) RETURN n"
@@ -236,33 +234,68 @@ class Neo4jManager:
                     node_properties[key].append(value)
         return node_properties
 
-    def download_nodes_as_csv(self, label):
-        query = f"MATCH (n:{label}) RETURN properties(n) AS props"
-        result = self.execute_query(query)
-        
-        if not result:
+    def get_node_property_keys(self, label, sample_size=1000):
+        # Header for an export: schema metadata, or the keys of a sample of nodes
+        try:
+            result = self.execute_query("""
+                CALL db.schema.nodeTypeProperties() YIELD nodeLabels, propertyName
+                WHERE $label IN nodeLabels AND propertyName IS NOT NULL
+                RETURN collect(DISTINCT propertyName) AS keys
+            """, {"label": label})
+            if result[0]["keys"]:
+                return sorted(result[0]["keys"])
+        except Exception:
+            pass
+        result = self.execute_query(f"""
+            MATCH (n:`{label}`)
+            WITH n LIMIT $sample_size
+            UNWIND keys(n) AS key
+            RETURN collect(DISTINCT key) AS keys
+        """, {"sample_size": sample_size})
+        return result[0]["keys"]
+
+    def download_nodes_as_csv(self, label, fetch_size=1000):
+        properties = self.get_node_property_keys(label)
+        if not properties:
             print(f"No nodes found with label '{label}'")
             return
 
-        properties = self.get_node_properties(label)
-        
-        with open(f'{label}.csv', 'w', newline='') as f:
-            writer = csv.DictWriter(f, fieldnames=properties)
-            writer.writeheader()
-            for record in result:
-                writer.writerow(record["props"])
-        
+        # Records are written as the cursor yields them, fetch_size at a time, instead of listing the label first
+        with self.driver.session(fetch_size=fetch_size) as session:
+            result = session.run(f"MATCH (n:`{label}`) RETURN properties(n) AS props")
+            with open(f'{label}.csv', 'w', newline='') as f:
+                writer = csv.DictWriter(f, fieldnames=properties, extrasaction='ignore')
+                writer.writeheader()
+                for record in result:
+                    writer.writerow(record["props"])
+
         print(f"Nodes with label '{label}' downloaded as CSV.")
 
-    def upload_csv_to_nodes(self, csv_file_name):
+    def create_unique_constraint(self, label, key):
+        with self.driver.session() as session:
+            ensure_unique_constraint(session, label, key)
+
+    def upload_csv_to_nodes(self, csv_file_name, key=None, batch_size=10000):
         label = csv_file_name.replace('.csv', '').capitalize()
-        
-        with open(csv_file_name, 'r') as f:
+
+        # One UNWIND per batch_size rows in an explicit write transaction, instead of a CREATE per row
+        if key:
+            self.create_unique_constraint(label, key)
+            query = f"UNWIND $rows AS row MERGE (n:`{label}` {{`{key}`: row.`{key}`}}) SET n += row"
+        else:
+            query = f"UNWIND $rows AS row CREATE (n:`{label}`) SET n += row"
+
+        total = 0
+        with open(csv_file_name, 'r', newline='') as f, self.driver.session() as session:
             reader = csv.DictReader(f)
-            for row in reader:
-                self.create_node(label, row)
+            while True:
+                rows = list(islice(reader, batch_size))
+                if not rows:
+                    break
+                session.execute_write(lambda tx: tx.run(query, rows=rows).consume())
+                total += len(rows)
 
-        print(f"Data from '{csv_file_name}' uploaded as nodes with label '{label}'.")
+        print(f"Data from '{csv_file_name}' uploaded as {total} nodes with label '{label}'.")
 
     def display_node_structure(self, label):
         properties = self.get_node_properties(label)
@@ -0,0 +1,155 @@
+import codecs
+import csv
+import gzip
+import io
+import time
+
+
+COMPRESSIONS = {"None": "", "gzip": ".gz", "zstd": ".zst"}
+
+
+class ExportCancelled(Exception):
+    pass
+
+
+class ExportProgress:
+    """Row and byte counters of one export, reported at most every `interval` seconds.
+    Setting stop_event makes the next counter update raise ExportCancelled."""
+
+    def __init__(self, stop_event=None, callback=None, interval=0.5):
+        self.stop_event = stop_event
+        self.callback = callback
+        self.interval = interval
+        self.rows = 0
+        self.bytes = 0
+        self.last_report = 0.0
+
+    def add(self, rows=0, bytes_written=0):
+        self.rows += rows
+        self.bytes += bytes_written
+        if self.stop_event is not None and self.stop_event.is_set():
+            raise ExportCancelled()
+        if self.callback is not None and time.time() - self.last_report >= self.interval:
+            self.last_report = time.time()
+            self.callback(self.rows, self.bytes)
+
+
+class CountingFile(io.RawIOBase):
+    """Binary file wrapper that feeds the bytes it writes into an ExportProgress."""
+
+    def __init__(self, file, progress):
+        self.file = file
+        self.progress = progress
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self.file.write(data)
+        self.progress.add(bytes_written=len(data))
+        return len(data)
+
+    def close(self):
+        if not self.closed:
+            self.file.close()
+        super().close()
+
+
+def open_export_file(file_name, progress=None):
+    """Binary file for an export, compressed according to the extension (.gz or .zst)."""
+    if file_name.endswith(".gz"):
+        file = gzip.open(file_name, "wb")
+    elif file_name.endswith(".zst"):
+        try:
+            import zstandard
+        except ImportError:
+            raise RuntimeError("Writing .zst files requires the zstandard package (pip install zstandard)")
+        file = zstandard.ZstdCompressor().stream_writer(open(file_name, "wb"))
+    else:
+        file = open(file_name, "wb")
+    # Counts the CSV bytes produced, before compression
+    return CountingFile(file, progress) if progress is not None else file
+
+
+def copy_postgresql_csv(conn, table_name, file_name, columns=None, progress=None):
+    """Stream a table to CSV with COPY ... TO STDOUT: the server formats the rows and they go
+    straight to the (optionally compressed) file, so memory use does not depend on table size."""
+    columns_sql = ", ".join(f'"{col}"' for col in columns) if columns else "*"
+    try:
+        with open_export_file(file_name, progress) as file:
+            file.write(codecs.BOM_UTF8)  # Same utf-8-sig output as the pandas export, so Excel reads it as UTF-8
+            with conn.cursor() as cur:
+                cur.copy_expert(f'COPY (SELECT {columns_sql} FROM "{table_name}") TO STDOUT '
+                                f"WITH (FORMAT csv, HEADER, ENCODING 'UTF8')", file)
+                rows = cur.rowcount
+    except Exception:
+        conn.rollback()
+        raise
+    conn.commit()  # End the read transaction
+    if progress is not None:
+        progress.rows = rows  # COPY only reports the row count at the end
+    return rows
+
+
+def write_csv(file_name, header, records, progress=None):
+    """Write dict records under a fixed header; keys outside the header are left out."""
+    rows = 0
+    with io.TextIOWrapper(open_export_file(file_name, progress), encoding='utf-8-sig', newline='') as file:
+        writer = csv.DictWriter(file, fieldnames=header, extrasaction='ignore')
+        writer.writeheader()
+        for record in records:
+            writer.writerow(record)
+            rows += 1
+            if progress is not None:
+                progress.add(rows=1)
+    return rows
+
+
+def mongodb_field_names(collection):
+    # Union of top-level field names, computed by the server without shipping the documents
+    fields = [doc['_id'] for doc in collection.aggregate([
+        {'$project': {'fields': {'$objectToArray': '$$ROOT'}}},
+        {'$unwind': '$fields'},
+        {'$group': {'_id': '$fields.k'}},
+    ], allowDiskUse=True)]
+    return (['_id'] if '_id' in fields else []) + sorted(field for field in fields if field != '_id')
+
+
+def stream_mongodb_csv(collection, file_name, batch_size=1000, progress=None):
+    """Write a collection to CSV from its cursor, batch_size documents at a time. Returns the row count."""
+    header = mongodb_field_names(collection)
+    if not header:
+        raise ValueError("No documents found in the collection")
+    return write_csv(file_name, header, collection.find(batch_size=batch_size), progress)
+
+
+def neo4j_property_keys(session, label, sample_size=1000):
+    """CSV header for a label: property names from the schema procedure, or else the union
+    of the keys of the first sample_size nodes. Never reads the whole label."""
+    try:
+        keys = session.run("""
+            CALL db.schema.nodeTypeProperties() YIELD nodeLabels, propertyName
+            WHERE $label IN nodeLabels AND propertyName IS NOT NULL
+            RETURN collect(DISTINCT propertyName) AS keys
+        """, label=label).single()['keys']
+        if keys:
+            return sorted(keys)
+    except Exception:
+        pass  # Procedure unavailable or not permitted; sample instead
+    return session.run(f"""
+        MATCH (n:`{label}`)
+        WITH n LIMIT $sample_size
+        UNWIND keys(n) AS key
+        RETURN collect(DISTINCT key) AS keys
+    """, sample_size=sample_size).single()['keys']
+
+
+def stream_neo4j_csv(driver, label, file_name, fetch_size=1000, progress=None):
+    """Write a label to CSV straight from the Bolt cursor, fetch_size records at a time. Returns the row count."""
+    with driver.session(fetch_size=fetch_size) as session:
+        header = neo4j_property_keys(session, label)
+        if not header:
+            raise ValueError(f"No nodes found with label: {label}")
+
+        result = session.run(f"MATCH (n:`{label}`) RETURN properties(n) AS props")
+        return write_csv(file_name, header, (record['props'] for record in result), progress)
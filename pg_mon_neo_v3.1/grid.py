@@ -0,0 +1,280 @@
+import re
+
+import pymongo
+from bson import ObjectId
+from PyQt6.QtCore import Qt, QAbstractTableModel, QModelIndex, pyqtSignal
+
+
+PAGE_SIZE = 500
+
+FILTER_OPERATORS = ["=", "!=", ">", ">=", "<", "<=", "contains", "starts with"]
+
+
+class LazyTableModel(QAbstractTableModel):
+    """Read-only table model that pulls rows from the database a page at a time, as the view scrolls.
+
+    pages(sort, filters) returns a fetch_page(after, limit) callable for one query shape, where sort is
+    (column, descending) or None and filters is a list of (column, operator, text).
+    fetch_page returns (records, last_key): up to limit records (column -> value) following the key
+    `after` (None for the first page), and the key of the last record.
+    Columns come from `columns`, or from the keys of the first record when not given.
+    first_page is the (records, last_key) result of the first fetch when it was already read elsewhere.
+    """
+    error = pyqtSignal(str)
+
+    def __init__(self, pages, columns=None, page_size=PAGE_SIZE, first_page=None, parent=None):
+        super().__init__(parent)
+        self.pages = pages
+        self.columns = list(columns) if columns else []
+        self.page_size = page_size
+        self.sort_key = None
+        self.filters = []
+        self.fetch_page = pages(None, [])
+        self.last_key = None
+        self.exhausted = False
+        self.rows = self.fetch_next(first_page)
+
+    def fetch_next(self, page=None):
+        records, self.last_key = page if page is not None else self.fetch_page(self.last_key, self.page_size)
+        if len(records) < self.page_size:
+            self.exhausted = True
+        if records and not self.columns:
+            self.columns = list(records[0].keys())
+        return [[record.get(col) for col in self.columns] for record in records]
+
+    def requery(self):
+        # Sort and filter run in the database; start over from its first page
+        self.beginResetModel()
+        self.rows = []
+        self.last_key = None
+        self.exhausted = False
+        try:
+            self.fetch_page = self.pages(self.sort_key, self.filters)
+            self.rows = self.fetch_next()
+        except Exception as e:
+            self.exhausted = True
+            self.error.emit(str(e))
+        self.endResetModel()
+
+    def set_filters(self, filters):
+        self.filters = list(filters)
+        self.requery()
+
+    def sort(self, column, order=Qt.SortOrder.AscendingOrder):
+        if 0 <= column < len(self.columns):
+            sort_key = (self.columns[column], order == Qt.SortOrder.DescendingOrder)
+        else:
+            sort_key = None
+        if sort_key != self.sort_key:
+            self.sort_key = sort_key
+            self.requery()
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.columns)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid() or role not in (Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.ToolTipRole):
+            return None
+        value = self.rows[index.row()][index.column()]
+        return "" if value is None else str(value)
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if role != Qt.ItemDataRole.DisplayRole:
+            return None
+        if orientation == Qt.Orientation.Horizontal:
+            return self.columns[section] if section < len(self.columns) else None
+        return str(section + 1)
+
+    def canFetchMore(self, parent=QModelIndex()):
+        return not parent.isValid() and not self.exhausted
+
+    def fetchMore(self, parent=QModelIndex()):
+        if parent.isValid() or self.exhausted:
+            return
+        try:
+            rows = self.fetch_next()
+        except Exception as e:
+            # Exceptions must not escape a Qt virtual; stop paging and report instead
+            self.exhausted = True
+            self.error.emit(str(e))
+            return
+        if not rows:
+            return
+        self.beginInsertRows(QModelIndex(), len(self.rows), len(self.rows) + len(rows) - 1)
+        self.rows.extend(rows)
+        self.endInsertRows()
+
+
+def parse_filter_value(text):
+    # Filter bar text -> number/bool when it looks like one, so typed fields compare correctly
+    for convert in (int, float):
+        try:
+            return convert(text)
+        except ValueError:
+            pass
+    if text.lower() in ("true", "false"):
+        return text.lower() == "true"
+    return text
+
+
+def escape_like(text):
+    return re.sub(r"([\\%_])", r"\\\1", text)
+
+
+# Keyset pages. With a sort column the position is (sort value, key), the key breaking ties.
+# NULLs sort where each database puts them, and the page conditions follow that placement.
+
+def postgresql_pages(conn, table_name, key_column=None, sort=None, filters=()):
+    """Keyset pages ordered by the primary key, or by ctid for tables without a single-column key."""
+    key = f'"{key_column}"' if key_column else "ctid"
+    cast = "" if key_column else "::tid"
+
+    conditions, params = [], []
+    for column, operator, text in filters:
+        if operator == "contains":
+            conditions.append(f'"{column}"::text ILIKE %s')
+            params.append(f"%{escape_like(text)}%")
+        elif operator == "starts with":
+            conditions.append(f'"{column}"::text LIKE %s')
+            params.append(f"{escape_like(text)}%")
+        else:
+            # An untyped literal is cast to the column type, so an index on the column can be used
+            conditions.append(f'"{column}" {operator} %s')
+            params.append(text)
+
+    if sort:
+        sort_column, descending = sort
+        order = f'"{sort_column}" {"DESC" if descending else "ASC"} NULLS LAST, {key}'
+    else:
+        order = key
+
+    def fetch_page(after, limit):
+        where, where_params = list(conditions), list(params)
+        if after is not None and sort:
+            value, last_key = after
+            if value is None:
+                where.append(f'("{sort_column}" IS NULL AND {key} > %s{cast})')
+                where_params.append(last_key)
+            else:
+                where.append(f'("{sort_column}" {"<" if descending else ">"} %s '
+                             f'OR ("{sort_column}" = %s AND {key} > %s{cast}) OR "{sort_column}" IS NULL)')
+                where_params.extend([value, value, last_key])
+        elif after is not None:
+            where.append(f"{key} > %s{cast}")
+            where_params.append(after)
+        where_sql = f"WHERE {' AND '.join(where)} " if where else ""
+        try:
+            with conn.cursor() as cur:
+                cur.execute(f'SELECT {key}, * FROM "{table_name}" {where_sql}ORDER BY {order} LIMIT %s',
+                            where_params + [limit])
+                columns = [desc[0] for desc in cur.description[1:]]
+                rows = cur.fetchall()
+        except Exception:
+            conn.rollback()  # Do not leave the shared connection in an aborted transaction
+            raise
+        records = [dict(zip(columns, row[1:])) for row in rows]
+        if not rows:
+            return records, after
+        return records, ((records[-1][sort_column], rows[-1][0]) if sort else rows[-1][0])
+
+    return fetch_page
+
+
+def mongodb_filter(filters):
+    operators = {"!=": "$ne", ">": "$gt", ">=": "$gte", "<": "$lt", "<=": "$lte"}
+    clauses = []
+    for field, operator, text in filters:
+        if operator == "contains":
+            clauses.append({field: {'$regex': re.escape(text), '$options': 'i'}})
+        elif operator == "starts with":
+            clauses.append({field: {'$regex': f"^{re.escape(text)}"}})  # Anchored, so an index can be used
+        else:
+            value = ObjectId(text) if field == '_id' and ObjectId.is_valid(text) else parse_filter_value(text)
+            clauses.append({field: value} if operator == "=" else {field: {operators[operator]: value}})
+    return clauses
+
+
+def mongodb_pages(collection, sort=None, filters=()):
+    """Pages of a collection in _id order (or sort field, _id), each starting right after the last one seen."""
+    clauses = mongodb_filter(filters)
+    if sort:
+        field, descending = sort
+        order = [(field, pymongo.DESCENDING if descending else pymongo.ASCENDING), ('_id', pymongo.ASCENDING)]
+    else:
+        order = [('_id', pymongo.ASCENDING)]
+
+    def fetch_page(after, limit):
+        query = list(clauses)
+        if after is not None and sort:
+            # Missing/null values sort first ascending and last descending. Values compare within
+            # their BSON type, so a field holding mixed types only pages through the last seen type.
+            value, last_id = after
+            tie = {field: value, '_id': {'$gt': last_id}}
+            if descending:
+                query.append(tie if value is None else {'$or': [{field: {'$lt': value}}, tie, {field: None}]})
+            else:
+                query.append({'$or': [{field: {'$ne': None} if value is None else {'$gt': value}}, tie]})
+        elif after is not None:
+            query.append({'_id': {'$gt': after}})
+        query = {'$and': query} if len(query) > 1 else (query[0] if query else {})
+        documents = list(collection.find(query).sort(order).limit(limit))
+        if not documents:
+            return documents, after
+        last = documents[-1]
+        return documents, ((last.get(field), last['_id']) if sort else last['_id'])
+
+    return fetch_page
+
+
+def neo4j_pages(driver, label, sort=None, filters=()):
+    """Pages of a label in node id order (or property, id), using id(n) > $after instead of SKIP."""
+    conditions, params = [], {}
+    for i, (prop, operator, text) in enumerate(filters):
+        name = f"filter{i}"
+        if operator == "contains":
+            conditions.append(f"toLower(toString(n.`{prop}`)) CONTAINS toLower(${name})")
+            params[name] = text
+        elif operator == "starts with":
+            conditions.append(f"n.`{prop}` STARTS WITH ${name}")
+            params[name] = text
+        else:
+            conditions.append(f"n.`{prop}` {'<>' if operator == '!=' else operator} ${name}")
+            params[name] = parse_filter_value(text)
+
+    if sort:
+        sort_prop, descending = sort
+        order = f"n.`{sort_prop}` {'DESC' if descending else 'ASC'}, id(n)"
+    else:
+        order = "id(n)"
+
+    def fetch_page(after, limit):
+        where = list(conditions)
+        query_params = dict(params)
+        if after is not None and sort:
+            # Cypher sorts nulls last ascending and first descending
+            value, last_id = after
+            p = f"n.`{sort_prop}`"
+            if value is None:
+                where.append(f"({p} IS NOT NULL OR id(n) > $after)" if descending else f"({p} IS NULL AND id(n) > $after)")
+            elif descending:
+                where.append(f"({p} < $sort_value OR ({p} = $sort_value AND id(n) > $after))")
+            else:
+                where.append(f"({p} > $sort_value OR ({p} = $sort_value AND id(n) > $after) OR {p} IS NULL)")
+            query_params.update(sort_value=value, after=last_id)
+        elif after is not None:
+            where.append("id(n) > $after")
+            query_params['after'] = after
+        where_sql = f"WHERE {' AND '.join(where)} " if where else ""
+        with driver.session() as session:
+            result = session.run(f"MATCH (n:`{label}`) {where_sql}RETURN n, id(n) AS _id ORDER BY {order} LIMIT $limit",
+                                 query_params, limit=limit)
+            records = [(dict(record['n']), record['_id']) for record in result]
+        if not records:
+            return [], after
+        properties, last_id = records[-1]
+        return [props for props, _ in records], ((properties.get(sort_prop), last_id) if sort else last_id)
+
+    return fetch_page
@@ -0,0 +1,129 @@
+import csv
+import re
+
+import pandas as pd
+
+from columnar import ColumnBatch
+
+
+ENCODINGS = ['utf-8-sig', 'cp949', 'euc-kr']
+SNIFF_BYTES = 64 * 1024
+
+INTEGER_PATTERN = re.compile(r"^[+-]?(0|[1-9]\d*)$")  # Leading zeros (zip codes, ids) stay text
+FLOAT_PATTERN = re.compile(r"^[+-]?((0|[1-9]\d*)(\.\d*)?|\.\d+)([eE][+-]?\d+)?$")
+INTEGER_RANGE = (-2 ** 63, 2 ** 63 - 1)  # int64; longer digit strings stay text for MongoDB and Neo4j
+BOOLEANS = {"true": True, "false": False}
+
+# Inferred column type -> PostgreSQL column type
+POSTGRESQL_TYPES = {"integer": "BIGINT", "float": "DOUBLE PRECISION", "boolean": "BOOLEAN", "text": "TEXT"}
+
+
+def sniff_encoding(file_name, sample_bytes=SNIFF_BYTES):
+    """First of ENCODINGS that decodes the start of the file."""
+    with open(file_name, 'rb') as file:
+        head = file.read(sample_bytes)
+    for encoding in ENCODINGS:
+        try:
+            head.decode(encoding)
+            return encoding
+        except UnicodeDecodeError as e:
+            # A multi-byte character cut off by the end of the sample does not count
+            if len(head) == sample_bytes and e.start >= len(head) - 3:
+                return encoding
+    raise ValueError("Unable to decode the CSV file with supported encodings.")
+
+
+def sniff_dialect(file_name, encoding, sample_bytes=SNIFF_BYTES):
+    with open(file_name, 'r', encoding=encoding, errors='ignore', newline='') as file:
+        sample = file.read(sample_bytes)
+    try:
+        return csv.Sniffer().sniff(sample, delimiters=",;\t|")
+    except csv.Error:
+        return csv.excel
+
+
+def infer_type(values):
+    values = [value for value in values if value is not None]
+    if not values:
+        return "text"
+    if all(INTEGER_PATTERN.match(value) for value in values):
+        # Digit strings past int64 (long ids, card numbers) would lose digits as floats
+        return "integer" if all(is_integer(value) for value in values) else "text"
+    if all(FLOAT_PATTERN.match(value) for value in values):
+        return "float"
+    if all(value.lower() in BOOLEANS for value in values):
+        return "boolean"
+    return "text"
+
+
+def is_integer(value):
+    return bool(INTEGER_PATTERN.match(value)) and INTEGER_RANGE[0] <= int(value) <= INTEGER_RANGE[1]
+
+
+def to_integer(value):
+    if not is_integer(value):
+        raise ValueError(f"Not an int64 integer: {value}")
+    return int(value)
+
+
+def to_boolean(value):
+    return BOOLEANS[value.lower()] if value.lower() in BOOLEANS else value
+
+
+CONVERTERS = {"integer": to_integer, "float": float, "boolean": to_boolean}
+
+
+def convert_column(values, convert):
+    # Values after the sample that do not fit the inferred type are kept as text;
+    # a typed target rejects those rows instead of the whole upload failing
+    converted = []
+    for value in values:
+        if value is None:
+            converted.append(None)
+            continue
+        try:
+            converted.append(convert(value))
+        except ValueError:
+            converted.append(value)
+    return converted
+
+
+class CsvSource:
+    """A CSV file read chunk by chunk. Encoding and dialect are sniffed from the first
+    SNIFF_BYTES and column types inferred from the first sample_rows rows, so memory use
+    depends on chunk_size, not on the file size."""
+
+    def __init__(self, file_name, chunk_size=10000, sample_rows=1000):
+        self.file_name = file_name
+        self.chunk_size = chunk_size
+        self.encoding = sniff_encoding(file_name)
+        self.dialect = sniff_dialect(file_name, self.encoding)
+
+        sample = self.read(nrows=sample_rows)
+        self.columns = [str(col) for col in sample.columns]
+        self.types = {col: infer_type(self.column_values(sample, col)) for col in sample.columns}
+
+    def read(self, **kwargs):
+        # Every field is read as text (empty -> missing); types are applied by chunks()
+        return pd.read_csv(self.file_name, encoding=self.encoding, dialect=self.dialect, dtype=str,
+                           keep_default_na=False, na_values=[""], **kwargs)
+
+    @staticmethod
+    def column_values(frame, col):
+        return [None if pd.isna(value) else value for value in frame[col].tolist()]
+
+    def describe(self):
+        types = ", ".join(f"{col}: {self.types[col]}" for col in self.types)
+        return f"encoding {self.encoding}, delimiter {self.dialect.delimiter!r}, columns {types}"
+
+    def postgresql_columns(self):
+        return [(col, POSTGRESQL_TYPES[self.types[col]]) for col in self.types]
+
+    def chunks(self):
+        for frame in self.read(chunksize=self.chunk_size):
+            data = []
+            for col in frame.columns:
+                values = self.column_values(frame, col)
+                convert = CONVERTERS.get(self.types[col])
+                data.append(convert_column(values, convert) if convert else values)
+            yield ColumnBatch(list(self.columns), data)
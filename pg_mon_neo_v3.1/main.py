@@ -9,13 +9,13 @@ from datetime import date, datetime, timedelta
 import locale
 import time
 from decimal import Decimal
+from itertools import islice
 
 # Third-party library imports
 import psycopg2
-from neo4j import GraphDatabase
+from neo4j import GraphDatabase, Query
 import neo4j.exceptions
 import pymongo
-import pandas as pd
 import networkx as nx
 import pytz
 from neo4j.time import DateTime, Date
@@ -27,7 +27,7 @@ from PyQt6.QtWidgets import (
     QHeaderView, QPushButton, QFileDialog, QMessageBox,
     QPlainTextEdit, QDialog, QSizePolicy, QTabWidget,
     QProgressDialog, QGridLayout, QLineEdit, QCheckBox, QProgressBar,
-    QListWidget, QListWidgetItem
+    QListWidget, QListWidgetItem, QSpinBox, QTableView, QInputDialog
 )
 from PyQt6.QtWidgets import QAbstractItemView
 
@@ -35,7 +35,7 @@ from PyQt6.QtGui import (
     QAction, QColor, QBrush, QFont, QTextCharFormat, QSyntaxHighlighter, QPalette
 )
 from PyQt6.QtCore import (
-    Qt, QRegularExpression, QRect, QSize, QThread, pyqtSignal
+    Qt, QRegularExpression, QRect, QSize, QThread, QTimer, pyqtSignal
 )
 import os
 os.environ['QT_API'] = 'pyqt6'
@@ -46,10 +46,23 @@ import matplotlib.pyplot as plt
 from matplotlib.backends.backend_qtagg import FigureCanvasQTAgg as FigureCanvas
 
 # Local imports
-from util import DraggableGraph, CypherHighlighter, DbConfigEditor, MigrationReport, MigrationWorker, CsvHighlighter, CsvViewerDialog
+from util import DraggableGraph, CypherHighlighter, DbConfigEditor, DbTask, ExportScheduler, InterruptionEvent, Neo4jDeleteWorker, MigrationReport, MigrationScheduler, MigrationWorker, RowCountWorker, CsvHighlighter, CsvViewerDialog
+from export import COMPRESSIONS, copy_postgresql_csv, stream_mongodb_csv, stream_neo4j_csv
+from ingest import CsvSource
+from pgload import load_csv
+from grid import FILTER_OPERATORS, PAGE_SIZE, LazyTableModel, postgresql_pages, mongodb_pages, neo4j_pages
+from readers import ExportedSnapshot, iter_parallel
+import typemap
+from sinks import delete_nodes_in_batches, ensure_unique_constraint, AdaptiveBatchController, MongoDBBulkSink, Neo4jBatchSink
 import random
 
+
+DB_TASK_TIMEOUT = 600  # Seconds before a background database task is cancelled
+
+
 class DatabaseViewer(QMainWindow):
+    log_requested = pyqtSignal(str, str, str)  # category, message, level
+
     def __init__(self):
         super().__init__()
         self.setWindowTitle("Database Viewer")
@@ -65,10 +78,16 @@ class DatabaseViewer(QMainWindow):
         self.download_csv_btns = {}
         self.view_csv_btns = {}
         self.upload_csv_btns = {}
-        self.table_widgets = {}
+        self.table_views = {}
+        self.filter_columns = {}
+        self.filter_operators = {}
+        self.filter_values = {}
         self.log_texts = {}
         self.delete_btns = {}
         self.download_multiple_csv_btns = {}
+        self.export_parallel_spins = {}
+        self.export_schedulers = {}
+        self.neo4j_delete_workers = {}  # label -> Neo4jDeleteWorker
         self.upload_multiple_csv_btns = {}
 
         self.pg_conn = None
@@ -78,6 +97,15 @@ class DatabaseViewer(QMainWindow):
         self.mongo_db = None  # Add this line
         self.config = None
         self.worker = None
+        self.scheduler = None
+        self.migration_report = None
+        self.migration_snapshot = None
+        self.row_count_workers = {}  # purpose -> RowCountWorker refining estimated counts
+        self.db_tasks = {}  # (category, description) -> running DbTask
+        self.logged_mongodb_inserts = set()
+
+        # Messages logged from worker threads are re-delivered on the GUI thread
+        self.log_requested.connect(self.log_message)
         
         self.load_config()  # Load config first
         self.init_ui()  # Then initialize UI
@@ -99,6 +127,10 @@ class DatabaseViewer(QMainWindow):
 
 
     def log_message(self, category, message, level="INFO"):
+        if QThread.currentThread() != self.thread():
+            self.log_requested.emit(category, message, level)
+            return
+
         timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
         formatted_message = f"[{timestamp}] {level} - {category}: {message}"
         
@@ -211,6 +243,17 @@ class DatabaseViewer(QMainWindow):
         self.status_bar = QStatusBar()
         self.setStatusBar(self.status_bar)
 
+        # Busy indicator for database tasks running in the background
+        self.task_label = QLabel()
+        self.task_spinner = QProgressBar()
+        self.task_spinner.setRange(0, 0)
+        self.task_spinner.setMaximumWidth(120)
+        self.task_cancel_btn = QPushButton("Cancel")
+        self.task_cancel_btn.clicked.connect(self.cancel_db_tasks)
+        for widget in (self.task_label, self.task_spinner, self.task_cancel_btn):
+            self.status_bar.addPermanentWidget(widget)
+            widget.hide()
+
     def open_db_config_editor(self):
         self.log_message("UI", "Opening database configuration editor", "INFO")
         db_config_editor = DbConfigEditor()
@@ -239,27 +282,21 @@ class DatabaseViewer(QMainWindow):
         self.log_message(db_type, f"Reloading {db_type} connection...", "INFO")
         
         try:
+            # Connecting runs in the background and then reloads the item list and the current data
             if db_type == "PostgreSQL":
                 self.disconnect_postgresql()
                 self.connect_postgresql()
-                self.load_tables(db_type)
             elif db_type == "MongoDB":
                 self.disconnect_mongodb()
                 self.connect_mongodb()
-                self.load_collections(db_type)
             else:  # Neo4j
                 self.disconnect_neo4j()
                 self.connect_neo4j()
-                self.load_labels(db_type)
             
             self.update_db_info(db_type)
-            self.log_message(db_type, f"{db_type} connection reloaded successfully", "INFO")
         except Exception as e:
             self.log_message(db_type, f"Error reloading {db_type} connection: {str(e)}", "ERROR")
 
-        # Reload the current data
-        self.load_data(db_type)
-
     def reload_all(self):
         self.log_message("UI", "Reloading all database connections", "INFO")
         # Disconnect current database connections
@@ -268,16 +305,11 @@ class DatabaseViewer(QMainWindow):
         # Re-read the db.ini file
         self.load_config()
         
-        # Reconnect to databases
+        # Reconnect to databases; each tab is refreshed once its connection is up
         self.connect_to_databases()
         
-        # Refresh all tab contents
-        self.refresh_postgresql_tab()
-        self.refresh_mongodb_tab()
-        self.refresh_neo4j_tab()
-        
-        QMessageBox.information(self, "Reload Complete", "All database connections and tabs have been reloaded.")
-        self.log_message("UI", "All database connections and tabs reloaded", "INFO")
+        QMessageBox.information(self, "Reload Started", "Database connections are being reloaded; tabs refresh as each one connects.")
+        self.log_message("UI", "Reloading all database connections in the background", "INFO")
 
     def load_config(self):
         self.config = configparser.ConfigParser()
@@ -296,24 +328,47 @@ class DatabaseViewer(QMainWindow):
         self.connect_mongodb()
         self.connect_neo4j()
 
+    def open_postgresql_connection(self):
+        return psycopg2.connect(
+            host=self.config['postgresql']['host'],
+            port=self.config['postgresql']['port'],
+            database=self.config['postgresql']['database'],
+            user=self.config['postgresql']['user'],
+            password=self.config['postgresql']['password'],
+            client_encoding='utf8'
+        )
+
     def connect_postgresql(self):
-        try:
-            self.pg_conn = psycopg2.connect(
-                host=self.config['postgresql']['host'],
-                port=self.config['postgresql']['port'],
-                database=self.config['postgresql']['database'],
-                user=self.config['postgresql']['user'],
-                password=self.config['postgresql']['password'],
-                client_encoding='utf8'
-            )
+        def on_connected(conn):
+            self.pg_conn = conn
             self.pg_cur = self.pg_conn.cursor()
             self.update_db_info("PostgreSQL")
             self.log_message("PostgreSQL", "Connected to PostgreSQL successfully", "INFO")
             self.load_tables("PostgreSQL")
+
+        try:
+            self.run_db_task("PostgreSQL", "connecting to PostgreSQL", self.open_postgresql_connection, on_connected,
+                             discard=lambda conn: conn.close())
         except Exception as e:
             self.log_message("PostgreSQL", f"Error connecting to PostgreSQL: {str(e)}", "ERROR")
 
     def connect_mongodb(self):
+        def connect(mongodb_url):
+            client = pymongo.MongoClient(mongodb_url)
+            try:
+                client.admin.command('ping')  # MongoClient connects lazily; fail here rather than on first use
+            except Exception:
+                client.close()
+                raise
+            return client
+
+        def on_connected(client):
+            self.mongo_client = client
+            self.mongo_db = self.mongo_client[self.config['mongodb']['database']]
+            self.update_db_info("MongoDB")
+            self.log_message("MongoDB", "Connected to MongoDB successfully", "INFO")
+            self.load_collections("MongoDB")
+
         try:
             if self.config['mongodb']['host'] == 'localhost' or self.config['mongodb']['host'].startswith('127.0.0.1'):
                 # Local connection
@@ -321,29 +376,36 @@ class DatabaseViewer(QMainWindow):
             else:
                 # Remote connection
                 mongodb_url = f"mongodb+srv://{self.config['mongodb']['user']}:{urllib.parse.quote_plus(self.config['mongodb']['password'])}@{self.config['mongodb']['host']}/{self.config['mongodb']['database']}?retryWrites=true&w=majority"
-            self.mongo_client = pymongo.MongoClient(mongodb_url)
-            self.mongo_db = self.mongo_client[self.config['mongodb']['database']]
-            self.update_db_info("MongoDB")
-            self.log_message("MongoDB", "Connected to MongoDB successfully", "INFO")
-            self.load_collections("MongoDB")
+            self.run_db_task("MongoDB", "connecting to MongoDB", lambda: connect(mongodb_url), on_connected,
+                             discard=lambda client: client.close())
         except Exception as e:
             self.log_message("MongoDB", f"Error connecting to MongoDB: {str(e)}", "ERROR")
 
 
     def connect_neo4j(self):
-        try:
-            self.neo4j_driver = GraphDatabase.driver(
-                self.config['neo4j']['url'],
-                auth=(self.config['neo4j']['user'], self.config['neo4j']['password'])
-            )
-            # Test the connection
-            with self.neo4j_driver.session() as session:
-                session.run("RETURN 1")
+        def connect(url, auth):
+            driver = GraphDatabase.driver(url, auth=auth)
+            try:
+                # Test the connection
+                with driver.session() as session:
+                    session.run("RETURN 1").consume()
+            except Exception:
+                driver.close()
+                raise
+            return driver
+
+        def on_connected(driver):
+            self.neo4j_driver = driver
             self.update_db_info("Neo4j")
             self.log_message("Neo4j", "Connected to Neo4j successfully", "INFO")
             self.load_labels("Neo4j")
+
+        self.neo4j_driver = None  # Stays None until the connection test passes
+        try:
+            url, auth = self.config['neo4j']['url'], (self.config['neo4j']['user'], self.config['neo4j']['password'])
+            self.run_db_task("Neo4j", "connecting to Neo4j", lambda: connect(url, auth), on_connected,
+                             discard=lambda driver: driver.close())
         except Exception as e:
-            self.neo4j_driver = None  # Ensure driver is set to None on failure
             error_message = f"Error connecting to Neo4j: {str(e)}"
             self.log_message("Neo4j", error_message, "ERROR")
 
@@ -382,33 +444,116 @@ class DatabaseViewer(QMainWindow):
         self.disconnect_mongodb()
         self.disconnect_neo4j()
 
+    def run_db_task(self, category, description, fn, on_done, timeout=DB_TASK_TIMEOUT, cancel=None,
+                    on_failed=None, discard=None):
+        """Run fn() on a DbTask and hand its result to on_done on the GUI thread.
+        A task started with the same category and description replaces the running one. A task
+        still running after timeout seconds (None: no limit) is cancelled; the result of a cancelled
+        task is dropped, or passed to discard, e.g. to close a connection nobody wants any more."""
+        key = (category, description)
+        previous = self.db_tasks.get(key)
+        if previous is not None:
+            # Superseded: drop its result, but leave the statement alone, since on a shared
+            # connection a cancel request could reach the replacement's query instead
+            previous.cancel(abort=False)
+
+        task = DbTask(self, fn, f"{category}: {description}", cancel)
+        self.db_tasks[key] = task
+
+        def finish():
+            if self.db_tasks.get(key) is task:
+                del self.db_tasks[key]
+                self.update_task_status()
+
+        def on_task_done(result):
+            finish()
+            if not task.cancelled:
+                on_done(result)
+            elif discard is not None:
+                discard(result)
+
+        def on_task_failed(message):
+            finish()
+            if not task.cancelled:
+                self.log_message(category, f"Error {description}: {message}", "ERROR")
+                if on_failed is not None:
+                    on_failed(message)
+
+        task.done.connect(on_task_done)
+        task.failed.connect(on_task_failed)
+        task.finished.connect(task.deleteLater)
+        if timeout:
+            timer = QTimer(task)
+            timer.setSingleShot(True)
+            timer.timeout.connect(lambda: self.cancel_db_task(key, task, f"timed out after {timeout}s"))
+            timer.start(int(timeout * 1000))
+        task.start()
+        self.update_task_status()
+        return task
+
+    def run_postgresql_task(self, description, fn, on_done, **kwargs):
+        """run_db_task for fn(conn) on a PostgreSQL connection of its own, closed when fn returns.
+        A cancel or a failed statement then only touches that connection, never the shared self.pg_conn."""
+        conns = []
+
+        def run():
+            conns.append(self.open_postgresql_connection())
+            try:
+                return fn(conns[0])
+            finally:
+                conns[0].close()
+
+        def cancel():
+            for conn in conns:
+                conn.cancel()
+
+        return self.run_db_task("PostgreSQL", description, run, on_done, cancel=cancel, **kwargs)
+
+    def cancel_db_task(self, key, task, reason="cancelled"):
+        if self.db_tasks.get(key) is not task:
+            return  # Already finished
+        del self.db_tasks[key]
+        task.cancel()
+        self.log_message(key[0], f"{key[1].capitalize()} {reason}", "WARN")
+        self.update_task_status()
+
+    def cancel_db_tasks(self):
+        for key, task in list(self.db_tasks.items()):
+            self.cancel_db_task(key, task)
+
+    def update_task_status(self):
+        running = bool(self.db_tasks)
+        self.task_label.setText(", ".join(f"{task.description}..." for task in self.db_tasks.values()))
+        for widget in (self.task_label, self.task_spinner, self.task_cancel_btn):
+            widget.setVisible(running)
+
     def delete_item(self, db_type):
         selected_item = self.select_combos[db_type].currentText()
         if not selected_item:
             self.log_message(db_type, "No item selected for deletion", "WARN")
             return
 
+        if db_type.lower() == "neo4j":
+            # Large labels are deleted in batches by a background job
+            self.start_neo4j_label_delete(selected_item)
+            return
+
         try:
             if db_type.lower() == "postgresql":
                 self.delete_postgresql_table(selected_item)
-            elif db_type.lower() == "mongodb":
+            else:  # MongoDB
                 self.delete_mongodb_collection(selected_item)
-            else:  # Neo4j
-                self.delete_neo4j_label(selected_item)
 
             self.log_message(db_type, f"Deleted {selected_item}", "INFO")
 
-            # Clear the table widget
-            self.table_widgets[db_type].setRowCount(0)
-            self.table_widgets[db_type].setColumnCount(0)
+            # Clear the table view
+            self.table_views[db_type].setModel(None)
             
             # Refresh the combo box
             if db_type.lower() == "postgresql":
                 self.load_tables(db_type)
-            elif db_type.lower() == "mongodb":
+            else:  # MongoDB
                 self.load_collections(db_type)
-            else:  # Neo4j
-                self.load_labels(db_type)
 
         except Exception as e:
             self.log_message(db_type, f"Error deleting {selected_item}: {str(e)}", "ERROR")
@@ -420,39 +565,50 @@ class DatabaseViewer(QMainWindow):
     def delete_mongodb_collection(self, collection_name):
         self.mongo_db[collection_name].drop()
 
-    def delete_neo4j_label(self, label):
-        with self.neo4j_driver.session() as session:
-            session.run(f"MATCH (n:`{label}`) DETACH DELETE n")
-
-    def refresh_postgresql_tab(self):
-        try:
-            self.load_tables("PostgreSQL")
-            selected_table = self.select_combos["PostgreSQL"].currentText()
-            if selected_table:
-                self.load_postgresql_data(selected_table)
-            self.log_message("PostgreSQL", "PostgreSQL tab refreshed successfully", "INFO")
-        except Exception as e:
-            self.log_message("PostgreSQL", f"Error refreshing PostgreSQL tab: {str(e)}", "ERROR")
+    def start_neo4j_label_delete(self, label):
+        if label in self.neo4j_delete_workers:
+            self.log_message("Neo4j", f"{label} is already being deleted", "WARN")
+            return
 
-    def refresh_mongodb_tab(self):
         try:
-            self.load_collections("MongoDB")
-            selected_collection = self.select_combos["MongoDB"].currentText()
-            if selected_collection:
-                self.load_mongodb_data(selected_collection)
-            self.log_message("MongoDB", "MongoDB tab refreshed successfully", "INFO")
+            total = self.get_row_count("Neo4j", label)
         except Exception as e:
-            self.log_message("MongoDB", f"Error refreshing MongoDB tab: {str(e)}", "ERROR")
+            self.log_message("Neo4j", f"Error deleting {label}: {str(e)}", "ERROR")
+            return
 
-    def refresh_neo4j_tab(self):
-        try:
+        progress = QProgressDialog(f"Deleting {label}...", "Cancel", 0, max(total, 1), self)
+        progress.setWindowModality(Qt.WindowModality.NonModal)
+        progress.setAutoClose(False)
+        progress.setAutoReset(False)
+
+        worker = Neo4jDeleteWorker(self, self.neo4j_driver, label)
+        self.neo4j_delete_workers[label] = worker
+        started = time.time()
+
+        def on_progress(deleted):
+            progress.setValue(min(deleted, total))
+            elapsed = max(time.time() - started, 0.001)
+            progress.setLabelText(f"Deleting {label}... {deleted}/{total} nodes ({deleted / elapsed:.0f} nodes/s)")
+
+        def on_finished():
+            del self.neo4j_delete_workers[label]
+            progress.canceled.disconnect()  # Closing the dialog emits canceled
+            progress.close()
+            if worker.error_message:
+                self.log_message("Neo4j", f"Error deleting {label} after {worker.deleted} nodes: {worker.error_message}", "ERROR")
+            elif worker.cancelled:
+                self.log_message("Neo4j", f"Deleting {label} cancelled: {worker.deleted} nodes deleted", "WARN")
+            else:
+                self.log_message("Neo4j", f"Deleted {label}: {worker.deleted} nodes in {time.time() - started:.1f}s", "INFO")
+            if self.select_combos["Neo4j"].currentText() == label:
+                self.table_views["Neo4j"].setModel(None)
             self.load_labels("Neo4j")
-            selected_label = self.select_combos["Neo4j"].currentText()
-            if selected_label:
-                self.load_neo4j_data(selected_label)
-            self.log_message("Neo4j", "Neo4j tab refreshed successfully", "INFO")
-        except Exception as e:
-            self.log_message("Neo4j", f"Error refreshing Neo4j tab: {str(e)}", "ERROR")
+
+        worker.progress.connect(on_progress)
+        worker.finished.connect(on_finished)
+        progress.canceled.connect(worker.stop)
+        progress.show()
+        worker.start()
 
     def update_db_info(self, db_type):
         if db_type == "PostgreSQL":
@@ -525,6 +681,13 @@ class DatabaseViewer(QMainWindow):
         self.download_multiple_csv_btns[db_type].clicked.connect(lambda: self.log_message("UI", f"Download CSVs button clicked for {db_type}", "INFO"))
         select_layout.addWidget(self.download_multiple_csv_btns[db_type])
 
+        select_layout.addWidget(QLabel("Parallel:"))
+        self.export_parallel_spins[db_type] = QSpinBox()
+        self.export_parallel_spins[db_type].setRange(1, 32)
+        self.export_parallel_spins[db_type].setValue(4)
+        self.export_parallel_spins[db_type].setToolTip("Number of items Download CSVs exports at the same time")
+        select_layout.addWidget(self.export_parallel_spins[db_type])
+
         self.view_csv_btns[db_type] = QPushButton("View CSV")
         self.view_csv_btns[db_type].clicked.connect(lambda: self.view_csv(db_type))
         self.view_csv_btns[db_type].clicked.connect(lambda: self.log_message("UI", f"View CSV button clicked for {db_type}", "INFO"))
@@ -542,11 +705,34 @@ class DatabaseViewer(QMainWindow):
 
         layout.addLayout(select_layout)
 
-        # Table view
-        self.table_widgets[db_type] = QTableWidget()
-        self.table_widgets[db_type].setAlternatingRowColors(True)
-        self.table_widgets[db_type].setStyleSheet("""
-            QTableWidget {
+        # Filter bar: the condition is sent to the database with the page query
+        filter_layout = QHBoxLayout()
+        filter_layout.addWidget(QLabel("Filter:"))
+        self.filter_columns[db_type] = QComboBox()
+        filter_layout.addWidget(self.filter_columns[db_type])
+        self.filter_operators[db_type] = QComboBox()
+        self.filter_operators[db_type].addItems(FILTER_OPERATORS)
+        filter_layout.addWidget(self.filter_operators[db_type])
+        self.filter_values[db_type] = QLineEdit()
+        self.filter_values[db_type].setPlaceholderText("Value")
+        self.filter_values[db_type].returnPressed.connect(lambda: self.apply_filter(db_type))
+        filter_layout.addWidget(self.filter_values[db_type])
+        apply_filter_btn = QPushButton("Apply")
+        apply_filter_btn.clicked.connect(lambda: self.apply_filter(db_type))
+        filter_layout.addWidget(apply_filter_btn)
+        clear_filter_btn = QPushButton("Clear")
+        clear_filter_btn.clicked.connect(lambda: self.clear_filter(db_type))
+        filter_layout.addWidget(clear_filter_btn)
+        layout.addLayout(filter_layout)
+
+        # Table view, filled page by page by a LazyTableModel; header clicks sort in the database
+        self.table_views[db_type] = QTableView()
+        self.table_views[db_type].setAlternatingRowColors(True)
+        self.table_views[db_type].horizontalHeader().setSortIndicator(-1, Qt.SortOrder.AscendingOrder)
+        self.table_views[db_type].setSortingEnabled(True)
+        self.table_views[db_type].setFont(QFont("Malgun Gothic", 10))  # Font that supports Korean characters
+        self.table_views[db_type].setStyleSheet("""
+            QTableView {
                 alternate-background-color: #f0f0f0;
                 background-color: white;
             }
@@ -557,7 +743,7 @@ class DatabaseViewer(QMainWindow):
                 font-weight: bold;
             }
         """)
-        layout.addWidget(self.table_widgets[db_type])
+        layout.addWidget(self.table_views[db_type])
 
         # Log messages
         self.log_texts[db_type] = QTextEdit()
@@ -649,10 +835,119 @@ class DatabaseViewer(QMainWindow):
         # Add panels layout to main layout
         main_layout.addLayout(panels_layout)
 
+        # Migration options
+        options_layout = QHBoxLayout()
+        self.stream_reads_checkbox = QCheckBox("Stream reads")
+        self.stream_reads_checkbox.setChecked(True)
+        options_layout.addWidget(self.stream_reads_checkbox)
+
+        options_layout.addWidget(QLabel("Chunk size:"))
+        self.chunk_size_spin = QSpinBox()
+        self.chunk_size_spin.setRange(1, 1000000)
+        self.chunk_size_spin.setValue(1000)
+        options_layout.addWidget(self.chunk_size_spin)
+
+        options_layout.addWidget(QLabel("Fetch size:"))
+        self.itersize_spin = QSpinBox()
+        self.itersize_spin.setRange(100, 1000000)
+        self.itersize_spin.setValue(10000)
+        options_layout.addWidget(self.itersize_spin)
+
+        options_layout.addWidget(QLabel("Queue depth:"))
+        self.queue_size_spin = QSpinBox()
+        self.queue_size_spin.setRange(1, 64)
+        self.queue_size_spin.setValue(4)
+        options_layout.addWidget(self.queue_size_spin)
+
+        options_layout.addWidget(QLabel("Parallel tables:"))
+        self.max_parallel_spin = QSpinBox()
+        self.max_parallel_spin.setRange(1, 32)
+        self.max_parallel_spin.setValue(4)
+        options_layout.addWidget(self.max_parallel_spin)
+
+        options_layout.addWidget(QLabel("Read partitions:"))
+        self.read_partitions_spin = QSpinBox()
+        self.read_partitions_spin.setRange(1, 16)
+        self.read_partitions_spin.setValue(1)
+        options_layout.addWidget(self.read_partitions_spin)
+
+        self.snapshot_checkbox = QCheckBox("Consistent snapshot")
+        self.snapshot_checkbox.setChecked(True)
+        options_layout.addWidget(self.snapshot_checkbox)
+
+        self.checkpoint_checkbox = QCheckBox("Checkpoints")
+        self.checkpoint_checkbox.setChecked(True)
+        # Checkpointed reads follow key order on a single stream, so read partitions only apply without them
+        self.checkpoint_checkbox.toggled.connect(self.update_read_partitions)
+        options_layout.addWidget(self.checkpoint_checkbox)
+        self.update_read_partitions(self.checkpoint_checkbox.isChecked())
+
+        options_layout.addWidget(QLabel("Checkpoint every (rows):"))
+        self.checkpoint_rows_spin = QSpinBox()
+        self.checkpoint_rows_spin.setRange(1000, 10000000)
+        self.checkpoint_rows_spin.setValue(50000)
+        self.checkpoint_rows_spin.setToolTip("PostgreSQL bulk writes only; other targets checkpoint every committed chunk")
+        options_layout.addWidget(self.checkpoint_rows_spin)
+        options_layout.addStretch()
+        main_layout.addLayout(options_layout)
+
+        # Bulk write options
+        write_options_layout = QHBoxLayout()
+        self.bulk_writes_checkbox = QCheckBox("Bulk writes")
+        self.bulk_writes_checkbox.setChecked(True)
+        write_options_layout.addWidget(self.bulk_writes_checkbox)
+
+        write_options_layout.addWidget(QLabel("COPY format:"))
+        self.copy_format_combo = QComboBox()
+        self.copy_format_combo.addItems(["text", "binary"])
+        write_options_layout.addWidget(self.copy_format_combo)
+
+        write_options_layout.addWidget(QLabel("Commit every (rows):"))
+        self.commit_rows_spin = QSpinBox()
+        self.commit_rows_spin.setRange(1, 10000000)
+        self.commit_rows_spin.setValue(50000)
+        write_options_layout.addWidget(self.commit_rows_spin)
+
+        write_options_layout.addWidget(QLabel("Commit every (MB):"))
+        self.commit_mb_spin = QSpinBox()
+        self.commit_mb_spin.setRange(1, 4096)
+        self.commit_mb_spin.setValue(64)
+        write_options_layout.addWidget(self.commit_mb_spin)
+
+        write_options_layout.addWidget(QLabel("MongoDB batch:"))
+        self.mongo_batch_size_spin = QSpinBox()
+        self.mongo_batch_size_spin.setRange(1, 100000)
+        self.mongo_batch_size_spin.setValue(1000)
+        write_options_layout.addWidget(self.mongo_batch_size_spin)
+
+        write_options_layout.addWidget(QLabel("Neo4j batch:"))
+        self.neo4j_batch_size_spin = QSpinBox()
+        self.neo4j_batch_size_spin.setRange(1, 100000)
+        self.neo4j_batch_size_spin.setValue(1000)
+        write_options_layout.addWidget(self.neo4j_batch_size_spin)
+
+        write_options_layout.addWidget(QLabel("Neo4j writers:"))
+        self.neo4j_writers_spin = QSpinBox()
+        self.neo4j_writers_spin.setRange(1, 16)
+        self.neo4j_writers_spin.setValue(1)
+        write_options_layout.addWidget(self.neo4j_writers_spin)
+
+        self.adaptive_batches_checkbox = QCheckBox("Adaptive batches")
+        self.adaptive_batches_checkbox.setChecked(True)
+        write_options_layout.addWidget(self.adaptive_batches_checkbox)
+
+        write_options_layout.addWidget(QLabel("Target commit (ms):"))
+        self.target_commit_spin = QSpinBox()
+        self.target_commit_spin.setRange(50, 60000)
+        self.target_commit_spin.setValue(1000)
+        write_options_layout.addWidget(self.target_commit_spin)
+        write_options_layout.addStretch()
+        main_layout.addLayout(write_options_layout)
+
         # Add Migrate and Migrate All buttons
         button_layout = QHBoxLayout()
         self.migrate_button = QPushButton("Migrate")
-        self.migrate_button.clicked.connect(self.start_migration)
+        self.migrate_button.clicked.connect(lambda: self.start_migration())
         self.migrate_button.clicked.connect(lambda: self.log_message("UI", "Migrate button clicked", "INFO"))
         button_layout.addWidget(self.migrate_button)
 
@@ -660,12 +955,21 @@ class DatabaseViewer(QMainWindow):
         self.migrate_all_button.clicked.connect(self.start_migrate_all)
         self.migrate_all_button.clicked.connect(lambda: self.log_message("UI", "Migrate All button clicked", "INFO"))
         button_layout.addWidget(self.migrate_all_button)
+
+        self.resume_button = QPushButton("Resume")
+        self.resume_button.clicked.connect(lambda: self.start_migration(resume=True))
+        self.resume_button.clicked.connect(lambda: self.log_message("UI", "Resume button clicked", "INFO"))
+        button_layout.addWidget(self.resume_button)
         main_layout.addLayout(button_layout)
 
         # Add Progress bar
         self.progress_bar = QProgressBar()
         main_layout.addWidget(self.progress_bar)
 
+        # Per-stage queue depth and throughput of the running migration
+        self.pipeline_stats_label = QLabel("")
+        main_layout.addWidget(self.pipeline_stats_label)
+
         # Add log message box below the panels
         self.migrate_log_text = QTextEdit()
         self.migrate_log_text.setReadOnly(True)
@@ -685,10 +989,8 @@ class DatabaseViewer(QMainWindow):
         self.target_table_name.setText(target_item)
         self.update_target_schema(source_db, target_db, source_item)
 
-        # Update row and column counts
+        # Update column counts (update_source_schema already shows the row count)
         source_schema = self.get_schema(source_db, source_item)
-        row_count = self.get_row_count(source_db, source_item)
-        self.source_row_count_label.setText(f"Number of rows: {row_count}")
         self.source_columns_selected_label.setText(f"Number of columns selected: {len(source_schema)}")
         self.target_columns_selected_label.setText(f"Number of columns selected: {len(source_schema)}")
 
@@ -746,60 +1048,22 @@ class DatabaseViewer(QMainWindow):
             
     def update_target_schema(self, source_db, target_db, table_name):
         source_schema = self.get_schema(source_db, table_name)
-        target_schema = self.convert_schema(source_db, target_db, source_schema)
-        self.populate_schema_table(self.target_schema_table, target_schema, editable=True, is_target=True)
+        mappings = typemap.map_columns(source_db, target_db, source_schema)
+        target_schema = [(mapping.target_column, mapping.target_type) for mapping in mappings]
+        self.populate_schema_table(self.target_schema_table, target_schema, editable=True, is_target=True,
+                                   notes=[typemap.describe(mapping) for mapping in mappings])
         self.update_selected_columns_count()
         self.update_changed_columns_count()  # Call this to initialize the count
 
     def convert_schema(self, source_db, target_db, schema):
-        if source_db == target_db:
-            return schema
-
-        converted_schema = []
-        for column, data_type in schema:
-            if target_db == "PostgreSQL":
-                converted_type = self.to_postgresql_type(data_type)
-            elif target_db == "MongoDB":
-                converted_type = self.to_mongodb_type(data_type)
-            else:  # Neo4j
-                converted_type = self.to_neo4j_type(data_type)
-            converted_schema.append((column, converted_type))
-        return converted_schema
-
-    def to_postgresql_type(self, data_type):
-        # Add more type conversions as needed
-        type_mapping = {
-            'int': 'INTEGER',
-            'float': 'FLOAT',
-            'str': 'TEXT',
-            'bool': 'BOOLEAN',
-            'datetime': 'TIMESTAMP',
-        }
-        return type_mapping.get(data_type.lower(), 'TEXT')
-
-    def to_mongodb_type(self, data_type):
-        # MongoDB doesn't enforce schema, so we'll use general types
-        type_mapping = {
-            'int': 'Number',
-            'float': 'Number',
-            'str': 'String',
-            'bool': 'Boolean',
-            'datetime': 'Date',
-        }
-        return type_mapping.get(data_type.lower(), 'Mixed')
-
-    def to_neo4j_type(self, data_type):
-        # Neo4j doesn't have strict types, but we'll use general categories
-        type_mapping = {
-            'int': 'Integer',
-            'float': 'Float',
-            'str': 'String',
-            'bool': 'Boolean',
-            'datetime': 'DateTime',
-        }
-        return type_mapping.get(data_type.lower(), 'String')
+        return [(mapping.target_column, mapping.target_type) for mapping in typemap.map_columns(source_db, target_db, schema)]
 
-    def start_migration(self):
+    def get_type_plan(self, source_db, target_db, source_table, source_columns, target_columns, pg_conn=None):
+        # Column mappings (target type + compiled converter) for exactly the columns being migrated
+        schema = dict(self.get_schema(source_db, source_table, pg_conn))
+        return typemap.map_columns(source_db, target_db, [(col, schema.get(col, '')) for col in source_columns], target_columns)
+
+    def start_migration(self, resume=False):
         source_db = self.source_db_combo.currentText()
         target_db = self.target_db_combo.currentText()
         source_table = self.source_table_combo.currentText()
@@ -828,13 +1092,18 @@ class DatabaseViewer(QMainWindow):
         self.log_message("Migration", f"Target table/collection/label: {target_table}", "INFO")
         self.log_message("Migration", f"Columns: {', '.join(selected_columns)}", "INFO")
 
-        self.worker = MigrationWorker(self, source_db, target_db, source_table, target_table, selected_columns, target_columns)
+        options = self.get_migration_options()
+        options['resume'] = resume
+        self.worker = MigrationWorker(self, source_db, target_db, source_table, target_table, selected_columns, target_columns,
+                                      options)
         self.worker.progress.connect(self.update_progress)
+        self.worker.stats.connect(self.update_pipeline_stats)
         self.worker.log.connect(self.log_message)
         self.worker.finished.connect(self.migration_finished)
         self.worker.start()
 
         self.migrate_button.setEnabled(False)
+        self.resume_button.setEnabled(False)
 
     def start_migrate_all(self):
         source_db = self.source_db_combo.currentText()
@@ -862,93 +1131,121 @@ class DatabaseViewer(QMainWindow):
             self.log_message("Migration", f"Unsupported source database type: {source_db}", "ERROR")
             return
 
-        # Prepare report data
+        options = self.get_migration_options()
+        if options['consistent_snapshot'] and source_db.lower() == "postgresql":
+            # One exported snapshot for every table and partition, so FK-linked tables line up
+            try:
+                self.migration_snapshot = ExportedSnapshot(self.open_postgresql_connection())
+                options['snapshot_id'] = self.migration_snapshot.snapshot_id
+                self.log_message("Migration", f"Reading all tables from snapshot {options['snapshot_id']}", "INFO")
+            except Exception as e:
+                self.log_message("Migration", f"Could not export a snapshot, tables are read independently: {str(e)}", "WARN")
+
+        jobs = []
+        for item in items:
+            try:
+                records, exact = self.estimate_row_count(source_db, item)
+            except Exception as e:
+                self.log_message("Migration", f"Error counting rows in {item}: {str(e)}", "ERROR")
+                records, exact = 0, False
+            jobs.append({'name': item, 'records': records, 'estimated': not exact})
+
+        # Live report: one status row per item, updated while the scheduler runs
         report_data = {
-            'total_items': len(items),
+            'total_items': len(jobs),
             'total_time': 0,
             'items': []
         }
+        self.migration_report = MigrationReport(report_data)
+        self.migration_report.show()
+
+        self.migrate_all_started = time.time()
+        self.scheduler = MigrationScheduler(
+            self, jobs,
+            lambda item: self.create_migration_worker(source_db, target_db, item, item, options),
+            options['max_parallel'])
+        self.scheduler.item_updated.connect(self.migration_report.update_item)
+        self.scheduler.progress.connect(self.update_progress)
+        self.scheduler.finished.connect(self.migrate_all_finished)
+
+        # Exact counts replace the estimates of jobs still waiting for a slot
+        estimated = [job['name'] for job in jobs if job['estimated']]
+        if estimated:
+            self.start_row_count_worker("migrate_all", source_db, estimated, self.scheduler.refine_count)
 
-        # Start migration for each item
-        total_items = len(items)
-        start_time = time.time()
-        for i, item in enumerate(items):
-            self.log_message("Migration", f"Starting migration for {item} ({i+1}/{total_items})", "INFO")
-            
-            # Update UI for current migration
-            self.update_migration_ui(source_db, target_db, item, item)
-            
-            # Perform the migration
-            item_start_time = time.time()
-            result, migrated, failed, error = self.migrate_item(source_db, target_db, item, item)
-            item_time = time.time() - item_start_time
-
-            # Collect report data
-            report_data['items'].append({
-                'name': item,
-                'records': self.get_row_count(source_db, item),
-                'result': result,
-                'migrated': migrated,
-                'failed': failed,
-                'time': item_time,
-                'error': error
-            })
-
-            # Update progress
-            progress = int((i + 1) / total_items * 100)
-            self.progress_bar.setValue(progress)
-
-        report_data['total_time'] = time.time() - start_time
-        self.log_message("Migration", "All migrations completed.", "INFO")
-
-        # Show migration report
-        report_dialog = MigrationReport(report_data)
-        report_dialog.exec()
+        self.migrate_button.setEnabled(False)
+        self.migrate_all_button.setEnabled(False)
+        self.resume_button.setEnabled(False)
+        self.scheduler.start()
 
-    def migrate_item(self, source_db, target_db, source_item, target_item):
-        try:
-            # Get schema for the source item
-            source_schema = self.get_schema(source_db, source_item)
-            source_columns = [col for col, _ in source_schema]
-            
-            # Get the target schema (which may have different column names)
-            target_schema = self.convert_schema(source_db, target_db, source_schema)
-            target_columns = [col for col, _ in target_schema]
-
-            # Create MigrationWorker
-            worker = MigrationWorker(self, source_db, target_db, source_item, target_item, source_columns, target_columns)
-            worker.progress.connect(self.update_progress)
-            worker.log.connect(self.log_message)
-
-            # Start migration
-            worker.run()  # Run synchronously to ensure sequential migration
-
-            # Get migration results
-            total_rows = worker.total_rows
-            migrated_rows = worker.migrated_rows
-            failed_rows = total_rows - migrated_rows
-
-            if failed_rows == 0:
-                result = "OK"
-            elif migrated_rows == 0:
-                result = "Fail"
-            else:
-                result = f"Partially migrated ({migrated_rows}/{total_rows})"
+    def create_migration_worker(self, source_db, target_db, source_item, target_item, options):
+        # Get schema for the source item
+        source_schema = self.get_schema(source_db, source_item)
+        source_columns = [col for col, _ in source_schema]
 
-            return result, migrated_rows, failed_rows, worker.error_message
+        # Get the target schema (which may have different column names)
+        target_schema = self.convert_schema(source_db, target_db, source_schema)
+        target_columns = [col for col, _ in target_schema]
+
+        worker = MigrationWorker(self, source_db, target_db, source_item, target_item, source_columns, target_columns, options)
+        worker.log.connect(self.log_message)
+        worker.stats.connect(self.update_pipeline_stats)
+        return worker
+
+    def migrate_all_finished(self):
+        self.stop_row_count_worker("migrate_all")
+        if self.migration_snapshot is not None:
+            self.migration_snapshot.close()
+            self.migration_snapshot = None
+        self.migration_report.set_total_time(time.time() - self.migrate_all_started)
+        self.log_message("Migration", "All migrations completed.", "INFO")
+        self.migrate_button.setEnabled(True)
+        self.migrate_all_button.setEnabled(True)
+        self.resume_button.setEnabled(True)
+
+    def get_migration_options(self):
+        return {
+            'stream_reads': self.stream_reads_checkbox.isChecked(),
+            'chunk_size': self.chunk_size_spin.value(),
+            'itersize': self.itersize_spin.value(),
+            'queue_size': self.queue_size_spin.value(),
+            'max_parallel': self.max_parallel_spin.value(),
+            'read_partitions': self.read_partitions_spin.value() if self.read_partitions_spin.isEnabled() else 1,
+            'consistent_snapshot': self.snapshot_checkbox.isChecked(),
+            'bulk_writes': self.bulk_writes_checkbox.isChecked(),
+            'copy_format': self.copy_format_combo.currentText(),
+            'commit_rows': self.commit_rows_spin.value(),
+            'commit_mb': self.commit_mb_spin.value(),
+            'mongo_batch_size': self.mongo_batch_size_spin.value(),
+            'neo4j_batch_size': self.neo4j_batch_size_spin.value(),
+            'neo4j_writers': self.neo4j_writers_spin.value(),
+            'adaptive_batches': self.adaptive_batches_checkbox.isChecked(),
+            'target_commit_ms': self.target_commit_spin.value(),
+            'checkpoint': self.checkpoint_checkbox.isChecked(),
+            'checkpoint_rows': self.checkpoint_rows_spin.value(),
+        }
 
-        except Exception as e:
-            error_message = str(e)
-            self.log_message("Migration", f"Error migrating {source_item}: {error_message}", "ERROR")
-            return "Fail", 0, self.get_row_count(source_db, source_item), error_message
+    def update_read_partitions(self, checkpoints):
+        self.read_partitions_spin.setEnabled(not checkpoints)
+        self.read_partitions_spin.setToolTip("Turn off Checkpoints to read a table in partitions" if checkpoints
+                                             else "Connections reading disjoint ranges of one table at once")
 
     def update_progress(self, current, total):
         self.progress_bar.setMaximum(total)
         self.progress_bar.setValue(current)
 
+    def update_pipeline_stats(self, stats):
+        parts = []
+        for stage, stage_stats in stats.items():
+            parts.append(f"{stage.capitalize()}: {stage_stats['rows']:,} rows ({stage_stats['rate']:,.0f}/s), queue {stage_stats['queue']}")
+        self.pipeline_stats_label.setText(" | ".join(parts))
+
     def migration_finished(self):
+        if self.worker is not None and self.worker.batch_controller is not None:
+            self.log_message("Migration", f"Batch size history: {self.worker.batch_controller.summary()}", "INFO")
         self.log_message("Migration", "Migration completed.", "INFO")
         self.migrate_button.setEnabled(True)
+        self.resume_button.setEnabled(True)
 
     def get_db_info(self, db_name):
         if db_name not in self.config:
@@ -970,37 +1267,48 @@ class DatabaseViewer(QMainWindow):
             return (f"Connection: {connection}\n"
                     f"User: {config.get('user', 'N/A')}")
 
-    def get_schema(self, db_name, table_name):
+    def get_schema(self, db_name, table_name, pg_conn=None):
         if db_name.lower() == "postgresql":
-            return self.get_postgresql_schema(table_name)
+            return self.get_postgresql_schema(table_name, pg_conn)
         elif db_name.lower() == "mongodb":
             return self.get_mongodb_schema(table_name)
         else:  # Neo4j
             return self.get_neo4j_schema(table_name)
 
-    def get_postgresql_schema(self, table_name):
-        self.pg_cur.execute(f"""
-            SELECT column_name, data_type
-            FROM information_schema.columns
-            WHERE table_name = '{table_name}'
-        """)
-        return self.pg_cur.fetchall()
+    def get_postgresql_schema(self, table_name, pg_conn=None):
+        # format_type() keeps precision/scale, lengths and array-ness, e.g. numeric(10,2) or integer[]
+        cur = pg_conn.cursor() if pg_conn else self.pg_cur
+        cur.execute("""
+            SELECT a.attname, format_type(a.atttypid, a.atttypmod)
+            FROM pg_attribute a
+            WHERE a.attrelid = %s::regclass AND a.attnum > 0 AND NOT a.attisdropped
+            ORDER BY a.attnum
+        """, (f'"{table_name}"',))
+        return cur.fetchall()
+
+    @staticmethod
+    def value_type_name(value):
+        if isinstance(value, list):
+            element_types = {type(element).__name__ for element in value if element is not None}
+            return f"list[{element_types.pop()}]" if len(element_types) == 1 else "list"
+        return type(value).__name__
 
     def get_mongodb_schema(self, collection_name):
         collection = self.mongo_db[collection_name]
         sample_doc = collection.find_one()
-        return [(key, type(value).__name__) for key, value in sample_doc.items()]
+        return [(key, self.value_type_name(value)) for key, value in sample_doc.items()]
 
     def get_neo4j_schema(self, label):
         with self.neo4j_driver.session() as session:
             result = session.run(f"MATCH (n:`{label}`) RETURN n LIMIT 1")
             sample_node = result.single()['n']
-            return [(key, type(value).__name__) for key, value in sample_node.items()]
+            return [(key, self.value_type_name(value)) for key, value in sample_node.items()]
 
-    def get_row_count(self, db_name, table_name):
+    def get_row_count(self, db_name, table_name, pg_conn=None):
         if db_name.lower() == "postgresql":
-            self.pg_cur.execute(f'SELECT COUNT(*) FROM "{table_name}"')
-            return self.pg_cur.fetchone()[0]
+            cur = pg_conn.cursor() if pg_conn else self.pg_cur
+            cur.execute(f'SELECT COUNT(*) FROM "{table_name}"')
+            return cur.fetchone()[0]
         elif db_name.lower() == "mongodb":
             return self.mongo_db[table_name].count_documents({})
         else:  # Neo4j
@@ -1008,16 +1316,57 @@ class DatabaseViewer(QMainWindow):
                 result = session.run(f"MATCH (n:`{table_name}`) RETURN COUNT(n) AS count")
                 return result.single()['count']
 
+    def estimate_row_count(self, db_name, table_name, pg_conn=None):
+        """Instant row count from statistics: (count, exact). Use get_row_count for an exact count."""
+        if db_name.lower() == "postgresql":
+            cur = pg_conn.cursor() if pg_conn else self.pg_cur
+            # reltuples is -1 until the table is first vacuumed/analyzed; the stats collector covers that case
+            cur.execute("""
+                SELECT CASE WHEN c.reltuples >= 0 THEN c.reltuples::bigint
+                            ELSE pg_stat_get_live_tuples(c.oid) END
+                FROM pg_class c
+                WHERE c.oid = to_regclass(%s)
+            """, (f'"{table_name}"',))
+            row = cur.fetchone()
+            return (row[0] if row else 0), False
+        elif db_name.lower() == "mongodb":
+            return self.mongo_db[table_name].estimated_document_count(), False
+        else:  # Neo4j answers a single-label count from its count store, so it is exact and instant
+            return self.get_row_count(db_name, table_name), True
+
+    def start_row_count_worker(self, purpose, db_name, items, on_counted):
+        self.stop_row_count_worker(purpose)
+        worker = RowCountWorker(self, db_name, items)
+        worker.counted.connect(on_counted)
+        worker.log.connect(self.log_message)
+        self.row_count_workers[purpose] = worker
+        worker.start()
+
+    def stop_row_count_worker(self, purpose):
+        worker = self.row_count_workers.pop(purpose, None)
+        if worker is not None:
+            worker.counted.disconnect()
+            worker.requestInterruption()
+
+    def show_exact_row_count(self, table_name, count):
+        if table_name == self.source_table_combo.currentText():
+            self.source_row_count_label.setText(f"Number of rows: {count}")
+
     def update_source_schema(self, table_name):
         if not table_name:
             return
 
         source_db = self.source_db_combo.currentText()
         schema = self.get_schema(source_db, table_name)
-        row_count = self.get_row_count(source_db, table_name)
+        row_count, exact = self.estimate_row_count(source_db, table_name)
 
         self.populate_schema_table(self.source_schema_table, schema, with_checkbox=True)
-        self.source_row_count_label.setText(f"Number of rows: {row_count}")
+        if exact:
+            self.stop_row_count_worker("source")
+            self.source_row_count_label.setText(f"Number of rows: {row_count}")
+        else:
+            self.source_row_count_label.setText(f"Number of rows: ~{row_count} (estimate)")
+            self.start_row_count_worker("source", source_db, [table_name], self.show_exact_row_count)
         self.update_selected_columns_count()
 
         # Update target table name and schema
@@ -1025,7 +1374,7 @@ class DatabaseViewer(QMainWindow):
         target_db = self.target_db_combo.currentText()
         self.update_target_schema(source_db, target_db, table_name)
 
-    def populate_schema_table(self, table_widget, schema, editable=False, with_checkbox=False, is_target=False):
+    def populate_schema_table(self, table_widget, schema, editable=False, with_checkbox=False, is_target=False, notes=None):
         table_widget.blockSignals(True)  # Block signals temporarily
         
         # Clear the existing contents of the table
@@ -1035,6 +1384,9 @@ class DatabaseViewer(QMainWindow):
         if with_checkbox:
             table_widget.setColumnCount(3)
             table_widget.setHorizontalHeaderLabels(["Select", "Column Name", "Data Type"])
+        elif notes:
+            table_widget.setColumnCount(3)
+            table_widget.setHorizontalHeaderLabels(["Column Name", "Data Type", "Mapping"])
         else:
             table_widget.setColumnCount(2)
             table_widget.setHorizontalHeaderLabels(["Column Name", "Data Type"])
@@ -1070,6 +1422,11 @@ class DatabaseViewer(QMainWindow):
                 table_widget.setItem(i, 0, name_item)
                 table_widget.setItem(i, 1, type_item)
 
+                if notes:
+                    note_item = QTableWidgetItem(notes[i])
+                    note_item.setFlags(note_item.flags() & ~Qt.ItemFlag.ItemIsEditable)
+                    table_widget.setItem(i, 2, note_item)
+
         table_widget.resizeColumnsToContents()
         
         table_widget.blockSignals(False)  # Unblock signals
@@ -1094,36 +1451,67 @@ class DatabaseViewer(QMainWindow):
         
         self.target_columns_changed_label.setText(f"Number of column names changed: {changed_count}")
 
-    def update_combo_box(self, db_type, item_name):
-        combo_box = self.select_combos[db_type]
-        if combo_box.findText(item_name) == -1:
-            combo_box.addItem(item_name)
-        combo_box.setCurrentText(item_name)
+    def load_tables(self, db_type, select=None):
+        if not self.pg_conn:
+            return
 
-    def load_tables(self, db_type):
-        if self.pg_cur:
-            try:
-                self.pg_cur.execute("SELECT table_name FROM information_schema.tables WHERE table_schema = 'public' ORDER BY table_name ASC")
-                tables = [table[0] for table in self.pg_cur.fetchall()]
-                self.select_combos[db_type].clear()
-                self.select_combos[db_type].addItems(tables)
-                self.log_message(db_type, f"Loaded tables: {', '.join(tables)}", "INFO")
-            except Exception as e:
-                self.log_message(db_type, f"Error loading tables: {str(e)}", "ERROR")
+        def fetch_tables(conn):
+            with conn.cursor() as cur:
+                cur.execute("SELECT table_name FROM information_schema.tables WHERE table_schema = 'public' ORDER BY table_name ASC")
+                return [table[0] for table in cur.fetchall()]
+
+        def on_loaded(tables):
+            self.log_message(db_type, f"Loaded tables: {', '.join(tables)}", "INFO")
+            self.populate_item_combo(db_type, tables, select)
+
+        self.run_postgresql_task("loading tables", fetch_tables, on_loaded)
                     
-    def load_labels(self, db_type):
-        with self.neo4j_driver.session() as session:
-            result = session.run("CALL db.labels()")
-            labels = sorted([record["label"] for record in result])
-            self.select_combos[db_type].clear()
-            self.select_combos[db_type].addItems(labels)
+    def load_labels(self, db_type, select=None):
+        if not self.neo4j_driver:
+            return
+        driver = self.neo4j_driver
+
+        def fetch_labels():
+            with driver.session() as session:
+                result = session.run("CALL db.labels()")
+                return sorted([record["label"] for record in result])
+
+        def on_loaded(labels):
             self.log_message(db_type, f"Loaded labels: {', '.join(labels)}", "INFO")
+            self.populate_item_combo(db_type, labels, select)
+
+        self.run_db_task(db_type, "loading labels", fetch_labels, on_loaded)
+
+    def load_collections(self, db_type, select=None):
+        if self.mongo_db is None:
+            return
+        mongo_db = self.mongo_db
+
+        def on_loaded(collections):
+            self.log_message(db_type, f"Loaded collections: {', '.join(collections)}", "INFO")
+            self.populate_item_combo(db_type, collections, select)
 
-    def load_collections(self, db_type):
-        collections = sorted(self.mongo_db.list_collection_names())
-        self.select_combos[db_type].clear()
-        self.select_combos[db_type].addItems(collections)
-        self.log_message(db_type, f"Loaded collections: {', '.join(collections)}", "INFO")
+        self.run_db_task(db_type, "loading collections", lambda: sorted(mongo_db.list_collection_names()), on_loaded)
+
+    def load_items(self, db_type, select=None):
+        if db_type == "PostgreSQL":
+            self.load_tables(db_type, select)
+        elif db_type == "MongoDB":
+            self.load_collections(db_type, select)
+        else:  # Neo4j
+            self.load_labels(db_type, select)
+
+    def populate_item_combo(self, db_type, items, select=None):
+        # Keeps the selection (or selects `select`) and loads its data once, not once per intermediate item
+        combo = self.select_combos[db_type]
+        current = select or combo.currentText()
+        combo.blockSignals(True)
+        combo.clear()
+        combo.addItems(items)
+        if current in items:
+            combo.setCurrentText(current)
+        combo.blockSignals(False)
+        self.load_data(db_type)
         
     def load_data(self, db_type):
         selected_item = self.select_combos[db_type].currentText()
@@ -1140,54 +1528,81 @@ class DatabaseViewer(QMainWindow):
             self.load_neo4j_data(selected_item)
 
     def load_postgresql_data(self, table_name):
-        try:
-            self.pg_cur.execute(f'SELECT * FROM "{table_name}"')
-            rows = self.pg_cur.fetchall()
-            columns = [desc[0] for desc in self.pg_cur.description]
-            self.populate_table_widget("PostgreSQL", columns, rows)
-        except Exception as e:
-            self.log_message("PostgreSQL", f"Error loading data: {str(e)}", "ERROR")
+        shared_conn = self.pg_conn
+
+        def fetch_first_page(conn):
+            key_column = self.get_postgresql_primary_key(table_name, conn)
+            columns = [col for col, _ in self.get_postgresql_schema(table_name, conn)]
+            first_page = postgresql_pages(conn, table_name, key_column)(None, PAGE_SIZE)
+            # Pages read while scrolling come from the shared connection, after this task has closed its own
+            pages = lambda sort, filters: postgresql_pages(shared_conn, table_name, key_column, sort, filters)
+            return pages, columns, first_page
+
+        self.run_postgresql_task("loading data", fetch_first_page,
+                                 lambda result: self.show_lazy_table("PostgreSQL", *result))
 
     def load_mongodb_data(self, collection_name):
-        try:
-            collection = self.mongo_db[collection_name]
-            documents = list(collection.find())
-            if documents:
-                columns = list(documents[0].keys())
-                rows = [[str(doc.get(col, '')) for col in columns] for doc in documents]
-                self.populate_table_widget("MongoDB", columns, rows)
-            else:
-                self.log_message("MongoDB", "No documents found in the collection", "WARN")
-        except Exception as e:
-            self.log_message("MongoDB", f"Error loading data: {str(e)}", "ERROR")
+        mongo_db = self.mongo_db
+        pages = lambda sort, filters: mongodb_pages(mongo_db[collection_name], sort, filters)
 
-    def load_neo4j_data(self, label):
-        with self.neo4j_driver.session() as session:
-            result = session.run(f"MATCH (n:`{label}`) RETURN n")
-            records = list(result)
-            if records:
-                columns = list(records[0]['n'].keys())
-                rows = [[str(record['n'].get(col, '')) for col in columns] for record in records]
-                self.populate_table_widget("Neo4j", columns, rows)
-            else:
-                self.log_message("Neo4j", f"No nodes found with label: {label}", "WARN")
+        def on_loaded(first_page):
+            model = self.show_lazy_table("MongoDB", pages, first_page=first_page)
+            if model.rowCount() == 0:
+                self.log_message("MongoDB", "No documents found in the collection", "WARN")
 
-    def populate_table_widget(self, db_type, columns, rows):
-        table_widget = self.table_widgets[db_type]
-        table_widget.setRowCount(len(rows))
-        table_widget.setColumnCount(len(columns))
-        table_widget.setHorizontalHeaderLabels(columns)
+        self.run_db_task("MongoDB", "loading data", lambda: pages(None, [])(None, PAGE_SIZE), on_loaded)
 
-        # Set font that supports Korean characters
-        font = QFont("Malgun Gothic", 10)  # You can change this to another font that supports Korean
-        table_widget.setFont(font)
+    def load_neo4j_data(self, label):
+        driver = self.neo4j_driver
+        pages = lambda sort, filters: neo4j_pages(driver, label, sort, filters)
 
-        for i, row in enumerate(rows):
-            for j, value in enumerate(row):
-                table_widget.setItem(i, j, QTableWidgetItem(str(value)))
+        def on_loaded(first_page):
+            model = self.show_lazy_table("Neo4j", pages, first_page=first_page)
+            if model.rowCount() == 0:
+                self.log_message("Neo4j", f"No nodes found with label: {label}", "WARN")
 
-        table_widget.resizeColumnsToContents()
-        self.log_message(db_type, f"Loaded {len(rows)} rows", "INFO")
+        self.run_db_task("Neo4j", "loading data", lambda: pages(None, [])(None, PAGE_SIZE), on_loaded)
+
+    def show_lazy_table(self, db_type, pages, columns=None, first_page=None):
+        # The first page is read by a background task; the view asks for more pages as it scrolls
+        table_view = self.table_views[db_type]
+        table_view.horizontalHeader().setSortIndicator(-1, Qt.SortOrder.AscendingOrder)
+        model = LazyTableModel(pages, columns, first_page=first_page, parent=table_view)
+        model.error.connect(lambda message: self.log_message(db_type, f"Error loading data: {message}", "ERROR"))
+        old_model = table_view.model()
+        table_view.setModel(model)
+        if old_model is not None:
+            old_model.deleteLater()
+
+        self.filter_columns[db_type].clear()
+        self.filter_columns[db_type].addItems(model.columns)
+        self.filter_values[db_type].clear()
+
+        table_view.resizeColumnsToContents()
+        self.log_loaded_rows(db_type, model)
+        return model
+
+    def log_loaded_rows(self, db_type, model):
+        more = "" if model.exhausted else ", more rows load while scrolling"
+        self.log_message(db_type, f"Loaded {model.rowCount()} rows{more}", "INFO")
+
+    def apply_filter(self, db_type):
+        model = self.table_views[db_type].model()
+        column = self.filter_columns[db_type].currentText()
+        if model is None or not column:
+            return
+        value = self.filter_values[db_type].text()
+        operator = self.filter_operators[db_type].currentText()
+        self.log_message(db_type, f"Filtering on {column} {operator} {value!r}", "INFO")
+        model.set_filters([(column, operator, value)])
+        self.log_loaded_rows(db_type, model)
+
+    def clear_filter(self, db_type):
+        self.filter_values[db_type].clear()
+        model = self.table_views[db_type].model()
+        if model is not None and model.filters:
+            model.set_filters([])
+            self.log_loaded_rows(db_type, model)
 
     def download_csv(self, db_type):
         selected_item = self.select_combos[db_type].currentText()
@@ -1195,7 +1610,11 @@ class DatabaseViewer(QMainWindow):
             self.log_message(db_type, "No item selected", "WARN")
             return
 
-        file_name, _ = QFileDialog.getSaveFileName(self, "Save CSV", f"{selected_item}.csv", "CSV Files (*.csv)")
+        file_filter = "CSV Files (*.csv)"
+        if db_type in ("PostgreSQL", "Neo4j"):
+            # Rows stream straight into the file, optionally through a compressor
+            file_filter += ";;Gzip-compressed CSV (*.csv.gz);;Zstandard-compressed CSV (*.csv.zst)"
+        file_name, _ = QFileDialog.getSaveFileName(self, "Save CSV", f"{selected_item}.csv", file_filter)
         if not file_name:
             return
 
@@ -1212,33 +1631,14 @@ class DatabaseViewer(QMainWindow):
             self.log_message(db_type, f"Error saving CSV: {str(e)}", "ERROR")
 
     def download_postgresql_csv(self, table_name, file_name):
-        self.pg_cur.execute(f'SELECT * FROM "{table_name}"')
-        rows = self.pg_cur.fetchall()
-        columns = [desc[0] for desc in self.pg_cur.description]
-        
-        df = pd.DataFrame(rows, columns=columns)
-        df.to_csv(file_name, index=False, encoding='utf-8-sig')
+        copy_postgresql_csv(self.pg_conn, table_name, file_name)
 
     def download_mongodb_csv(self, collection_name, file_name):
-        collection = self.mongo_db[collection_name]
-        documents = list(collection.find())
-        
-        if not documents:
-            raise ValueError("No documents found in the collection")
-        
-        df = pd.DataFrame(documents)
-        df.to_csv(file_name, index=False, encoding='utf-8-sig')
+        stream_mongodb_csv(self.mongo_db[collection_name], file_name)
 
     def download_neo4j_csv(self, label, file_name):
-        with self.neo4j_driver.session() as session:
-            result = session.run(f"MATCH (n:`{label}`) RETURN n")
-            records = [dict(record['n']) for record in result]
-            
-            if not records:
-                raise ValueError(f"No nodes found with label: {label}")
-            
-            df = pd.DataFrame(records)
-            df.to_csv(file_name, index=False, encoding='utf-8-sig')
+        rows = stream_neo4j_csv(self.neo4j_driver, label, file_name)
+        self.log_message("Neo4j", f"Exported {rows} nodes with label {label}", "INFO")
 
     def download_all(self, db_type):
         if db_type == "PostgreSQL":
@@ -1256,67 +1656,56 @@ class DatabaseViewer(QMainWindow):
         if not directory:
             return
 
-        progress = QProgressDialog("Downloading CSVs...", "Cancel", 0, len(items), self)
-        progress.setWindowModality(Qt.WindowModality.WindowModal)
-
-        for i, item in enumerate(items):
-            if progress.wasCanceled():
-                break
-
-            file_name = os.path.join(directory, f"{item}.csv")
-            try:
-                if db_type == "PostgreSQL":
-                    self.download_postgresql_csv(item, file_name)
-                elif db_type == "MongoDB":
-                    self.download_mongodb_csv(item, file_name)
-                else:  # Neo4j
-                    self.download_neo4j_csv(item, file_name)
-                
-                self.log_message(db_type, f"CSV file saved: {file_name}", "INFO")
-            except Exception as e:
-                self.log_message(db_type, f"Error saving CSV for {item}: {str(e)}", "ERROR")
+        extension = ".csv"
+        if db_type in ("PostgreSQL", "Neo4j"):
+            compression, ok = QInputDialog.getItem(self, "Compression", "Compress CSV files:", list(COMPRESSIONS), 0, False)
+            if not ok:
+                return
+            extension += COMPRESSIONS[compression]
 
-            progress.setValue(i + 1)
+        if self.export_schedulers.get(db_type) is not None:
+            self.log_message(db_type, "A download is already running", "WARN")
+            return
 
-        self.log_message(db_type, "Finished downloading all CSVs", "INFO")
+        progress = QProgressDialog("Downloading CSVs...", "Cancel", 0, len(items), self)
+        progress.setWindowModality(Qt.WindowModality.WindowModal)
+        progress.setAutoClose(False)
+        progress.setAutoReset(False)
+
+        # Each item is exported by its own worker thread and connection; the GUI stays responsive
+        scheduler = ExportScheduler(self, db_type, items, directory, extension, self.export_parallel_spins[db_type].value())
+        self.export_schedulers[db_type] = scheduler
+        started = time.time()
+
+        def on_progress(done, rows, written):
+            progress.setValue(done)
+            elapsed = max(time.time() - started, 0.001)
+            progress.setLabelText(f"Downloading CSVs... {done}/{len(items)} items, {rows} rows, "
+                                  f"{written / 1048576:.1f} MB ({written / 1048576 / elapsed:.1f} MB/s)")
+
+        def on_finished():
+            self.export_schedulers[db_type] = None
+            status = "cancelled" if scheduler.cancelled else "finished"
+            progress.canceled.disconnect()  # Closing the dialog emits canceled
+            progress.close()
+            self.log_message(db_type, f"Downloading all CSVs {status}: {scheduler.done_items - scheduler.failed} saved, "
+                                      f"{scheduler.failed} failed, {scheduler.done_rows} rows, "
+                                      f"{scheduler.done_bytes / 1048576:.1f} MB in {time.time() - started:.1f}s", "INFO")
+
+        scheduler.progress.connect(on_progress)
+        scheduler.log.connect(self.log_message)
+        scheduler.finished.connect(on_finished)
+        progress.canceled.connect(scheduler.cancel)
+        progress.show()
+        scheduler.start()
 
     def upload_multiple_csvs(self, db_type):
         file_names, _ = QFileDialog.getOpenFileNames(self, "Select CSV Files", "", "CSV Files (*.csv)")
         if not file_names:
             return
 
-        progress = QProgressDialog("Uploading CSVs...", "Cancel", 0, len(file_names), self)
-        progress.setWindowModality(Qt.WindowModality.WindowModal)
-
-        for i, file_name in enumerate(file_names):
-            if progress.wasCanceled():
-                break
-
-            try:
-                df = pd.read_csv(file_name, encoding='utf-8-sig')
-                item_name = os.path.splitext(os.path.basename(file_name))[0]
-
-                if db_type == "PostgreSQL":
-                    self.upload_postgresql_csv(item_name, df)
-                elif db_type == "MongoDB":
-                    self.upload_mongodb_csv(item_name, df)
-                else:  # Neo4j
-                    self.upload_neo4j_csv(item_name, df)
-                self.log_message(db_type, f"CSV file uploaded: {file_name}", "INFO")
-                self.update_combo_box(db_type, item_name)
-            except Exception as e:
-                self.log_message(db_type, f"Error uploading CSV {file_name}: {str(e)}", "ERROR")
-
-            progress.setValue(i + 1)
-
-        if db_type == "PostgreSQL":
-            self.load_tables(db_type)
-        elif db_type == "MongoDB":
-            self.load_collections(db_type)
-        else:  # Neo4j
-            self.load_labels(db_type)
-
-        self.log_message(db_type, "Finished uploading multiple CSVs", "INFO")
+        self.start_csv_uploads(db_type, [(file_name, None, None) for file_name in file_names],
+                               self.get_migration_options(), f"uploading {len(file_names)} CSVs")
 
     def get_postgresql_tables(self):
         if self.pg_cur:
@@ -1356,79 +1745,127 @@ class DatabaseViewer(QMainWindow):
             return
 
         try:
-            # Try different encodings
-            encodings = ['utf-8-sig', 'cp949', 'euc-kr']
-            df = None
-            for encoding in encodings:
-                try:
-                    df = pd.read_csv(file_name, encoding=encoding)
-                    break
-                except UnicodeDecodeError:
-                    continue
-
-            if df is None:
-                raise ValueError("Unable to decode the CSV file with supported encodings.")
-
-            item_name = os.path.splitext(os.path.basename(file_name))[0]
+            options = self.get_migration_options()
+            source = self.open_csv_source(db_type, file_name, options['chunk_size'])
 
             if db_type == "PostgreSQL":
-                self.upload_postgresql_csv(item_name, df)
-                self.load_tables(db_type)
-            elif db_type == "MongoDB":
-                self.upload_mongodb_csv(item_name, df)
-                self.load_collections(db_type)
-            else:  # Neo4j
-                self.upload_neo4j_csv(item_name, df)
-                self.load_labels(db_type)
-
-            self.log_message(db_type, f"CSV file uploaded: {file_name}", "INFO")
-            self.load_data(db_type)
-            
-            # Update the combo box
-            self.update_combo_box(db_type, item_name)
-            
+                key = self.ask_key_column(source, "PostgreSQL index", "Index column:", "(no index)")
+            elif db_type == "Neo4j":
+                # Optional key column: gets a uniqueness constraint and rows are merged on it
+                key = self.ask_key_column(source, "Neo4j key", "Unique key column:", "(no key, create nodes)")
+            else:
+                key = None
         except Exception as e:
             self.log_message(db_type, f"Error uploading CSV: {str(e)}", "ERROR")
+            return
 
-    def upload_postgresql_csv(self, table_name, df):
-        # Create table
-        columns = []
-        for column, dtype in df.dtypes.items():
-            if dtype == 'int64':
-                col_type = 'INTEGER'
-            elif dtype == 'float64':
-                col_type = 'FLOAT'
-            else:
-                col_type = 'TEXT'
-            columns.append(f'"{column}" {col_type}')
-        
-        create_table_query = f'CREATE TABLE IF NOT EXISTS "{table_name}" ({", ".join(columns)})'
-        self.pg_cur.execute(create_table_query)
-        
-        # Insert data
-        columns = ', '.join(f'"{col}"' for col in df.columns)
-        values = ', '.join(['%s'] * len(df.columns))
-        insert_query = f'INSERT INTO "{table_name}" ({columns}) VALUES ({values})'
-        
-        data = [tuple(row) for row in df.values]
-        self.pg_cur.executemany(insert_query, data)
-        self.pg_conn.commit()
+        self.start_csv_uploads(db_type, [(file_name, source, key)], options, f"uploading {os.path.basename(file_name)}")
 
-    def upload_mongodb_csv(self, collection_name, df):
-        collection = self.mongo_db[collection_name]
-        records = df.to_dict('records')
-        collection.insert_many(records)
+    def start_csv_uploads(self, db_type, uploads, options, description):
+        pg_conns = []
 
-    def upload_neo4j_csv(self, label, df):
-        with self.neo4j_driver.session() as session:
-            # Clear existing nodes with this label
-            session.run(f"MATCH (n:`{label}`) DETACH DELETE n")
-            
-            # Create new nodes
-            for _, row in df.iterrows():
-                properties = ', '.join([f"`{col}`: ${col}" for col in df.columns])
-                cypher_query = f"CREATE (:`{label}` {{{properties}}})"
-                session.run(cypher_query, **row.to_dict())
+        def cancel():
+            for conn in pg_conns:
+                conn.cancel()  # Aborts a running COPY; the load rolls back
+
+        def on_uploaded(uploaded):
+            # Also runs after a cancel, for the files uploaded before it
+            self.load_items(db_type, select=uploaded[-1] if uploaded else None)
+            if len(uploads) > 1:
+                self.log_message(db_type, f"Finished uploading multiple CSVs: {len(uploaded)} of {len(uploads)}", "INFO")
+
+        self.run_db_task(db_type, description, lambda: self.upload_csv_files(db_type, uploads, options, pg_conns),
+                         on_uploaded, timeout=None, cancel=cancel, discard=on_uploaded)
+
+    def upload_csv_files(self, db_type, uploads, options, pg_conns):
+        """Runs on a DbTask thread, so database work and log_message only, no widgets.
+        uploads are (file name, CsvSource or None to open it here, key), where key is the index column
+        for PostgreSQL and the merge key for Neo4j. PostgreSQL uploads use a connection of their own,
+        kept in pg_conns for the cancel hook. Returns the names of the items uploaded."""
+        uploaded = []
+        try:
+            if db_type == "PostgreSQL":
+                pg_conns.append(self.open_postgresql_connection())
+            for i, (file_name, source, key) in enumerate(uploads):
+                if QThread.currentThread().isInterruptionRequested():
+                    break
+                try:
+                    source = source or self.open_csv_source(db_type, file_name, options['chunk_size'])
+                    item_name = os.path.splitext(os.path.basename(file_name))[0]
+
+                    if db_type == "PostgreSQL":
+                        self.upload_postgresql_csv(item_name, source, [key] if key else (), pg_conns[0])
+                    elif db_type == "MongoDB":
+                        self.upload_mongodb_csv(item_name, source, options)
+                    else:  # Neo4j
+                        self.upload_neo4j_csv(item_name, source, options, key)
+                    self.log_message(db_type, f"CSV file uploaded ({i + 1}/{len(uploads)}): {file_name}", "INFO")
+                    uploaded.append(item_name)
+                except Exception as e:
+                    self.log_message(db_type, f"Error uploading CSV {file_name}: {str(e)}", "ERROR")
+        finally:
+            for conn in pg_conns:
+                conn.close()
+        return uploaded
+
+    def open_csv_source(self, db_type, file_name, chunk_size):
+        # Encoding, dialect and column types come from the start of the file; rows are read a chunk at a time
+        source = CsvSource(file_name, chunk_size=chunk_size)
+        self.log_message(db_type, f"Reading {os.path.basename(file_name)}: {source.describe()}", "INFO")
+        return source
+
+    def upload_postgresql_csv(self, table_name, source, index_columns=(), pg_conn=None):
+        # COPY into an unlogged staging table, cast into the typed table in one INSERT ... SELECT
+        rows = load_csv(pg_conn or self.pg_conn, source.file_name, table_name, source.encoding, source.dialect, index_columns,
+                        log=lambda message: self.log_message("PostgreSQL", message, "INFO"))
+        self.log_message("PostgreSQL", f"Uploaded {rows} rows to {table_name}", "INFO")
+
+    def upload_mongodb_csv(self, collection_name, source, options):
+        sink = MongoDBBulkSink(
+            self.mongo_db[collection_name],
+            log=lambda message, level="INFO": self.log_message("MongoDB", message, level),
+            controller=AdaptiveBatchController.from_options(options, options['mongo_batch_size']))
+        for batch in source.chunks():
+            if QThread.currentThread().isInterruptionRequested():
+                break
+            sink.write(batch)
+        sink.close()
+        self.log_upload_batches("MongoDB", collection_name, sink)
+
+    def ask_key_column(self, source, title, label, no_key):
+        key, ok = QInputDialog.getItem(self, title, label, [no_key] + source.columns, 0, False)
+        return key if ok and key != no_key else None
+
+    def upload_neo4j_csv(self, label, source, options, key=None):
+        # Clear existing nodes with this label, a batch per transaction; a cancel stops after the current batch
+        stop_event = InterruptionEvent()
+        cleared = delete_nodes_in_batches(self.neo4j_driver, label, stop_event=stop_event)
+        if cleared:
+            self.log_message("Neo4j", f"Deleted {cleared} existing {label} nodes", "INFO")
+        if stop_event.is_set():
+            raise RuntimeError(f"Upload to {label} cancelled while clearing existing nodes")
+        if key:
+            with self.neo4j_driver.session() as session:
+                ensure_unique_constraint(session, label, key)
+            self.log_message("Neo4j", f"Uniqueness constraint on {label}.{key}, rows are merged on it", "INFO")
+
+        # Create new nodes
+        sink = Neo4jBatchSink(
+            self.neo4j_driver, label,
+            writers=options['neo4j_writers'],
+            log=lambda message, level="INFO": self.log_message("Neo4j", message, level),
+            controller=AdaptiveBatchController.from_options(options, options['neo4j_batch_size']),
+            key=key)
+        for batch in source.chunks():
+            if QThread.currentThread().isInterruptionRequested():
+                break
+            sink.write(batch)
+        sink.close()
+        self.log_upload_batches("Neo4j", label, sink)
+
+    def log_upload_batches(self, db_type, item_name, sink):
+        self.log_message(db_type, f"Uploaded {sink.migrated} rows to {item_name} ({sink.failed} rejected), "
+                                  f"batch sizes: {sink.controller.summary()}", "INFO")
 
 
 
@@ -1486,15 +1923,70 @@ class DatabaseViewer(QMainWindow):
         self.target_columns_selected_label.setText("Number of columns selected: 0")
         
     def closeEvent(self, event):
+        self.cancel_db_tasks()
         self.disconnect_databases()
         event.accept()
 
-    def get_postgresql_data(self, table_name, columns):
+    def get_postgresql_data(self, table_name, columns, pg_conn=None):
         columns_str = ", ".join(f'"{col}"' for col in columns)
         query = f'SELECT {columns_str} FROM "{table_name}"'
         self.log_message("PostgreSQL", f"Executing query: {query}", "DEBUG")
-        self.pg_cur.execute(query)
-        return self.pg_cur.fetchall()
+        cur = pg_conn.cursor() if pg_conn else self.pg_cur
+        cur.execute(query)
+        return cur.fetchall()
+
+    def get_postgresql_primary_key(self, table_name, pg_conn=None):
+        cur = pg_conn.cursor() if pg_conn else self.pg_cur
+        cur.execute("""
+            SELECT a.attname
+            FROM pg_index i
+            JOIN pg_attribute a ON a.attrelid = i.indrelid AND a.attnum = ANY(i.indkey)
+            WHERE i.indrelid = %s::regclass AND i.indisprimary
+        """, (f'"{table_name}"',))
+        key_columns = [row[0] for row in cur.fetchall()]
+        return key_columns[0] if len(key_columns) == 1 else None
+
+    def get_keyset_column(self, db_name, table_name, pg_conn=None):
+        # Column the source can be read in order of and resumed from; None if there is no usable key
+        db_name = db_name.lower()
+        if db_name == "postgresql":
+            return self.get_postgresql_primary_key(table_name, pg_conn)
+        elif db_name in ("mongodb", "neo4j"):
+            return "_id"
+        return None
+
+    def iter_postgresql_data(self, table_name, columns, chunk_size=1000, itersize=10000, key_column=None, after=None,
+                             where=None, where_params=(), snapshot=None):
+        columns_str = ", ".join(f'"{col}"' for col in columns)
+        query = f'SELECT {columns_str} FROM "{table_name}"'
+        conditions = [where] if where else []
+        params = list(where_params)
+        if key_column:
+            # Keyset order: the key rides along as the last field, and a resume starts right after the watermark
+            query = f'SELECT {columns_str}, "{key_column}" FROM "{table_name}"'
+            if after is not None:
+                conditions.append(f'"{key_column}" > %s')
+                params.append(after)
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+        if key_column:
+            query += f' ORDER BY "{key_column}"'
+        # A private connection keeps the read transaction independent of commits made on self.pg_conn
+        conn = self.open_postgresql_connection()
+        try:
+            if snapshot:
+                ExportedSnapshot.attach(conn, snapshot)
+            # Named (server-side) cursor: the server keeps the result set and hands it over itersize rows at a time
+            with conn.cursor(name="migration_stream") as cur:
+                cur.itersize = itersize
+                cur.execute(query, params)
+                while True:
+                    chunk = list(islice(cur, chunk_size))
+                    if not chunk:
+                        break
+                    yield chunk
+        finally:
+            conn.close()
 
     def get_mongodb_data(self, collection_name, columns):
         collection = self.mongo_db[collection_name]
@@ -1504,6 +1996,27 @@ class DatabaseViewer(QMainWindow):
         self.log_message("MongoDB", f"Executing query: {query}", "DEBUG")
         return list(collection.find({}, projection))
 
+    def iter_mongodb_data(self, collection_name, columns, chunk_size=1000, itersize=10000, key_column=None, after=None,
+                          query_filter=None):
+        projection = {col: 1 for col in columns}
+        projection['_id'] = 0  # Exclude the _id field
+        query = dict(query_filter or {})
+        sort = None
+        if key_column:
+            projection['_id'] = 1
+            sort = [('_id', 1)]
+            if after is not None:
+                query = {'$and': [query, {'_id': {'$gt': after}}]} if query else {'_id': {'$gt': after}}
+        cursor = self.mongo_db[collection_name].find(query, projection, sort=sort, batch_size=itersize)
+        try:
+            while True:
+                chunk = list(islice(cursor, chunk_size))
+                if not chunk:
+                    break
+                yield chunk
+        finally:
+            cursor.close()
+
     def get_neo4j_data(self, label, columns):
         query = f"MATCH (n:`{label}`) RETURN {', '.join(f'n.{col} AS {col}' for col in columns)}"
         self.log_message("Neo4j", f"Executing query: {query}", "DEBUG")
@@ -1512,7 +2025,21 @@ class DatabaseViewer(QMainWindow):
             return [dict(record) for record in result]
 
 
-    def create_postgresql_table(self, table_name, columns):
+    def iter_neo4j_data(self, label, columns, chunk_size=1000, itersize=10000, key_column=None, after=None):
+        query = f"MATCH (n:`{label}`) RETURN {', '.join(f'n.{col} AS {col}' for col in columns)}"
+        if key_column:
+            where = "WHERE id(n) > $after " if after is not None else ""
+            query = (f"MATCH (n:`{label}`) {where}"
+                     f"RETURN {', '.join(f'n.{col} AS {col}' for col in columns)}, id(n) AS _id ORDER BY id(n)")
+        with self.neo4j_driver.session(fetch_size=itersize) as session:
+            result = session.run(query, after=after)
+            while True:
+                chunk = [dict(record) for record in islice(result, chunk_size)]
+                if not chunk:
+                    break
+                yield chunk
+
+    def create_postgresql_table(self, table_name, columns, pg_conn=None):
         columns_def = []
         for col in columns:
             if isinstance(col, tuple) and len(col) == 2:
@@ -1529,6 +2056,8 @@ class DatabaseViewer(QMainWindow):
                 col_type = 'DOUBLE PRECISION'
             elif data_type == 'int':
                 col_type = 'INTEGER'
+            elif typemap.is_postgresql_type(data_type):
+                col_type = data_type  # Already mapped by the type-mapping engine
             else:
                 col_type = 'TEXT'
             
@@ -1536,8 +2065,9 @@ class DatabaseViewer(QMainWindow):
         
         query = f'CREATE TABLE IF NOT EXISTS "{table_name}" ({", ".join(columns_def)})'
         self.log_message("PostgreSQL", f"Creating table: {query}", "DEBUG")
-        self.pg_cur.execute(query)
-        self.pg_conn.commit()
+        cur = pg_conn.cursor() if pg_conn else self.pg_cur
+        cur.execute(query)
+        (pg_conn or self.pg_conn).commit()
 
     def create_mongodb_collection(self, collection_name):
         self.log_message("MongoDB", f"Creating collection: {collection_name}", "DEBUG")
@@ -1547,10 +2077,10 @@ class DatabaseViewer(QMainWindow):
         # Neo4j doesn't require explicit label creation
         self.log_message("Neo4j", f"Label '{label}' will be created automatically during data insertion", "DEBUG")
 
-    def get_data(self, db_name, table_name, columns):
+    def get_data(self, db_name, table_name, columns, pg_conn=None):
         db_name = db_name.lower()
         if db_name == "postgresql":
-            return self.get_postgresql_data(table_name, columns)
+            return self.get_postgresql_data(table_name, columns, pg_conn)
         elif db_name == "mongodb":
             return self.get_mongodb_data(table_name, columns)
         elif db_name == "neo4j":
@@ -1558,10 +2088,96 @@ class DatabaseViewer(QMainWindow):
         else:
             raise ValueError(f"Unsupported database type: {db_name}")
         
-    def create_target_table(self, db_name, table_name, columns):
+    def get_postgresql_partitions(self, table_name, partitions, pg_conn=None):
+        """Split a table into (where, params) ranges for parallel readers: integer primary key ranges,
+        or ctid page ranges when there is no integer key."""
+        cur = pg_conn.cursor() if pg_conn else self.pg_cur
+        key_column = self.get_postgresql_primary_key(table_name, pg_conn)
+        if key_column:
+            cur.execute(f'SELECT min("{key_column}"), max("{key_column}") FROM "{table_name}"')
+            low, high = cur.fetchone()
+            if isinstance(low, int) and isinstance(high, int):
+                step = max(1, -(-(high - low + 1) // partitions))
+                bounds = list(range(low, high + 1, step))
+                ranges = [(f'"{key_column}" >= %s AND "{key_column}" < %s', (start, start + step)) for start in bounds[:-1]]
+                # The last range is open-ended, so rows added past max() during the read are not lost
+                ranges.append((f'"{key_column}" >= %s', (bounds[-1],)))
+                return ranges
+
+        cur.execute("SELECT pg_relation_size(%s::regclass) / current_setting('block_size')::bigint",
+                    (f'"{table_name}"',))
+        pages = cur.fetchone()[0]
+        step = max(1, -(-pages // partitions))
+        bounds = list(range(0, max(pages, 1), step))
+        ranges = [("ctid >= %s::tid AND ctid < %s::tid", (f"({start},0)", f"({start + step},0)")) for start in bounds[:-1]]
+        ranges.append(("ctid >= %s::tid", (f"({bounds[-1]},0)",)))
+        return ranges
+
+    def get_mongodb_partitions(self, collection_name, partitions):
+        """Split a collection into _id range filters for parallel readers."""
+        collection = self.mongo_db[collection_name]
+        try:
+            # splitVector gives chunk boundaries straight from the _id index
+            size = self.mongo_db.command("collStats", collection_name)["size"]
+            result = self.mongo_db.command("splitVector", f"{self.mongo_db.name}.{collection_name}",
+                                           keyPattern={'_id': 1}, maxChunkSizeBytes=max(1, size // partitions))
+            split_keys = [key['_id'] for key in result['splitKeys']]
+        except Exception:
+            # Not permitted on Atlas/shared tiers: let the server bucket _id values instead
+            buckets = collection.aggregate([{'$bucketAuto': {'groupBy': '$_id', 'buckets': partitions}}])
+            split_keys = [bucket['_id']['min'] for bucket in buckets][1:]
+
+        bounds = [None] + split_keys + [None]
+        filters = []
+        for low, high in zip(bounds, bounds[1:]):
+            condition = {}
+            if low is not None:
+                condition['$gte'] = low
+            if high is not None:
+                condition['$lt'] = high
+            filters.append({'_id': condition} if condition else {})
+        return filters
+
+    def iter_partitioned_data(self, db_name, table_name, columns, chunk_size=1000, itersize=10000, partitions=4,
+                              pg_conn=None, snapshot=None):
         db_name = db_name.lower()
         if db_name == "postgresql":
-            self.create_postgresql_table(table_name, columns)
+            ranges = self.get_postgresql_partitions(table_name, partitions, pg_conn)
+            readers = [
+                lambda where=where, params=params: self.iter_postgresql_data(
+                    table_name, columns, chunk_size, itersize, where=where, where_params=params, snapshot=snapshot)
+                for where, params in ranges
+            ]
+        elif db_name == "mongodb":
+            filters = self.get_mongodb_partitions(table_name, partitions)
+            readers = [
+                lambda query_filter=query_filter: self.iter_mongodb_data(
+                    table_name, columns, chunk_size, itersize, query_filter=query_filter)
+                for query_filter in filters
+            ]
+        else:
+            # Neo4j labels have no cheap range split; read them with a single stream
+            return self.iter_data(db_name, table_name, columns, chunk_size, itersize, snapshot=snapshot)
+
+        self.log_message("Migration", f"Reading {table_name} in {len(readers)} parallel partitions", "INFO")
+        return iter_parallel(readers, queue_size=len(readers) * 2)
+
+    def iter_data(self, db_name, table_name, columns, chunk_size=1000, itersize=10000, key_column=None, after=None,
+                  snapshot=None):
+        db_name = db_name.lower()
+        if db_name == "postgresql":
+            return self.iter_postgresql_data(table_name, columns, chunk_size, itersize, key_column, after, snapshot=snapshot)
+        elif db_name == "mongodb":
+            return self.iter_mongodb_data(table_name, columns, chunk_size, itersize, key_column, after)
+        elif db_name == "neo4j":
+            return self.iter_neo4j_data(table_name, columns, chunk_size, itersize, key_column, after)
+        else:
+            raise ValueError(f"Unsupported database type: {db_name}")
+
+    def create_target_table(self, db_name, table_name, columns, pg_conn=None):
+        db_name = db_name.lower()
+        if db_name == "postgresql":
+            self.create_postgresql_table(table_name, columns, pg_conn)
         elif db_name == "mongodb":
             self.create_mongodb_collection(table_name)
         elif db_name == "neo4j":
@@ -1569,10 +2185,10 @@ class DatabaseViewer(QMainWindow):
         else:
             raise ValueError(f"Unsupported database type: {db_name}")
 
-    def insert_row(self, db_name, table_name, columns, row):
+    def insert_row(self, db_name, table_name, columns, row, pg_conn=None):
         db_name = db_name.lower()
         if db_name == "postgresql":
-            self.insert_postgresql_row(table_name, columns, row)
+            self.insert_postgresql_row(table_name, columns, row, pg_conn)
         elif db_name == "mongodb":
             self.insert_mongodb_row(table_name, columns, row)
         elif db_name == "neo4j":
@@ -1580,6 +2196,17 @@ class DatabaseViewer(QMainWindow):
         else:
             raise ValueError(f"Unsupported database type: {db_name}")
 
+    def get_value_converter(self, db_name):
+        db_name = db_name.lower()
+        if db_name == "postgresql":
+            return self.convert_for_postgresql
+        elif db_name == "mongodb":
+            return self.convert_for_mongodb
+        elif db_name == "neo4j":
+            return self.custom_decimal_conversion
+        else:
+            raise ValueError(f"Unsupported database type: {db_name}")
+
 
     @staticmethod
     def convert_for_postgresql(obj):
@@ -1599,11 +2226,12 @@ class DatabaseViewer(QMainWindow):
             return float(obj)
         return obj
 
-    def insert_postgresql_row(self, table_name, columns, row):
+    def insert_postgresql_row(self, table_name, columns, row, pg_conn=None):
         columns_str = ", ".join(f'"{col}"' for col in columns)
         placeholders = ", ".join(["%s"] * len(columns))
         query = f'INSERT INTO "{table_name}" ({columns_str}) VALUES ({placeholders})'
-        if self.pg_cur.rowcount == 0:  # Log only the first insert
+        cur = pg_conn.cursor() if pg_conn else self.pg_cur
+        if cur.rowcount == 0:  # Log only the first insert
             self.log_message("PostgreSQL", f"Inserting data: {query}", "DEBUG")
         
         # Convert row to a list if it's a dictionary
@@ -1612,8 +2240,8 @@ class DatabaseViewer(QMainWindow):
         else:
             row = [self.convert_for_postgresql(val) for val in row]
         
-        self.pg_cur.execute(query, row)
-        self.pg_conn.commit()
+        cur.execute(query, row)
+        (pg_conn or self.pg_conn).commit()
         
 
 
@@ -1631,9 +2259,9 @@ class DatabaseViewer(QMainWindow):
         else:
             document = {col: self.convert_for_mongodb(val) for col, val in zip(columns, row)}
         
-        query = f"db.{collection_name}.insertOne({document})"
-        if self.mongo_db[collection_name].count_documents({}) == 0:  # Log only the first insert
-            self.log_message("MongoDB", f"Inserting data: {query}", "DEBUG")
+        if collection_name not in self.logged_mongodb_inserts:  # Log only the first insert
+            self.logged_mongodb_inserts.add(collection_name)
+            self.log_message("MongoDB", f"Inserting data: db.{collection_name}.insertOne({document})", "DEBUG")
         self.mongo_db[collection_name].insert_one(document)
         
 
@@ -1958,23 +2586,8 @@ class DatabaseViewer(QMainWindow):
         limit = 10
         query = BASE_QUERY_TEMPLATE.format(relationship_name, limit)
 
-        try:
-            with self.neo4j_driver.session() as session:
-                result = session.run(query)
-                records = list(result)
-                
-                if not records:
-                    self.log_message("Relate", f"No relationships found for type: {relationship_name}", "INFO")
-                else:
-                    self.log_message("Relate", f"Displaying relationships of type: {relationship_name}", "INFO")
-                    for record in records:
-                        source_props = ", ".join([f"{k}: {v}" for k, v in record['source_props'].items()])
-                        target_props = ", ".join([f"{k}: {v}" for k, v in record['target_props'].items()])
-                        relationship_info = f"({':'.join(record['source_labels'])} {{{source_props}}}) -[:{record['relationship_type']}]-> ({':'.join(record['target_labels'])} {{{target_props}}})"
-                        self.log_message("Relate", relationship_info, "INFO")
-                
-        except Exception as e:
-            self.log_message("Relate", f"Error viewing relationships: {str(e)}", "ERROR")
+        self.run_db_task("Relate", "viewing relationships", lambda: self.run_cypher(query),
+                         lambda result: self.log_relationships("Relate", relationship_name, result[0]))
             
 
     def update_cypher_query(self):
@@ -2277,31 +2890,47 @@ class DatabaseViewer(QMainWindow):
 
         self.relate_progress_bar.setValue(0)  # Reset progress bar
 
-        try:
-            with self.neo4j_driver.session() as session:
-                result = session.run(query)
-                records = list(result)  # Consume all records
-                summary = result.consume()
-                
-                # Check if the query returns a 'rel_count'
-                if records and 'rel_count' in records[0]:
-                    rel_count = records[0]['rel_count']
-                else:
-                    # If not, we'll use the number of relationships created from the summary
-                    rel_count = summary.counters.relationships_created
-                
-                self.log_message("Relate", f"Created {rel_count} relationships", "INFO")
-                
-                # After creating relationships, refresh the relationship types
-                self.refresh_relationship_types()
-                
-                # After creating relationships, automatically view them
-                self.view_relationships()
-        except Exception as e:
-            self.log_message("Relate", f"Error creating relationships: {str(e)}", "ERROR")
-        finally:
+        def on_created(result):
+            records, summary = result
             self.relate_progress_bar.setValue(100)
 
+            # Check if the query returns a 'rel_count'
+            if records and 'rel_count' in records[0]:
+                rel_count = records[0]['rel_count']
+            else:
+                # If not, we'll use the number of relationships created from the summary
+                rel_count = summary.counters.relationships_created
+
+            self.log_message("Relate", f"Created {rel_count} relationships", "INFO")
+
+            # After creating relationships, refresh the relationship types
+            self.refresh_relationship_types()
+
+            # After creating relationships, automatically view them
+            self.view_relationships()
+
+        self.run_db_task("Relate", "creating relationships", lambda: self.run_cypher(query), on_created,
+                         on_failed=lambda _: self.relate_progress_bar.setValue(100))
+
+    def run_cypher(self, query):
+        # Runs on a DbTask thread. The transaction timeout makes the server give up on a query
+        # that outlives its task, since a running Bolt query cannot be interrupted from another thread.
+        with self.neo4j_driver.session() as session:
+            result = session.run(Query(query, timeout=DB_TASK_TIMEOUT))
+            records = list(result)  # Consume all records
+            return records, result.consume()
+
+    def log_relationships(self, category, relationship_name, records):
+        if not records:
+            self.log_message(category, f"No relationships found for type: {relationship_name}", "INFO")
+            return
+        self.log_message(category, f"Displaying relationships of type: {relationship_name}", "INFO")
+        for record in records:
+            source_props = ", ".join([f"{k}: {v}" for k, v in record['source_props'].items()])
+            target_props = ", ".join([f"{k}: {v}" for k, v in record['target_props'].items()])
+            relationship_info = f"({':'.join(record['source_labels'])} {{{source_props}}}) -[:{record['relationship_type']}]-> ({':'.join(record['target_labels'])} {{{target_props}}})"
+            self.log_message(category, relationship_info, "INFO")
+
 
     def setup_join_tab_ui(self, parent):
         layout = QVBoxLayout()
@@ -2506,35 +3135,32 @@ class DatabaseViewer(QMainWindow):
 
         self.join_progress_bar.setValue(0)  # Reset progress bar
 
-        try:
-            with self.neo4j_driver.session() as session:
-                result = session.run(query)
-                records = list(result)
-                summary = result.consume()
-                
-                if records and 'rel_count' in records[0]:
-                    rel_count = records[0]['rel_count']
-                else:
-                    rel_count = summary.counters.relationships_created
-                
-                self.log_message("Join", f"Created {rel_count} relationships", "INFO")
-                
-                # Refresh relationship types and update combo box
-                relationship_types = self.get_relationship_types()
-                current_rel = self.join_relationship_name_combo.currentText()
-                self.join_relationship_name_combo.clear()
-                self.join_relationship_name_combo.addItems(relationship_types)
-                if current_rel in relationship_types:
-                    self.join_relationship_name_combo.setCurrentText(current_rel)
-                elif relationship_types:
-                    self.join_relationship_name_combo.setCurrentIndex(0)
-                
-                # After creating relationships, automatically view them
-                self.view_join_relationships()
-        except Exception as e:
-            self.log_message("Join", f"Error creating relationships: {str(e)}", "ERROR")
-        finally:
+        def on_created(result):
+            records, summary = result
             self.join_progress_bar.setValue(100)
+
+            if records and 'rel_count' in records[0]:
+                rel_count = records[0]['rel_count']
+            else:
+                rel_count = summary.counters.relationships_created
+
+            self.log_message("Join", f"Created {rel_count} relationships", "INFO")
+
+            # Refresh relationship types and update combo box
+            relationship_types = self.get_relationship_types()
+            current_rel = self.join_relationship_name_combo.currentText()
+            self.join_relationship_name_combo.clear()
+            self.join_relationship_name_combo.addItems(relationship_types)
+            if current_rel in relationship_types:
+                self.join_relationship_name_combo.setCurrentText(current_rel)
+            elif relationship_types:
+                self.join_relationship_name_combo.setCurrentIndex(0)
+
+            # After creating relationships, automatically view them
+            self.view_join_relationships()
+
+        self.run_db_task("Join", "creating relationships", lambda: self.run_cypher(query), on_created,
+                         on_failed=lambda _: self.join_progress_bar.setValue(100))
             
 
     def view_join_relationships(self):
@@ -2555,23 +3181,8 @@ class DatabaseViewer(QMainWindow):
         LIMIT 10
         """
 
-        try:
-            with self.neo4j_driver.session() as session:
-                result = session.run(query)
-                records = list(result)
-                
-                if not records:
-                    self.log_message("Join", f"No relationships found for type: {relationship_name}", "INFO")
-                else:
-                    self.log_message("Join", f"Displaying relationships of type: {relationship_name}", "INFO")
-                    for record in records:
-                        source_props = ", ".join([f"{k}: {v}" for k, v in record['source_props'].items()])
-                        target_props = ", ".join([f"{k}: {v}" for k, v in record['target_props'].items()])
-                        relationship_info = f"({':'.join(record['source_labels'])} {{{source_props}}}) -[:{record['relationship_type']}]-> ({':'.join(record['target_labels'])} {{{target_props}}})"
-                        self.log_message("Join", relationship_info, "INFO")
-                
-        except Exception as e:
-            self.log_message("Join", f"Error viewing relationships: {str(e)}", "ERROR")
+        self.run_db_task("Join", "viewing relationships", lambda: self.run_cypher(query),
+                         lambda result: self.log_relationships("Join", relationship_name, result[0]))
 
 
     def update_join_source_properties(self):
@@ -0,0 +1,79 @@
+import queue
+import threading
+
+
+def iter_parallel(readers, queue_size=8):
+    """Run several chunk generators on their own threads and yield their chunks as they arrive.
+
+    Each reader is a callable returning a generator of chunks. Chunk order across
+    readers is not preserved. Closing this generator stops and closes all readers.
+    """
+    chunks = queue.Queue(maxsize=queue_size)
+    stop = threading.Event()
+    done = object()
+
+    def put(item):
+        while not stop.is_set():
+            try:
+                chunks.put(item, timeout=0.5)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def run(reader):
+        generator = None
+        try:
+            generator = reader()
+            for chunk in generator:
+                if not put(chunk):
+                    break
+        except Exception as e:
+            put(e)
+        finally:
+            if generator is not None:
+                generator.close()  # Releases the reader's connection/cursor right away
+            put(done)
+
+    threads = [threading.Thread(target=run, args=(reader,), daemon=True) for reader in readers]
+    for thread in threads:
+        thread.start()
+
+    try:
+        remaining = len(threads)
+        while remaining:
+            item = chunks.get()
+            if item is done:
+                remaining -= 1
+            elif isinstance(item, Exception):
+                raise item
+            else:
+                yield item
+    finally:
+        stop.set()
+        for thread in threads:
+            thread.join()
+
+
+class ExportedSnapshot:
+    """Keeps a PostgreSQL transaction open and exports its snapshot, so parallel
+    reader connections can attach to it and all see the same point in time."""
+
+    def __init__(self, conn):
+        self.conn = conn
+        self.conn.set_session(isolation_level='REPEATABLE READ', readonly=True)
+        with self.conn.cursor() as cur:
+            cur.execute("SELECT pg_export_snapshot()")
+            self.snapshot_id = cur.fetchone()[0]
+
+    @staticmethod
+    def attach(conn, snapshot_id):
+        # SET TRANSACTION SNAPSHOT has to be the first statement of a REPEATABLE READ transaction
+        conn.set_session(isolation_level='REPEATABLE READ', readonly=True)
+        with conn.cursor() as cur:
+            cur.execute("SET TRANSACTION SNAPSHOT %s", (snapshot_id,))
+        return conn
+
+    def close(self):
+        self.conn.rollback()
+        self.conn.close()
@@ -0,0 +1,490 @@
+import io
+import json
+import queue
+import struct
+import threading
+import time
+from datetime import date, datetime, timezone
+
+import neo4j.exceptions
+from pymongo.errors import BulkWriteError
+
+from columnar import ColumnBatch
+
+
+class AdaptiveBatchController:
+    """Grows or shrinks a bulk writer's batch size towards a target commit latency."""
+
+    RESOURCE_ERRORS = ("memory", "timeout", "timed out", "transienterror", "too large")
+
+    def __init__(self, initial=1000, minimum=10, maximum=100000, target_seconds=1.0,
+                 max_bytes=32 * 1024 * 1024, adaptive=True):
+        self.size = max(minimum, min(initial, maximum))
+        self.minimum = minimum
+        self.maximum = maximum
+        self.target_seconds = target_seconds
+        self.max_bytes = max_bytes
+        self.adaptive = adaptive
+        self.history = [self.size]
+        self.lock = threading.Lock()
+
+    @classmethod
+    def from_options(cls, options, initial):
+        """Build a controller from the Migrate tab options dict."""
+        return cls(initial=initial,
+                   target_seconds=options.get('target_commit_ms', 1000) / 1000,
+                   adaptive=options.get('adaptive_batches', True))
+
+    @staticmethod
+    def estimate_bytes(rows, sample=20):
+        if not rows:
+            return 0
+        step = max(1, len(rows) // sample)
+        sampled = rows[::step][:sample]
+        row_bytes = sum(len(str(row)) for row in sampled) / len(sampled)
+        return int(row_bytes * len(rows))
+
+    def is_resource_error(self, error):
+        message = f"{type(error).__name__} {error}".lower()
+        return any(marker in message for marker in self.RESOURCE_ERRORS)
+
+    def set_size(self, size):
+        size = max(self.minimum, min(int(size), self.maximum))
+        if size != self.size:
+            self.size = size
+            self.history.append(size)
+
+    def record(self, rows, seconds, payload_bytes=0):
+        """Feed back one committed batch; returns the batch size to use next."""
+        with self.lock:
+            if not self.adaptive or rows < self.size // 2:
+                return self.size  # Partial tail batches say little about latency
+            # Move part of the way towards the size that would hit the target latency
+            factor = min(2.0, max(0.5, self.target_seconds / max(seconds, 1e-3)))
+            size = self.size * (1 + (factor - 1) / 2)
+            if payload_bytes and rows:
+                size = min(size, self.max_bytes / (payload_bytes / rows))
+            self.set_size(size)
+            return self.size
+
+    def back_off(self, error):
+        """Halve the batch size after a memory or timeout error; returns True if it was one."""
+        if not self.adaptive or not self.is_resource_error(error):
+            return False
+        with self.lock:
+            self.set_size(self.size // 2)
+        return True
+
+    def summary(self):
+        sizes = self.history if len(self.history) <= 8 else self.history[:3] + ["..."] + self.history[-4:]
+        return " > ".join(str(size) for size in sizes)
+
+
+class PostgreSQLCopySink:
+    """Bulk writer that streams converted rows into COPY ... FROM STDIN."""
+
+    PG_EPOCH = datetime(2000, 1, 1)
+    PG_EPOCH_DATE = date(2000, 1, 1)
+
+    def __init__(self, conn, table_name, columns, copy_format="text",
+                 commit_rows=50000, commit_bytes=64 * 1024 * 1024, log=None, controller=None):
+        self.conn = conn
+        self.cur = conn.cursor()
+        self.table_name = table_name
+        self.columns = columns
+        self.log = log or (lambda message, level="INFO": None)
+        self.controller = controller or AdaptiveBatchController(adaptive=False)
+        self.buffer = []
+        self.commit_rows = commit_rows
+        self.commit_bytes = commit_bytes
+        self.migrated = 0
+        self.failed = 0
+        self.pending_rows = 0
+        self.pending_bytes = 0
+
+        self.column_types = self.get_column_types()
+        self.copy_format = copy_format
+        if copy_format == "binary":
+            unsupported = [col for col in columns if self.column_types.get(col) not in self.BINARY_ENCODERS]
+            if unsupported:
+                self.log(f"Binary COPY does not support columns {unsupported}, using text format", "WARN")
+                self.copy_format = "text"
+
+        columns_str = ", ".join(f'"{col}"' for col in columns)
+        options = " (FORMAT binary)" if self.copy_format == "binary" else ""
+        self.copy_sql = f'COPY "{table_name}" ({columns_str}) FROM STDIN{options}'
+
+    def get_column_types(self):
+        self.cur.execute("""
+            SELECT a.attname, t.typname
+            FROM pg_attribute a
+            JOIN pg_type t ON t.oid = a.atttypid
+            WHERE a.attrelid = %s::regclass AND a.attnum > 0 AND NOT a.attisdropped
+        """, (f'"{self.table_name}"',))
+        return dict(self.cur.fetchall())
+
+    # Text format
+
+    @staticmethod
+    def text_value(value):
+        if value is None:
+            return "\\N"
+        if isinstance(value, bool):
+            return "t" if value else "f"
+        if isinstance(value, (datetime, date)):
+            value = value.isoformat()
+        elif isinstance(value, (bytes, memoryview)):
+            value = "\\x" + bytes(value).hex()
+        elif isinstance(value, (list, tuple)):
+            value = PostgreSQLCopySink.array_literal(value)
+        elif isinstance(value, dict):
+            value = json.dumps(value, default=str)
+        else:
+            value = str(value)
+        return (value.replace("\\", "\\\\").replace("\t", "\\t")
+                .replace("\n", "\\n").replace("\r", "\\r"))
+
+    @staticmethod
+    def array_literal(values):
+        elements = []
+        for value in values:
+            if value is None:
+                elements.append("NULL")
+            elif isinstance(value, (list, tuple)):
+                elements.append(PostgreSQLCopySink.array_literal(value))
+            else:
+                text = value.isoformat() if isinstance(value, (datetime, date)) else str(value)
+                elements.append('"' + text.replace("\\", "\\\\").replace('"', '\\"') + '"')
+        return "{" + ",".join(elements) + "}"
+
+    def encode_text_row(self, row):
+        return ("\t".join(self.text_value(row.get(col)) for col in self.columns) + "\n").encode("utf-8")
+
+    # Binary format
+
+    @staticmethod
+    def binary_text(value):
+        if isinstance(value, (datetime, date)):
+            value = value.isoformat()
+        return str(value).encode("utf-8")
+
+    @staticmethod
+    def binary_timestamp(value):
+        if isinstance(value, str):
+            value = datetime.fromisoformat(value)
+        if value.tzinfo is not None:
+            value = value.astimezone(timezone.utc).replace(tzinfo=None)
+        delta = value - PostgreSQLCopySink.PG_EPOCH
+        return struct.pack("!q", (delta.days * 86400 + delta.seconds) * 1000000 + delta.microseconds)
+
+    @staticmethod
+    def binary_date(value):
+        if isinstance(value, str):
+            value = date.fromisoformat(value)
+        elif isinstance(value, datetime):
+            value = value.date()
+        return struct.pack("!i", (value - PostgreSQLCopySink.PG_EPOCH_DATE).days)
+
+    BINARY_ENCODERS = {
+        "text": binary_text.__func__,
+        "varchar": binary_text.__func__,
+        "bpchar": binary_text.__func__,
+        "int2": lambda value: struct.pack("!h", int(value)),
+        "int4": lambda value: struct.pack("!i", int(value)),
+        "int8": lambda value: struct.pack("!q", int(value)),
+        "float4": lambda value: struct.pack("!f", float(value)),
+        "float8": lambda value: struct.pack("!d", float(value)),
+        "bool": lambda value: b"\x01" if value else b"\x00",
+        "bytea": lambda value: bytes(value),
+        "date": binary_date.__func__,
+        "timestamp": binary_timestamp.__func__,
+        "timestamptz": binary_timestamp.__func__,
+    }
+
+    @staticmethod
+    def binary_field(encode, value):
+        if value is None:
+            return struct.pack("!i", -1)
+        data = encode(value)
+        return struct.pack("!i", len(data)) + data
+
+    def encode_binary_row(self, row):
+        parts = [struct.pack("!h", len(self.columns))]
+        for col in self.columns:
+            parts.append(self.binary_field(self.BINARY_ENCODERS[self.column_types[col]], row.get(col)))
+        return b"".join(parts)
+
+    def encode_rows(self, rows):
+        """Encode rows one by one, so a row that cannot be encoded is rejected on its own."""
+        encode = self.encode_binary_row if self.copy_format == "binary" else self.encode_text_row
+        encoded = []
+        for row in rows:
+            try:
+                encoded.append(encode(row))
+            except Exception as e:
+                self.failed += 1
+                self.log(f"Rejected row {row}: {str(e)}", "ERROR")
+        return encoded
+
+    def encode_batch(self, batch):
+        """Encode a ColumnBatch column by column; rows are only assembled as finished COPY lines."""
+        if self.copy_format == "binary":
+            try:
+                encoded_columns = []
+                for col in self.columns:
+                    encode = self.BINARY_ENCODERS[self.column_types[col]]
+                    encoded_columns.append([self.binary_field(encode, value) for value in batch.column(col)])
+            except Exception:
+                return self.encode_rows(batch.to_dicts())  # Find and reject the offending rows one by one
+            field_count = struct.pack("!h", len(self.columns))
+            return [field_count + b"".join(fields) for fields in zip(*encoded_columns)]
+
+        encoded_columns = [list(map(self.text_value, batch.column(col))) for col in self.columns]
+        return [("\t".join(fields) + "\n").encode("utf-8") for fields in zip(*encoded_columns)]
+
+    def copy(self, encoded_rows):
+        payload = b"".join(encoded_rows)
+        if self.copy_format == "binary":
+            payload = b"PGCOPY\n\xff\r\n\x00" + struct.pack("!ii", 0, 0) + payload + struct.pack("!h", -1)
+        self.cur.copy_expert(self.copy_sql, io.BytesIO(payload))
+        return len(payload)
+
+    def copy_with_fallback(self, encoded_rows):
+        # Each attempt runs under a savepoint, so a failed COPY only discards its own rows
+        self.cur.execute("SAVEPOINT copy_batch")
+        try:
+            size = self.copy(encoded_rows)
+            self.cur.execute("RELEASE SAVEPOINT copy_batch")
+            self.migrated += len(encoded_rows)
+            self.pending_rows += len(encoded_rows)
+            self.pending_bytes += size
+        except Exception as e:
+            self.cur.execute("ROLLBACK TO SAVEPOINT copy_batch")
+            if self.controller.back_off(e):
+                self.log(f"COPY of {len(encoded_rows)} rows hit a resource limit, batch size now {self.controller.size}", "WARN")
+            if len(encoded_rows) == 1:
+                self.failed += 1
+                self.log(f"Rejected row: {str(e).strip()}", "ERROR")
+                return
+            # Split and retry, narrowing down to the rows COPY actually rejects
+            middle = len(encoded_rows) // 2
+            self.copy_with_fallback(encoded_rows[:middle])
+            self.copy_with_fallback(encoded_rows[middle:])
+
+    def flush_batch(self, encoded):
+        if encoded:
+            started = time.time()
+            pending_bytes = self.pending_bytes
+            self.copy_with_fallback(encoded)
+            self.controller.record(len(encoded), time.time() - started, self.pending_bytes - pending_bytes)
+        if self.pending_rows >= self.commit_rows or self.pending_bytes >= self.commit_bytes:
+            self.commit()
+
+    def write(self, rows):
+        # Rows are encoded on arrival; the buffer holds finished COPY lines
+        self.buffer.extend(self.encode_batch(rows) if isinstance(rows, ColumnBatch) else self.encode_rows(rows))
+        while len(self.buffer) >= self.controller.size:
+            batch, self.buffer = self.buffer[:self.controller.size], self.buffer[self.controller.size:]
+            self.flush_batch(batch)
+
+    def commit(self):
+        self.conn.commit()
+        self.pending_rows = 0
+        self.pending_bytes = 0
+
+    def flush(self):
+        """Write and commit everything buffered so far."""
+        if self.buffer:
+            batch, self.buffer = self.buffer, []
+            self.flush_batch(batch)
+        self.commit()
+
+    def close(self):
+        self.flush()
+        self.cur.close()
+
+
+class MongoDBBulkSink:
+    """Bulk writer that buffers documents and flushes them with unordered insert_many."""
+
+    def __init__(self, collection, batch_size=1000, log=None, controller=None):
+        self.collection = collection
+        self.log = log or (lambda message, level="INFO": None)
+        self.controller = controller or AdaptiveBatchController(initial=batch_size, adaptive=False)
+        self.buffer = []
+        self.migrated = 0
+        self.failed = 0
+
+    def write(self, rows):
+        self.buffer.extend(rows.to_dicts() if isinstance(rows, ColumnBatch) else rows)
+        while len(self.buffer) >= self.controller.size:
+            batch, self.buffer = self.buffer[:self.controller.size], self.buffer[self.controller.size:]
+            self.flush_batch(batch)
+
+    def flush_batch(self, batch):
+        try:
+            started = time.time()
+            result = self.collection.insert_many(batch, ordered=False)
+            self.migrated += len(result.inserted_ids)
+            self.controller.record(len(batch), time.time() - started, self.controller.estimate_bytes(batch))
+        except BulkWriteError as e:
+            # Unordered: the server keeps going past bad documents, so only the listed ones failed
+            details = e.details
+            write_errors = details.get('writeErrors', [])
+            self.migrated += details.get('nInserted', 0)
+            self.failed += len(batch) - details.get('nInserted', 0)
+            for error in write_errors[:10]:
+                self.log(f"Rejected document {error.get('index')}: {error.get('errmsg')}", "ERROR")
+            if len(write_errors) > 10:
+                self.log(f"... and {len(write_errors) - 10} more write errors in this batch", "ERROR")
+        except Exception as e:
+            if not self.controller.back_off(e) or len(batch) == 1:
+                raise
+            self.log(f"Batch of {len(batch)} documents hit a resource limit, batch size now {self.controller.size}", "WARN")
+            middle = len(batch) // 2
+            self.flush_batch(batch[:middle])
+            self.flush_batch(batch[middle:])
+
+    def flush(self):
+        if self.buffer:
+            batch, self.buffer = self.buffer, []
+            self.flush_batch(batch)
+
+    def close(self):
+        self.flush()
+
+
+def ensure_unique_constraint(session, label, key):
+    """Uniqueness constraint (and its index) on label.key, so MERGE on the key is an index lookup."""
+    try:
+        session.run(f"CREATE CONSTRAINT IF NOT EXISTS FOR (n:`{label}`) REQUIRE n.`{key}` IS UNIQUE").consume()
+    except neo4j.exceptions.CypherSyntaxError:
+        # Neo4j before 4.4 only knows the older syntax
+        session.run(f"CREATE CONSTRAINT ON (n:`{label}`) ASSERT n.`{key}` IS UNIQUE").consume()
+
+
+DELETE_BATCH_SIZE = 10000
+
+
+def delete_nodes_in_batches(driver, label=None, batch_size=DELETE_BATCH_SIZE, batches_per_query=10,
+                            progress=None, stop_event=None):
+    """Delete the nodes of a label (every node when label is None) with their relationships,
+    committing every batch_size nodes so no transaction has to hold the whole label.
+
+    Each query deletes up to batches_per_query batches with CALL { ... } IN TRANSACTIONS (Neo4j 4.4+);
+    older servers get one LIMIT batch per write transaction. progress(deleted) is called after every
+    query, and setting stop_event stops before the next one. Returns the number of nodes deleted."""
+    match = f"MATCH (n:`{label}`)" if label else "MATCH (n)"
+    in_transactions = (f"{match} WITH n LIMIT $limit "
+                       f"CALL {{ WITH n DETACH DELETE n }} IN TRANSACTIONS OF {int(batch_size)} ROWS "
+                       f"RETURN count(*) AS deleted")
+    single_batch = f"{match} WITH n LIMIT $limit DETACH DELETE n RETURN count(*) AS deleted"
+
+    deleted = 0
+    subquery = True
+    with driver.session() as session:
+        while stop_event is None or not stop_event.is_set():
+            if subquery:
+                try:
+                    # IN TRANSACTIONS only runs in an auto-commit transaction, i.e. session.run
+                    count = session.run(in_transactions, limit=batch_size * batches_per_query).single()['deleted']
+                except neo4j.exceptions.CypherSyntaxError:
+                    subquery = False
+                    continue
+            else:
+                count = session.execute_write(lambda tx: tx.run(single_batch, limit=batch_size).single()['deleted'])
+            if not count:
+                break
+            deleted += count
+            if progress is not None:
+                progress(deleted)
+    return deleted
+
+
+class Neo4jBatchSink:
+    """Bulk writer that creates nodes with UNWIND batches on one or more writer threads.
+    With a key, nodes are merged on it instead, so reloading the same rows does not duplicate them."""
+
+    def __init__(self, driver, label, batch_size=1000, writers=1, log=None, controller=None, key=None):
+        self.driver = driver
+        self.log = log or (lambda message, level="INFO": None)
+        self.controller = controller or AdaptiveBatchController(initial=batch_size, adaptive=False)
+        if key:
+            self.query = f"UNWIND $batch AS row MERGE (n:`{label}` {{`{key}`: row.`{key}`}}) SET n += row"
+        else:
+            self.query = f"UNWIND $batch AS row CREATE (n:`{label}`) SET n += row"
+        self.buffer = []
+        self.migrated = 0
+        self.failed = 0
+        self.lock = threading.Lock()
+
+        # Writers take disjoint batches off a bounded queue, each with its own session
+        self.batches = queue.Queue(maxsize=writers * 2)
+        self.writers = [threading.Thread(target=self.writer, daemon=True) for _ in range(max(1, writers))]
+        for thread in self.writers:
+            thread.start()
+
+    @staticmethod
+    def create_nodes(tx, query, batch):
+        tx.run(query, batch=batch).consume()
+
+    def write_batch(self, session, batch):
+        try:
+            started = time.time()
+            session.execute_write(self.create_nodes, self.query, batch)
+            with self.lock:
+                self.migrated += len(batch)
+            self.controller.record(len(batch), time.time() - started, self.controller.estimate_bytes(batch))
+        except Exception as e:
+            if self.controller.back_off(e):
+                self.log(f"Batch of {len(batch)} rows hit a resource limit, batch size now {self.controller.size}", "WARN")
+            if len(batch) == 1:
+                with self.lock:
+                    self.failed += 1
+                self.log(f"Rejected row {batch[0]}: {str(e)}", "ERROR")
+                return
+            # Split and retry, so one bad row does not fail the whole batch
+            middle = len(batch) // 2
+            self.write_batch(session, batch[:middle])
+            self.write_batch(session, batch[middle:])
+
+    def writer(self):
+        finished = False
+        try:
+            with self.driver.session() as session:
+                while not finished:
+                    batch = self.batches.get()
+                    finished = batch is None
+                    if not finished:
+                        self.write_batch(session, batch)
+                    self.batches.task_done()
+        except Exception as e:
+            self.log(f"Neo4j writer failed: {str(e)}", "ERROR")
+            # Keep draining, so write() and close() never block on a dead writer
+            while not finished:
+                batch = self.batches.get()
+                finished = batch is None
+                if not finished:
+                    with self.lock:
+                        self.failed += len(batch)
+                self.batches.task_done()
+
+    def write(self, rows):
+        self.buffer.extend(rows.to_dicts() if isinstance(rows, ColumnBatch) else rows)
+        while len(self.buffer) >= self.controller.size:
+            batch, self.buffer = self.buffer[:self.controller.size], self.buffer[self.controller.size:]
+            self.batches.put(batch)
+
+    def flush(self):
+        """Hand over the buffered rows and wait until every queued batch is committed."""
+        if self.buffer:
+            batch, self.buffer = self.buffer, []
+            self.batches.put(batch)
+        self.batches.join()
+
+    def close(self):
+        self.flush()
+        for _ in self.writers:
+            self.batches.put(None)
+        for thread in self.writers:
+            thread.join()
@@ -0,0 +1,22 @@
+from ingest import CONVERTERS, convert_column, infer_type
+
+
+def test_leading_zeros_stay_text():
+    assert infer_type(['01234', '02139', '10001']) == "text"
+    assert infer_type(['01.5', '2.5']) == "text"
+
+
+def test_numbers():
+    assert infer_type(['0', '-3', '10001']) == "integer"
+    assert infer_type(['0.5', '1.', '.5', '1e5', '10']) == "float"
+
+
+def test_integers_past_int64_stay_text():
+    assert infer_type(['9223372036854775807', '-9223372036854775808']) == "integer"
+    assert infer_type(['9223372036854775808']) == "text"
+    assert infer_type(['12345678901234567890123']) == "text"
+
+
+def test_values_after_the_sample_that_do_not_fit_stay_text():
+    values = ['1', '99999999999999999999', '01', None]
+    assert convert_column(values, CONVERTERS["integer"]) == [1, '99999999999999999999', '01', None]
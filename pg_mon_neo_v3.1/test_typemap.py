@@ -0,0 +1,29 @@
+from decimal import Decimal
+
+import pytest
+
+from typemap import LogicalType, compile_converter, money_decimal, parse_type
+
+
+@pytest.mark.parametrize("text, amount", [
+    ("$1,234.56", "1234.56"),
+    ("-$1,234.56", "-1234.56"),
+    ("($1,234.56)", "-1234.56"),
+    ("KWD 1,234.567", "1234.567"),
+    ("KWD 0.567", "0.567"),
+    ("1.234,56 €", "1234.56"),
+    ("1 234,56 €", "1234.56"),
+    ("234,5", "234.5"),
+    ("￥1,234", "1234"),
+    ("￥1,234,567", "1234567"),
+    ("$0.00", "0.00"),
+])
+def test_money_decimal(text, amount):
+    assert money_decimal(text) == Decimal(amount)
+
+
+def test_money_converts_for_every_target():
+    assert parse_type("postgresql", "money") == LogicalType("money")
+    assert compile_converter(LogicalType("money"), "postgresql")("$1,234.56") == Decimal("1234.56")
+    assert compile_converter(LogicalType("money"), "mongodb")("$1,234.56").to_decimal() == Decimal("1234.56")
+    assert compile_converter(LogicalType("money"), "neo4j")("$1,234.56") == 1234.56
@@ -0,0 +1,275 @@
+import json
+import re
+from collections import namedtuple
+from datetime import datetime
+from decimal import Decimal
+
+import pytz
+from bson.decimal128 import Decimal128
+from neo4j.spatial import CartesianPoint
+
+
+LogicalType = namedtuple("LogicalType", "name precision scale element", defaults=(None, None, None))
+
+ColumnMapping = namedtuple("ColumnMapping", "source_column target_column source_type logical target_type converter")
+
+
+# Source type names -> logical type names.
+# PostgreSQL names come from format_type(); MongoDB and Neo4j names are the Python/driver
+# class names of sampled values.
+POSTGRESQL_TYPES = {
+    "smallint": "smallint", "int2": "smallint",
+    "integer": "integer", "int": "integer", "int4": "integer", "serial": "integer",
+    "bigint": "bigint", "int8": "bigint", "bigserial": "bigint",
+    "numeric": "decimal", "decimal": "decimal", "money": "money",
+    "real": "float", "float4": "float",
+    "double precision": "double", "float8": "double",
+    "boolean": "boolean", "bool": "boolean",
+    "text": "text", "character varying": "varchar", "varchar": "varchar",
+    "character": "varchar", "char": "varchar", "bpchar": "varchar", "name": "text", "citext": "text",
+    "date": "date",
+    "time without time zone": "time", "time with time zone": "time", "time": "time",
+    "timestamp without time zone": "timestamp", "timestamp": "timestamp",
+    "timestamp with time zone": "timestamptz", "timestamptz": "timestamptz",
+    "interval": "interval",
+    "uuid": "uuid",
+    "json": "json", "jsonb": "json",
+    "bytea": "bytes",
+    "point": "point",
+}
+
+VALUE_TYPES = {
+    "int": "bigint", "Int64": "bigint",
+    "float": "double",
+    "Decimal": "decimal", "Decimal128": "decimal",
+    "bool": "boolean",
+    "str": "text",
+    "date": "date", "Date": "date",
+    "time": "time", "Time": "time",
+    "datetime": "timestamp", "DateTime": "timestamptz",
+    "timedelta": "interval", "Duration": "interval",
+    "UUID": "uuid", "ObjectId": "objectid",
+    "dict": "json", "SON": "json",
+    "bytes": "bytes", "bytearray": "bytes", "Binary": "bytes",
+    "Point": "point", "CartesianPoint": "point", "WGS84Point": "point",
+}
+
+# Logical type -> native type name per target. Parameterised types are filled in by target_type().
+TARGET_TYPES = {
+    "postgresql": {
+        "smallint": "SMALLINT", "integer": "INTEGER", "bigint": "BIGINT",
+        "decimal": "NUMERIC", "money": "NUMERIC", "float": "REAL", "double": "DOUBLE PRECISION",
+        "boolean": "BOOLEAN", "text": "TEXT", "varchar": "VARCHAR",
+        "date": "DATE", "time": "TIME", "timestamp": "TIMESTAMP", "timestamptz": "TIMESTAMPTZ",
+        "interval": "INTERVAL", "uuid": "UUID", "json": "JSONB", "bytes": "BYTEA",
+        "point": "POINT", "objectid": "TEXT", "unknown": "TEXT",
+    },
+    "mongodb": {
+        "smallint": "int", "integer": "int", "bigint": "long",
+        "decimal": "decimal", "money": "decimal", "float": "double", "double": "double",
+        "boolean": "bool", "text": "string", "varchar": "string",
+        "date": "date", "time": "string", "timestamp": "date", "timestamptz": "date",
+        "interval": "string", "uuid": "string", "json": "object", "bytes": "binData",
+        "point": "object (GeoJSON Point)", "objectid": "objectId", "unknown": "mixed",
+    },
+    "neo4j": {
+        "smallint": "INTEGER", "integer": "INTEGER", "bigint": "INTEGER",
+        "decimal": "FLOAT", "money": "FLOAT", "float": "FLOAT", "double": "FLOAT",
+        "boolean": "BOOLEAN", "text": "STRING", "varchar": "STRING",
+        "date": "DATE", "time": "LOCAL TIME", "timestamp": "LOCAL DATETIME", "timestamptz": "ZONED DATETIME",
+        "interval": "DURATION", "uuid": "STRING", "json": "STRING", "bytes": "BYTE[]",
+        "point": "POINT", "objectid": "STRING", "unknown": "STRING",
+    },
+}
+
+PG_TYPE_PATTERN = re.compile(r"^(?P<base>[a-z ]+?)\s*(\((?P<args>[\d,\s]+)\))?(?P<rest>[a-z ]*)$")
+
+
+def parse_type(source_db, data_type):
+    """Turn a source column type name into a LogicalType."""
+    data_type = (data_type or "").strip()
+    if source_db.lower() == "postgresql":
+        lowered = data_type.lower()
+        if lowered.endswith("[]"):
+            return LogicalType("array", element=parse_type(source_db, lowered[:-2]))
+        if lowered == "array":
+            return LogicalType("array", element=LogicalType("unknown"))
+        match = PG_TYPE_PATTERN.match(lowered)
+        if not match:
+            return LogicalType("unknown")
+        base = (match.group("base") + match.group("rest")).strip()
+        args = [int(arg) for arg in (match.group("args") or "").split(",") if arg.strip()]
+        name = POSTGRESQL_TYPES.get(base, "unknown")
+        if name == "decimal" and args:
+            return LogicalType("decimal", args[0], args[1] if len(args) > 1 else 0)
+        if name == "varchar" and args:
+            return LogicalType("varchar", args[0])
+        return LogicalType(name)
+
+    # MongoDB / Neo4j schemas carry sampled value types, e.g. "int" or "list[str]"
+    if data_type.startswith("list"):
+        element = data_type[5:-1] if data_type.startswith("list[") else ""
+        return LogicalType("array", element=parse_type(source_db, element) if element else LogicalType("unknown"))
+    return LogicalType(VALUE_TYPES.get(data_type, "unknown"))
+
+
+def target_type(logical, target_db):
+    target_db = target_db.lower()
+    names = TARGET_TYPES[target_db]
+    if logical.name == "array":
+        element = target_type(logical.element or LogicalType("unknown"), target_db)
+        if target_db == "postgresql":
+            return "JSONB" if logical.element is None or logical.element.name in ("unknown", "json") else f"{element}[]"
+        if target_db == "neo4j":
+            return f"LIST<{element}>"
+        return "array"
+    if target_db == "postgresql":
+        if logical.name == "decimal" and logical.precision:
+            return f"NUMERIC({logical.precision},{logical.scale or 0})"
+        if logical.name == "varchar" and logical.precision:
+            return f"VARCHAR({logical.precision})"
+    if target_db == "neo4j" and logical.name == "decimal" and logical.precision and not logical.scale:
+        return "INTEGER"
+    return names.get(logical.name, names["unknown"])
+
+
+def is_postgresql_type(type_name):
+    """True for type names produced by target_type(..., "postgresql")."""
+    base = re.sub(r"\(.*\)", "", type_name or "").replace("[]", "").strip()
+    return base in TARGET_TYPES["postgresql"].values()
+
+
+# Value converters. Each one handles a single non-None value; compile_converter() picks one per column.
+
+def native(value):
+    return value.to_native() if hasattr(value, "to_native") else value
+
+
+def aware_datetime(value):
+    value = native(value)
+    if isinstance(value, datetime) and value.tzinfo is None:
+        value = value.replace(tzinfo=pytz.UTC)
+    return value
+
+
+def plain_decimal(value):
+    return value.to_decimal() if isinstance(value, Decimal128) else value
+
+
+def money_decimal(value):
+    # psycopg2 returns money as lc_monetary text: "$1,234.56", "-$1,234.56", "($1,234.56)", "1.234,56 €"
+    if not isinstance(value, str):
+        return plain_decimal(value)
+    number = re.sub(r"[^\d.,]", "", value)
+    cut = max(number.rfind("."), number.rfind(","))
+    separator = number[cut] if cut >= 0 else None
+    if separator and ("." in number) == ("," in number):
+        decimal = True  # Both separators: the last one is the decimal point ("KWD 1,234.567", "1.234,56 €")
+    elif separator and number.count(separator) == 1:
+        # A lone "." is a decimal point; a lone "," is one unless it separates a group of three ("￥1,234")
+        decimal = separator == "." or len(number) - cut - 1 != 3
+    else:
+        decimal = False  # No separator, or one repeated, which can only group digits
+    if decimal:
+        whole, fraction = number[:cut], number[cut + 1:]
+    else:
+        whole, fraction = number, ""
+    whole = re.sub(r"[^0-9]", "", whole) or "0"
+    amount = Decimal(f"{whole}.{fraction}" if fraction else whole)
+    return -amount if "-" in value or "(" in value else amount
+
+
+def point_coordinates(value):
+    if isinstance(value, str):  # PostgreSQL point text: "(x,y)"
+        return tuple(float(part) for part in value.strip("()").split(","))
+    if isinstance(value, dict):  # GeoJSON
+        return tuple(value["coordinates"])
+    return (value.x, value.y)
+
+
+def to_json_text(value):
+    return value if isinstance(value, str) else json.dumps(value, default=str)
+
+
+def duration_text(value):
+    # Neo4j Duration -> ISO 8601 (P1DT2H); timedelta -> "<seconds> seconds"; both are valid interval input
+    if hasattr(value, "iso_format"):
+        return value.iso_format()
+    if hasattr(value, "total_seconds"):
+        return f"{value.total_seconds()} seconds"
+    return str(value)
+
+
+CONVERTERS = {
+    "postgresql": {
+        "date": native,
+        "time": native,
+        "timestamp": native,
+        "timestamptz": aware_datetime,
+        "interval": duration_text,
+        "decimal": plain_decimal,
+        "money": money_decimal,
+        "uuid": str,
+        "objectid": str,
+        "json": to_json_text,
+        "point": lambda value: "({},{})".format(*point_coordinates(value)),
+    },
+    "mongodb": {
+        "decimal": lambda value: value if isinstance(value, Decimal128) else Decimal128(Decimal(str(value))),
+        "money": lambda value: Decimal128(money_decimal(value)),
+        "date": lambda value: datetime.combine(native(value), datetime.min.time()),
+        "time": lambda value: native(value).isoformat(),
+        "timestamp": native,
+        "timestamptz": aware_datetime,
+        "interval": duration_text,
+        "uuid": str,
+        "point": lambda value: {"type": "Point", "coordinates": list(point_coordinates(value))},
+        "bytes": bytes,  # psycopg2 returns bytea as memoryview
+    },
+    "neo4j": {
+        "decimal": lambda value: float(plain_decimal(value)),
+        "money": lambda value: float(money_decimal(value)),
+        "uuid": str,
+        "objectid": str,
+        "json": to_json_text,
+        "point": lambda value: value if hasattr(value, "srid") else CartesianPoint(point_coordinates(value)),
+        "bytes": bytes,
+    },
+}
+
+
+def compile_converter(logical, target_db):
+    """Return the per-value converter for a column, or None when values pass through unchanged."""
+    target_db = target_db.lower()
+    if logical.name == "array":
+        element = compile_converter(logical.element or LogicalType("unknown"), target_db)
+        if target_db == "postgresql" and (logical.element is None or logical.element.name in ("unknown", "json")):
+            return to_json_text
+        if element is None:
+            return None
+        return lambda values: [element(value) if value is not None else None for value in values]
+    if target_db == "neo4j" and logical.name == "decimal" and logical.precision and not logical.scale:
+        return lambda value: int(plain_decimal(value))
+    return CONVERTERS[target_db].get(logical.name)
+
+
+def map_columns(source_db, target_db, schema, target_names=None):
+    """Plan a migration column by column: [(source, target, source type, logical type, target type, converter)]."""
+    mappings = []
+    for i, (column, data_type) in enumerate(schema):
+        logical = parse_type(source_db, data_type)
+        mappings.append(ColumnMapping(
+            column,
+            target_names[i] if target_names else column,
+            data_type,
+            logical,
+            target_type(logical, target_db),
+            compile_converter(logical, target_db),
+        ))
+    return mappings
+
+
+def describe(mapping):
+    conversion = getattr(mapping.converter, "__name__", "convert")
+    conversion = "as is" if mapping.converter is None else ("convert" if conversion == "<lambda>" else conversion)
+    return f"{mapping.source_type} -> {mapping.target_type} ({conversion})"
@@ -7,6 +7,8 @@ import urllib.parse
 import logging
 from datetime import datetime, timedelta
 import time
+import threading
+import queue
 
 # Third-party library imports
 import psycopg2
@@ -16,6 +18,12 @@ import pymongo
 import pandas as pd
 import networkx as nx
 
+from checkpoint import CheckpointStore
+from columnar import ColumnBatch
+from export import ExportCancelled, ExportProgress, copy_postgresql_csv, stream_mongodb_csv, stream_neo4j_csv
+from readers import ExportedSnapshot
+from sinks import DELETE_BATCH_SIZE, delete_nodes_in_batches, AdaptiveBatchController, PostgreSQLCopySink, MongoDBBulkSink, Neo4jBatchSink
+
 # PyQt6 imports
 from PyQt6.QtWidgets import (
     QApplication, QMainWindow, QComboBox, QTableWidget, 
@@ -30,7 +38,7 @@ from PyQt6.QtGui import (
     QAction, QColor, QBrush, QFont, QTextCharFormat, QSyntaxHighlighter
 )
 from PyQt6.QtCore import (
-    Qt, QRegularExpression, QRect, QSize, QThread, pyqtSignal
+    Qt, QRegularExpression, QRect, QSize, QThread, QObject, pyqtSignal
 )
 
 from PyQt6.QtGui import QColor, QTextCharFormat, QFont, QSyntaxHighlighter
@@ -151,9 +159,12 @@ class CypherHighlighter(QSyntaxHighlighter):
 class MigrationWorker(QThread):
     progress = pyqtSignal(int, int)
     log = pyqtSignal(str, str, str)  # category, message, level
+    stats = pyqtSignal(dict)  # stage name -> {'rows', 'rate', 'queue'}
     finished = pyqtSignal()
 
-    def __init__(self, parent, source_db, target_db, source_table, target_table, source_columns, target_columns):
+    STAGES = ("read", "convert", "write")
+
+    def __init__(self, parent, source_db, target_db, source_table, target_table, source_columns, target_columns, options=None):
         super().__init__(parent)
         self.parent = parent
         self.source_db = source_db
@@ -162,45 +173,650 @@ class MigrationWorker(QThread):
         self.target_table = target_table
         self.source_columns = source_columns
         self.target_columns = target_columns
+        self.options = options or {}
         self.total_rows = 0
         self.migrated_rows = 0
         self.error_message = ""
+        self.pg_conn = None
+        self.batch_controller = None
+        self.snapshot = None
+        self.type_plan = None
+
+        # Checkpointing: keyset column of the source, and where a resumed run starts from
+        self.checkpoints = CheckpointStore()
+        self.checkpoint_key = CheckpointStore.key(source_db, source_table, target_db, target_table)
+        self.key_column = None
+        self.resume_from = None
+        self.resumed_rows = 0
+        self.resumed_migrated = 0
+
+        self.stop_event = threading.Event()
+        self.stage_errors = []
+        self.stage_rows = {stage: 0 for stage in self.STAGES}
+        self.queues = {}
+
+    def prepare_checkpoint(self):
+        if not self.options.get('checkpoint'):
+            return
+        self.key_column = self.parent.get_keyset_column(self.source_db, self.source_table, self.pg_conn)
+        if self.key_column is None:
+            self.log.emit("Migration", f"{self.source_table} has no single-column primary key, checkpoints disabled", "WARN")
+            return
+
+        checkpoint = self.checkpoints.load(self.checkpoint_key) if self.options.get('resume') else None
+        if checkpoint is None:
+            self.checkpoints.clear(self.checkpoint_key)
+            return
+        self.resume_from = checkpoint['watermark']
+        self.resumed_rows = checkpoint['rows']
+        self.migrated_rows = self.resumed_migrated = checkpoint['migrated']
+        self.log.emit("Migration", f"Resuming {self.source_table} after {self.key_column} = {self.resume_from} "
+                                   f"({self.resumed_rows} rows already done, checkpoint {checkpoint['updated']})", "INFO")
+
+    @staticmethod
+    def row_key(row):
+        # Keyset readers append the key as the last field (PostgreSQL) or return it as _id (MongoDB, Neo4j)
+        return row['_id'] if isinstance(row, dict) else row[-1]
+
+    def save_checkpoint(self, sink, watermark, written):
+        if sink is not None:
+            sink.flush()
+            self.migrated_rows = sink.migrated + self.resumed_migrated
+        self.checkpoints.save(self.checkpoint_key, self.key_column, watermark, written, self.migrated_rows)
+
+    def snapshot_id(self):
+        if self.source_db.lower() != "postgresql" or not self.options.get('consistent_snapshot'):
+            return None
+        if self.options.get('snapshot_id'):
+            return self.options['snapshot_id']  # Shared by every table of a Migrate All run
+        if self.options.get('read_partitions', 1) > 1 and self.snapshot is None:
+            # A single table read in partitions still needs its readers to agree on one snapshot
+            self.snapshot = ExportedSnapshot(self.parent.open_postgresql_connection())
+        return self.snapshot.snapshot_id if self.snapshot is not None else None
+
+    def fetch_chunks(self):
+        chunk_size = self.options.get('chunk_size', 1000)
+        if self.key_column is not None:
+            # Keyset reads always stream, ordered by the key so a checkpoint marks a clean cut
+            if self.options.get('read_partitions', 1) > 1:
+                self.log.emit("Migration", "Checkpointed reads follow key order, reading with a single stream", "WARN")
+            if not self.total_rows:
+                self.total_rows = self.parent.estimate_row_count(self.source_db, self.source_table, self.pg_conn)[0]
+            return self.parent.iter_data(self.source_db, self.source_table, self.source_columns,
+                                         chunk_size, self.options.get('itersize', 10000),
+                                         self.key_column, self.resume_from, self.snapshot_id())
+
+        if self.options.get('read_partitions', 1) > 1:
+            # Several connections read disjoint key/page ranges at once; chunk order does not matter here
+            if not self.total_rows:
+                self.total_rows = self.parent.estimate_row_count(self.source_db, self.source_table, self.pg_conn)[0]
+            return self.parent.iter_partitioned_data(self.source_db, self.source_table, self.source_columns,
+                                                     chunk_size, self.options.get('itersize', 10000),
+                                                     self.options['read_partitions'], self.pg_conn, self.snapshot_id())
+
+        if self.options.get('stream_reads'):
+            # Rows are pulled from the source chunk by chunk; the total is only used for progress
+            if not self.total_rows:
+                self.total_rows = self.parent.estimate_row_count(self.source_db, self.source_table, self.pg_conn)[0]
+            return self.parent.iter_data(self.source_db, self.source_table, self.source_columns,
+                                         chunk_size, self.options.get('itersize', 10000), snapshot=self.snapshot_id())
+
+        source_data = self.parent.get_data(self.source_db, self.source_table, self.source_columns, self.pg_conn)
+        self.total_rows = len(source_data)
+        return (source_data[i:i + chunk_size] for i in range(0, len(source_data), chunk_size))
+
+    def stop(self):
+        self.stop_event.set()
+
+    def put(self, stage_queue, item):
+        # Blocks while the next stage is behind (backpressure), but gives up once the pipeline is stopping
+        while not self.stop_event.is_set():
+            try:
+                stage_queue.put(item, timeout=0.5)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def get(self, stage_queue):
+        while not self.stop_event.is_set():
+            try:
+                return stage_queue.get(timeout=0.5)
+            except queue.Empty:
+                continue
+        return None
+
+    def read_stage(self, chunks, out_queue):
+        try:
+            for chunk in chunks:
+                watermark = self.row_key(chunk[-1]) if self.key_column is not None else None
+                if not self.put(out_queue, (chunk, watermark)):
+                    break
+                self.stage_rows["read"] += len(chunk)
+        except Exception as e:
+            self.stage_errors.append(f"read: {str(e)}")
+            self.stop_event.set()
+        finally:
+            if hasattr(chunks, 'close'):
+                chunks.close()  # Release the source cursor/connection if we stopped early
+            self.put(out_queue, None)
+
+    def convert_stage(self, in_queue, out_queue):
+        convert = self.parent.get_value_converter(self.target_db)
+        try:
+            while True:
+                item = self.get(in_queue)
+                if item is None:
+                    break
+                chunk, watermark = item
+                # Column-oriented from here on: each column is converted in one pass, with no per-row dicts
+                converted = ColumnBatch.from_rows(chunk, self.source_columns, self.target_columns).convert(self.target_db, convert, self.type_plan)
+                if not self.put(out_queue, (converted, watermark)):
+                    break
+                self.stage_rows["convert"] += len(converted)
+        except Exception as e:
+            self.stage_errors.append(f"convert: {str(e)}")
+            self.stop_event.set()
+        finally:
+            self.put(out_queue, None)
+
+    def create_sink(self):
+        # Bulk sinks replace the per-row insert_row path when enabled on the Migrate tab
+        if not self.options.get('bulk_writes'):
+            return None
+        if self.target_db.lower() == "postgresql":
+            self.batch_controller = AdaptiveBatchController.from_options(self.options, self.options.get('chunk_size', 1000))
+            commit_rows = self.options.get('commit_rows', 50000)
+            commit_bytes = self.options.get('commit_mb', 64) * 1024 * 1024
+            if self.key_column is not None:
+                # Commit only at checkpoints, so the state file and the target never drift apart
+                commit_rows = commit_bytes = float('inf')
+            return PostgreSQLCopySink(
+                self.pg_conn, self.target_table, self.target_columns,
+                copy_format=self.options.get('copy_format', 'text'),
+                commit_rows=commit_rows,
+                commit_bytes=commit_bytes,
+                log=lambda message, level="INFO": self.log.emit("PostgreSQL", message, level),
+                controller=self.batch_controller)
+        if self.target_db.lower() == "mongodb":
+            self.batch_controller = AdaptiveBatchController.from_options(self.options, self.options.get('mongo_batch_size', 1000))
+            return MongoDBBulkSink(
+                self.parent.mongo_db[self.target_table],
+                log=lambda message, level="INFO": self.log.emit("MongoDB", message, level),
+                controller=self.batch_controller)
+        if self.target_db.lower() == "neo4j":
+            self.batch_controller = AdaptiveBatchController.from_options(self.options, self.options.get('neo4j_batch_size', 1000))
+            return Neo4jBatchSink(
+                self.parent.neo4j_driver, self.target_table,
+                writers=self.options.get('neo4j_writers', 1),
+                log=lambda message, level="INFO": self.log.emit("Neo4j", message, level),
+                controller=self.batch_controller)
+        return None
+
+    def write_chunk(self, sink, chunk, written):
+        if sink is not None:
+            sink.write(chunk)
+            self.migrated_rows = sink.migrated + self.resumed_migrated
+            return written + len(chunk)
+
+        for target_row in chunk.to_dicts():
+            try:
+                self.parent.insert_row(self.target_db, self.target_table, self.target_columns, target_row, self.pg_conn)
+                self.migrated_rows += 1
+            except Exception as e:
+                self.log.emit("Migration", f"Error migrating row {written+1}: {str(e)}", "ERROR")
+
+            written += 1
+            self.stage_rows["write"] = written
+            self.total_rows = max(self.total_rows, written)
+            self.progress.emit(written, self.total_rows)
+            if written % 100 == 0:
+                self.log.emit("Migration", f"Migrated {written}/{self.total_rows} rows", "INFO")
+        return written
+
+    def emit_stats(self, started):
+        elapsed = max(time.time() - started, 1e-6)
+        self.stats.emit({
+            stage: {
+                'rows': self.stage_rows[stage],
+                'rate': self.stage_rows[stage] / elapsed,
+                'queue': self.queues[stage].qsize() if stage in self.queues else 0,  # chunks waiting for the next stage
+            }
+            for stage in self.STAGES
+        })
 
     def run(self):
         try:
+            if "postgresql" in (self.source_db.lower(), self.target_db.lower()):
+                # Own connection, so several workers can run side by side without sharing a cursor
+                self.pg_conn = self.parent.open_postgresql_connection()
+
+            self.prepare_checkpoint()
+
             self.log.emit("Migration", f"Fetching data from {self.source_db}.{self.source_table}", "INFO")
-            source_data = self.parent.get_data(self.source_db, self.source_table, self.source_columns)
-            self.total_rows = len(source_data)
+            chunks = self.fetch_chunks()
             
             self.log.emit("Migration", f"Starting migration of {self.total_rows} rows from {self.source_db} to {self.target_db}", "INFO")
 
-            self.log.emit("Migration", f"Creating target {self.target_db}.{self.target_table}", "INFO")
-            self.parent.create_target_table(self.target_db, self.target_table, self.target_columns)
+            self.type_plan = self.parent.get_type_plan(self.source_db, self.target_db, self.source_table,
+                                                       self.source_columns, self.target_columns, self.pg_conn)
+            if self.resume_from is None:
+                self.log.emit("Migration", f"Creating target {self.target_db}.{self.target_table}", "INFO")
+                typed_columns = [(mapping.target_column, mapping.target_type) for mapping in self.type_plan]
+                self.parent.create_target_table(self.target_db, self.target_table, typed_columns, self.pg_conn)
+
+            sink = self.create_sink()
+
+            # read -> convert -> write, each stage on its own thread and joined by bounded queues,
+            # so source reads and target writes overlap while at most queue_size chunks per stage are in memory
+            queue_size = self.options.get('queue_size', 4)
+            self.queues = {"read": queue.Queue(maxsize=queue_size), "convert": queue.Queue(maxsize=queue_size)}
+            stage_threads = [
+                threading.Thread(target=self.read_stage, args=(chunks, self.queues["read"]), daemon=True),
+                threading.Thread(target=self.convert_stage, args=(self.queues["read"], self.queues["convert"]), daemon=True),
+            ]
+            for thread in stage_threads:
+                thread.start()
+
+            started = last_stats = time.time()
+            i = self.resumed_rows
+            since_checkpoint = 0
+            written_watermark = None
+            # Only the COPY sink holds its commits for a checkpoint; the other targets commit every batch
+            # (or row) they write, so the watermark follows each chunk or a resume would write it twice
+            commits_as_it_goes = not isinstance(sink, PostgreSQLCopySink)
+            try:
+                while True:
+                    item = self.get(self.queues["convert"])
+                    if item is None:
+                        break
+                    chunk, watermark = item
+                    i = self.write_chunk(sink, chunk, i)
+                    written_watermark = watermark
+
+                    since_checkpoint += len(chunk)
+                    if self.key_column is not None and (commits_as_it_goes or
+                                                        since_checkpoint >= self.options.get('checkpoint_rows', 50000)):
+                        self.save_checkpoint(sink, watermark, i)
+                        since_checkpoint = 0
+                    if sink is not None:
+                        self.stage_rows["write"] = i
+                        self.total_rows = max(self.total_rows, i)
+                        self.progress.emit(i, self.total_rows)
+                        self.log.emit("Migration", f"Migrated {i}/{self.total_rows} rows", "INFO")
+
+                    if time.time() - last_stats >= 0.5:
+                        self.emit_stats(started)
+                        last_stats = time.time()
+            finally:
+                self.stop_event.set()
+                for thread in stage_threads:
+                    thread.join()
+                if sink is not None:
+                    sink.close()
+                    self.migrated_rows = sink.migrated + self.resumed_migrated
+                if self.key_column is not None and since_checkpoint and written_watermark is not None:
+                    # Everything up to the last written chunk is committed now; record it before any error surfaces
+                    self.checkpoints.save(self.checkpoint_key, self.key_column, written_watermark, i, self.migrated_rows)
+                self.emit_stats(started)
+
+            if self.stage_errors:
+                raise RuntimeError("; ".join(self.stage_errors))
+
+            if self.key_column is not None:
+                self.checkpoints.clear(self.checkpoint_key)  # Finished, nothing left to resume
+
+            self.total_rows = i
+            self.log.emit("Migration", f"Migrated {self.migrated_rows}/{self.total_rows} rows", "INFO")
+            if self.batch_controller is not None:
+                self.log.emit("Migration", f"Batch sizes: {self.batch_controller.summary()}", "INFO")
+            self.log.emit("Migration", f"Migration from {self.source_db} to {self.target_db} completed successfully", "INFO")
+        except Exception as e:
+            self.error_message = str(e)
+            self.log.emit("Migration", f"Error during migration: {self.error_message}", "ERROR")
+        finally:
+            if self.pg_conn:
+                self.pg_conn.close()
+                self.pg_conn = None
+            if self.snapshot is not None:
+                self.snapshot.close()
+                self.snapshot = None
+            self.finished.emit()
+
+
+class MigrationScheduler(QObject):
+    item_updated = pyqtSignal(str, dict)  # item name, report item
+    progress = pyqtSignal(int, int)
+    finished = pyqtSignal()
+    log = pyqtSignal(str, str, str)  # category, message, level
+
+    def __init__(self, parent, items, create_worker, max_parallel=4):
+        super().__init__(parent)
+        # Largest items first, so a big table does not start last and leave the other slots idle
+        self.pending = sorted(items, key=lambda item: item['records'], reverse=True)
+        self.create_worker = create_worker
+        self.max_parallel = max(1, max_parallel)
+        self.running = {}
+        self.total_rows = sum(item['records'] for item in items)
+        self.done_rows = 0
+        self.last_progress = 0
+
+    def start(self):
+        for item in self.pending:
+            self.item_updated.emit(item['name'], self.report_item(item, "Pending"))
+        self.fill()
+
+    def report_item(self, item, result, migrated=0, failed=0, elapsed=0, error="", batch_sizes=""):
+        return {
+            'name': item['name'],
+            'records': item['records'],
+            'estimated': item.get('estimated', False),
+            'result': result,
+            'migrated': migrated,
+            'failed': failed,
+            'time': elapsed,
+            'error': error,
+            'batch_sizes': batch_sizes,
+        }
+
+    def fill(self):
+        while self.pending and len(self.running) < self.max_parallel:
+            item = self.pending.pop(0)
+            try:
+                worker = self.create_worker(item['name'])
+            except Exception as e:
+                self.log.emit("Migration", f"Error preparing migration of {item['name']}: {str(e)}", "ERROR")
+                self.item_updated.emit(item['name'], self.report_item(item, "Fail", failed=item['records'], error=str(e)))
+                continue
+
+            worker.total_rows = item['records']
+            # Bound slots, so the worker's signals are queued onto the scheduler's (GUI) thread
+            worker.progress.connect(self.on_progress)
+            worker.finished.connect(self.on_finished)
+            self.running[worker] = [item, time.time(), 0]
+            self.item_updated.emit(item['name'], self.report_item(item, "Running"))
+            self.log.emit("Migration", f"Started migration of {item['name']} ({len(self.running)} running, {len(self.pending)} pending)", "INFO")
+            worker.start()
+
+        if not self.running and not self.pending:
+            self.progress.emit(self.total_rows, self.total_rows)
+            self.finished.emit()
+
+    def refine_count(self, name, count):
+        # Exact count from the background RowCountWorker replaces the estimate of a job not started yet
+        for item in self.pending:
+            if item['name'] == name:
+                self.total_rows += count - item['records']
+                item['records'] = count
+                item['estimated'] = False
+                self.item_updated.emit(name, self.report_item(item, "Pending"))
+                self.pending.sort(key=lambda item: item['records'], reverse=True)
+                return
+
+    def on_progress(self, current, total):
+        worker = self.sender()
+        if worker not in self.running:
+            return
+        item, started, _ = self.running[worker]
+        self.running[worker][2] = current
+
+        if time.time() - self.last_progress >= 0.5:
+            self.last_progress = time.time()
+            done = self.done_rows + sum(entry[2] for entry in self.running.values())
+            self.progress.emit(done, max(self.total_rows, done))
+            self.item_updated.emit(item['name'], self.report_item(item, f"Running ({current}/{total})", worker.migrated_rows, elapsed=time.time() - started))
+
+    def on_finished(self):
+        worker = self.sender()
+        item, started, _ = self.running.pop(worker)
+        name = item['name']
+        worker.wait()
+        elapsed = time.time() - started
+        failed = worker.total_rows - worker.migrated_rows
+
+        if failed == 0 and not worker.error_message:
+            result = "OK"
+        elif worker.migrated_rows == 0:
+            result = "Fail"
+        else:
+            result = f"Partially migrated ({worker.migrated_rows}/{worker.total_rows})"
+
+        self.done_rows += worker.total_rows
+        if not worker.error_message:
+            # Rows actually read replace the estimate
+            item['records'] = worker.total_rows
+            item['estimated'] = False
+        batch_sizes = worker.batch_controller.summary() if worker.batch_controller is not None else ""
+        self.item_updated.emit(name, self.report_item(item, result, worker.migrated_rows, failed, elapsed, worker.error_message, batch_sizes))
+        self.log.emit("Migration", f"Migration of {name} finished: {result}", "INFO")
+        self.fill()
+
+
+class RowCountWorker(QThread):
+    """Exact row counts computed off the GUI thread, to refine the estimates shown first."""
+    counted = pyqtSignal(str, int)  # item name, exact row count
+    log = pyqtSignal(str, str, str)  # category, message, level
+
+    def __init__(self, parent, db_name, items):
+        super().__init__(parent)
+        self.parent = parent
+        self.db_name = db_name
+        self.items = list(items)
 
-            for i, row in enumerate(source_data):
+    def run(self):
+        pg_conn = None
+        try:
+            if self.db_name.lower() == "postgresql":
+                pg_conn = self.parent.open_postgresql_connection()
+                pg_conn.autocommit = True
+            for item in self.items:
+                if self.isInterruptionRequested():
+                    break
                 try:
-                    if isinstance(row, dict):
-                        target_row = {target_col: row.get(source_col) for source_col, target_col in zip(self.source_columns, self.target_columns)}
-                    else:
-                        target_row = dict(zip(self.target_columns, row))
-                    
-                    self.parent.insert_row(self.target_db, self.target_table, self.target_columns, target_row)
-                    self.migrated_rows += 1
+                    self.counted.emit(item, self.parent.get_row_count(self.db_name, item, pg_conn))
                 except Exception as e:
-                    self.log.emit("Migration", f"Error migrating row {i+1}: {str(e)}", "ERROR")
+                    self.log.emit("Row count", f"Error counting rows in {item}: {str(e)}", "WARN")
+        except Exception as e:
+            self.log.emit("Row count", f"Error counting rows: {str(e)}", "ERROR")
+        finally:
+            if pg_conn:
+                pg_conn.close()
 
-                self.progress.emit(i + 1, self.total_rows)
-                if (i + 1) % 100 == 0 or i + 1 == self.total_rows:
-                    self.log.emit("Migration", f"Migrated {i + 1}/{self.total_rows} rows", "INFO")
 
-            self.log.emit("Migration", f"Migration from {self.source_db} to {self.target_db} completed successfully", "INFO")
+class ExportWorker(QThread):
+    progress = pyqtSignal(int, int)  # rows, bytes
+    finished = pyqtSignal()
+
+    def __init__(self, parent, db_type, item, file_name):
+        super().__init__(parent)
+        self.parent = parent
+        self.db_type = db_type
+        self.item = item
+        self.file_name = file_name
+        self.rows = 0
+        self.bytes = 0
+        self.cancelled = False
+        self.error_message = ""
+        self.stop_event = threading.Event()
+
+    def stop(self):
+        self.stop_event.set()
+
+    def run(self):
+        progress = ExportProgress(self.stop_event, self.progress.emit)
+        pg_conn = None
+        try:
+            if self.db_type == "PostgreSQL":
+                # Own connection, so several COPY exports run side by side
+                pg_conn = self.parent.open_postgresql_connection()
+                copy_postgresql_csv(pg_conn, self.item, self.file_name, progress=progress)
+            elif self.db_type == "MongoDB":
+                stream_mongodb_csv(self.parent.mongo_db[self.item], self.file_name, progress=progress)
+            else:  # Neo4j: a session per worker, on the shared driver's connection pool
+                stream_neo4j_csv(self.parent.neo4j_driver, self.item, self.file_name, progress=progress)
+        except ExportCancelled:
+            self.cancelled = True
         except Exception as e:
             self.error_message = str(e)
-            self.log.emit("Migration", f"Error during migration: {self.error_message}", "ERROR")
         finally:
+            if pg_conn:
+                pg_conn.close()
+            if self.cancelled and os.path.exists(self.file_name):
+                os.remove(self.file_name)  # Do not leave a truncated file behind
+            self.rows, self.bytes = progress.rows, progress.bytes
             self.finished.emit()
 
 
+class DbTask(QThread):
+    """One database call run off the GUI thread; the result comes back through done/failed.
+    cancel() requests interruption (checked by long loops), runs the optional cancel hook, such as
+    psycopg2's connection.cancel() which aborts the running statement, and marks the result as unwanted."""
+    done = pyqtSignal(object)
+    failed = pyqtSignal(str)
+
+    def __init__(self, parent, fn, description, cancel_hook=None):
+        super().__init__(parent)
+        self.fn = fn
+        self.description = description
+        self.cancel_hook = cancel_hook
+        self.cancelled = False
+
+    def cancel(self, abort=True):
+        if self.cancelled:
+            return
+        self.cancelled = True
+        self.requestInterruption()
+        if abort and self.cancel_hook is not None:
+            try:
+                self.cancel_hook()
+            except Exception:
+                pass  # Nothing left to cancel
+
+    def run(self):
+        try:
+            result = self.fn()
+        except Exception as e:
+            self.failed.emit(str(e))
+            return
+        self.done.emit(result)
+
+
+class InterruptionEvent:
+    """threading.Event-like view of a QThread's interruption request, for helpers that take a stop_event."""
+
+    def __init__(self, thread=None):
+        self.thread = thread or QThread.currentThread()
+
+    def is_set(self):
+        return self.thread.isInterruptionRequested()
+
+
+class Neo4jDeleteWorker(QThread):
+    """Deletes a Neo4j label in committed batches off the GUI thread; stop() ends it after the current batch."""
+    progress = pyqtSignal(int)  # nodes deleted so far
+    finished = pyqtSignal()
+
+    def __init__(self, parent, driver, label, batch_size=DELETE_BATCH_SIZE):
+        super().__init__(parent)
+        self.driver = driver
+        self.label = label
+        self.batch_size = batch_size
+        self.deleted = 0
+        self.error_message = ""
+        self.stop_event = threading.Event()
+
+    @property
+    def cancelled(self):
+        return self.stop_event.is_set()
+
+    def stop(self):
+        self.stop_event.set()
+
+    def run(self):
+        def on_progress(deleted):
+            self.deleted = deleted
+            self.progress.emit(deleted)
+
+        try:
+            delete_nodes_in_batches(self.driver, self.label, self.batch_size,
+                                    progress=on_progress, stop_event=self.stop_event)
+        except Exception as e:
+            self.error_message = str(e)
+        finally:
+            self.finished.emit()
+
+
+class ExportScheduler(QObject):
+    progress = pyqtSignal(int, int, int)  # items done, rows, bytes
+    finished = pyqtSignal()
+    log = pyqtSignal(str, str, str)  # category, message, level
+
+    def __init__(self, parent, db_type, items, directory, extension, max_parallel=4):
+        super().__init__(parent)
+        self.viewer = parent
+        self.db_type = db_type
+        self.pending = list(items)
+        self.directory = directory
+        self.extension = extension
+        self.max_parallel = max(1, max_parallel)
+        self.running = {}  # worker -> [rows, bytes]
+        self.done_items = 0
+        self.done_rows = 0
+        self.done_bytes = 0
+        self.failed = 0
+        self.cancelled = False
+
+    def start(self):
+        self.fill()
+
+    def cancel(self):
+        # Cooperative: running exports stop at their next write, pending ones never start
+        self.cancelled = True
+        self.pending.clear()
+        for worker in self.running:
+            worker.stop()
+
+    def fill(self):
+        while self.pending and len(self.running) < self.max_parallel:
+            item = self.pending.pop(0)
+            file_name = os.path.join(self.directory, f"{item}{self.extension}")
+            worker = ExportWorker(self.viewer, self.db_type, item, file_name)
+            worker.progress.connect(self.on_progress)
+            worker.finished.connect(self.on_finished)
+            self.running[worker] = [0, 0]
+            worker.start()
+
+        if not self.running:
+            self.finished.emit()
+
+    def emit_progress(self):
+        rows = self.done_rows + sum(entry[0] for entry in self.running.values())
+        written = self.done_bytes + sum(entry[1] for entry in self.running.values())
+        self.progress.emit(self.done_items, rows, written)
+
+    def on_progress(self, rows, written):
+        worker = self.sender()
+        if worker in self.running:
+            self.running[worker] = [rows, written]
+            self.emit_progress()
+
+    def on_finished(self):
+        worker = self.sender()
+        self.running.pop(worker)
+        worker.wait()
+        self.done_items += 1
+        self.done_rows += worker.rows
+        self.done_bytes += worker.bytes
+        if worker.cancelled:
+            self.log.emit(self.db_type, f"Export of {worker.item} cancelled", "WARN")
+        elif worker.error_message:
+            self.failed += 1
+            self.log.emit(self.db_type, f"Error saving CSV for {worker.item}: {worker.error_message}", "ERROR")
+        else:
+            self.log.emit(self.db_type, f"CSV file saved: {worker.file_name} ({worker.rows} rows)", "INFO")
+        self.emit_progress()
+        self.fill()
+
 
 class CsvViewerDialog(QDialog):
     def __init__(self, file_path):
@@ -416,6 +1032,7 @@ class MigrationReport(QDialog):
     def __init__(self, report_data):
         super().__init__()
         self.report_data = report_data
+        self.rows = {}  # item name -> table row
         self.init_ui()
 
     def init_ui(self):
@@ -426,9 +1043,9 @@ class MigrationReport(QDialog):
 
         # Create table widget
         self.table = QTableWidget()
-        self.table.setColumnCount(7)
+        self.table.setColumnCount(8)
         self.table.setHorizontalHeaderLabels([
-            "Item", "Records", "Result", "Migrated", "Failed", "Time", "Error"
+            "Item", "Records", "Result", "Migrated", "Failed", "Time", "Batch sizes", "Error"
         ])
         self.populate_table()
 
@@ -444,16 +1061,35 @@ class MigrationReport(QDialog):
     def populate_table(self):
         self.table.setRowCount(len(self.report_data['items']))
         for i, item in enumerate(self.report_data['items']):
-            self.table.setItem(i, 0, QTableWidgetItem(item['name']))
-            self.table.setItem(i, 1, QTableWidgetItem(str(item['records'])))
-            self.table.setItem(i, 2, QTableWidgetItem(item['result']))
-            self.table.setItem(i, 3, QTableWidgetItem(str(item['migrated'])))
-            self.table.setItem(i, 4, QTableWidgetItem(str(item['failed'])))
-            self.table.setItem(i, 5, QTableWidgetItem(str(timedelta(seconds=item['time']))))
-            self.table.setItem(i, 6, QTableWidgetItem(item['error']))
+            self.rows[item['name']] = i
+            self.set_row(i, item)
 
         self.table.resizeColumnsToContents()
 
+    def set_row(self, i, item):
+        self.table.setItem(i, 0, QTableWidgetItem(item['name']))
+        records = f"~{item['records']} (estimate)" if item.get('estimated') else str(item['records'])
+        self.table.setItem(i, 1, QTableWidgetItem(records))
+        self.table.setItem(i, 2, QTableWidgetItem(item['result']))
+        self.table.setItem(i, 3, QTableWidgetItem(str(item['migrated'])))
+        self.table.setItem(i, 4, QTableWidgetItem(str(item['failed'])))
+        self.table.setItem(i, 5, QTableWidgetItem(str(timedelta(seconds=int(item['time'])))))
+        self.table.setItem(i, 6, QTableWidgetItem(item.get('batch_sizes', '')))
+        self.table.setItem(i, 7, QTableWidgetItem(item['error']))
+
+    def update_item(self, name, item):
+        if name not in self.rows:
+            self.rows[name] = self.table.rowCount()
+            self.table.insertRow(self.rows[name])
+            self.report_data['items'].append(item)
+        else:
+            self.report_data['items'][self.rows[name]] = item
+        self.set_row(self.rows[name], item)
+        self.table.resizeColumnsToContents()
+
+    def set_total_time(self, seconds):
+        self.report_data['total_time'] = seconds
+
     def download_report(self):
         file_name, _ = QFileDialog.getSaveFileName(self, "Save Report", "migration_report.csv", "CSV Files (*.csv)")
         if file_name:
@@ -463,10 +1099,10 @@ class MigrationReport(QDialog):
                 writer.writerow([f"Total Items: {self.report_data['total_items']}"])
                 writer.writerow([f"Total Time: {timedelta(seconds=self.report_data['total_time'])}"])
                 writer.writerow([])
-                writer.writerow(["Item", "Records", "Result", "Migrated", "Failed", "Time", "Error"])
+                writer.writerow(["Item", "Records", "Result", "Migrated", "Failed", "Time", "Batch sizes", "Error"])
                 for item in self.report_data['items']:
                     writer.writerow([
                         item['name'], item['records'], item['result'], 
                         item['migrated'], item['failed'], 
-                        str(timedelta(seconds=item['time'])), item['error']
+                        str(timedelta(seconds=item['time'])), item.get('batch_sizes', ''), item['error']
                     ])
\ No newline at end of file
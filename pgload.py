@@ -0,0 +1,115 @@
+import csv
+import os
+
+
+# Python codec -> PostgreSQL client encoding for COPY
+COPY_ENCODINGS = {"utf-8": "UTF8", "utf-8-sig": "UTF8", "cp949": "UHC", "euc-kr": "EUC_KR"}
+
+# Tried in this order against every non-empty staged value; the first type all values match wins.
+# Integers are limited to 18 digits so they always fit BIGINT, longer ones keep every digit as NUMERIC.
+# Doubles take at most 15 integer digits, which they hold exactly; leading zeros (zip codes, ids) stay text.
+COLUMN_TYPES = [
+    ("BIGINT", "~ '^[+-]?(0|[1-9][0-9]{0,17})$'"),
+    ("NUMERIC", "~ '^[+-]?(0|[1-9][0-9]*)$'"),
+    ("DOUBLE PRECISION", "~ '^[+-]?((0|[1-9][0-9]{0,14})(\\.[0-9]*)?|\\.[0-9]+)([eE][+-]?[0-9]{1,2})?$'"),
+    ("BOOLEAN", "~* '^(true|false)$'"),
+]
+
+
+def read_header(file_name, encoding="utf-8-sig", dialect=csv.excel):
+    with open(file_name, "r", encoding=encoding, newline="") as f:
+        return [col.strip() for col in next(csv.reader(f, dialect), [])]
+
+
+def copy_literal(value):
+    return "'" + value.replace("'", "''") + "'"
+
+
+def copy_options(encoding, dialect):
+    quote = dialect.quotechar or '"'
+    # doublequote=False with no escapechar leaves no way to escape a quote; the sniffer reports that for
+    # samples that merely contain no doubled quotes, so those keep CSV's usual doubled-quote escaping
+    escape = dialect.escapechar or quote
+    options = ["FORMAT csv", "HEADER", f"DELIMITER {copy_literal(dialect.delimiter)}",
+               f"ENCODING {copy_literal(COPY_ENCODINGS.get(encoding, 'UTF8'))}",
+               f"QUOTE {copy_literal(quote)}", f"ESCAPE {copy_literal(escape)}"]
+    return ", ".join(options)
+
+
+def infer_column_types(cur, staging_table, columns):
+    """Narrowest type each column can be cast to, checked over all staged rows in one scan."""
+    checks = []
+    for col in columns:
+        value = f"""NULLIF("{col}", '')"""
+        checks.append(f"count({value})")
+        checks += [f"bool_and({value} {test})" for _, test in COLUMN_TYPES]
+    cur.execute(f'SELECT {", ".join(checks)} FROM "{staging_table}"')
+    row = cur.fetchone()
+
+    types = []
+    step = len(COLUMN_TYPES) + 1
+    for i in range(len(columns)):
+        count, fits = row[i * step], row[i * step + 1:(i + 1) * step]
+        types.append(next((name for (name, _), fit in zip(COLUMN_TYPES, fits) if count and fit), "TEXT"))
+    return types
+
+
+def table_column_types(cur, table_name):
+    cur.execute("""
+        SELECT attname, format_type(atttypid, atttypmod)
+        FROM pg_attribute
+        WHERE attrelid = to_regclass(%s) AND attnum > 0 AND NOT attisdropped
+    """, (f'"{table_name}"',))
+    return dict(cur.fetchall())
+
+
+def load_csv(conn, file_name, table_name, encoding="utf-8-sig", dialect=csv.excel, index_columns=(), log=print):
+    """Load a CSV file into a typed table: COPY into an UNLOGGED staging table of TEXT columns,
+    cast into the final table with a single INSERT ... SELECT, then build indexes on index_columns.
+
+    A new table gets the narrowest type that fits every value of each column; an existing table
+    keeps its column types and the rows are appended. Everything runs in one transaction, so a
+    failed load leaves nothing behind. Returns the number of rows loaded."""
+    columns = read_header(file_name, encoding, dialect)
+    if not columns:
+        raise ValueError(f"No header found in {file_name}")
+    staging_table = f"{table_name}__staging"
+    column_list = ", ".join(f'"{col}"' for col in columns)
+    text_columns = ", ".join(f'"{col}" TEXT' for col in columns)
+
+    try:
+        with conn.cursor() as cur:
+            cur.execute(f'DROP TABLE IF EXISTS "{staging_table}"')
+            cur.execute(f'CREATE UNLOGGED TABLE "{staging_table}" ({text_columns})')
+            with open(file_name, "rb") as f:
+                cur.copy_expert(f'COPY "{staging_table}" ({column_list}) FROM STDIN '
+                                f'WITH ({copy_options(encoding, dialect)})', f)
+            log(f"Staged {cur.rowcount} rows from {os.path.basename(file_name)}")
+
+            existing = table_column_types(cur, table_name)
+            if existing:
+                missing = [col for col in columns if col not in existing]
+                if missing:
+                    raise ValueError(f"Columns not in table {table_name}: {', '.join(missing)}")
+                types = [existing[col] for col in columns]
+            else:
+                types = infer_column_types(cur, staging_table, columns)
+                typed_columns = ", ".join(f'"{col}" {col_type}' for col, col_type in zip(columns, types))
+                cur.execute(f'CREATE TABLE "{table_name}" ({typed_columns})')
+                log(f"Created table {table_name} ({typed_columns})")
+
+            casts = ", ".join(f"""NULLIF("{col}", '')::{col_type}""" for col, col_type in zip(columns, types))
+            cur.execute(f'INSERT INTO "{table_name}" ({column_list}) SELECT {casts} FROM "{staging_table}"')
+            rows = cur.rowcount
+            cur.execute(f'DROP TABLE "{staging_table}"')
+
+            # Indexes are built once over the loaded rows instead of being maintained row by row
+            for col in index_columns:
+                cur.execute(f'CREATE INDEX IF NOT EXISTS "{table_name}_{col}_idx" ON "{table_name}" ("{col}")')
+                log(f"Created index on {table_name}.{col}")
+            cur.execute(f'ANALYZE "{table_name}"')
+    except Exception:
+        conn.rollback()
+        raise
+    conn.commit()
+    return rows
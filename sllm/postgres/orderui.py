@@ -10,6 +10,7 @@ from decimal import Decimal
 import psycopg2
 from psycopg2.extras import execute_values
 from neo4j import GraphDatabase
+import neo4j.exceptions
 
 # Data manipulation
 import pandas as pd
@@ -20,7 +21,7 @@ from PyQt6.QtWidgets import (
     QVBoxLayout, QHBoxLayout, QWidget, QTextEdit, 
     QLabel, QStatusBar, QMenuBar, QMenu, QTableWidgetItem,
     QHeaderView, QPushButton, QFileDialog, QMessageBox,
-    QPlainTextEdit, QDialog, QSizePolicy
+    QPlainTextEdit, QDialog, QSizePolicy, QInputDialog
 )
 from PyQt6.QtGui import QAction, QColor, QBrush, QFont, QTextCharFormat, QSyntaxHighlighter, QPainter
 from PyQt6.QtCore import Qt, QRegularExpression, QRect, QSize
@@ -486,22 +487,35 @@ class DatabaseViewer(QMainWindow):
             # Get the label name from the file name (without extension)
             label = os.path.splitext(os.path.basename(file_name))[0]
 
-            # Read the CSV file
-            df = pd.read_csv(file_name)
+            # Optional key column: uniqueness constraint, and rows are merged on it
+            columns = list(pd.read_csv(file_name, nrows=0).columns)
+            no_key = "(no key, create nodes)"
+            key, ok = QInputDialog.getItem(self, "Neo4j key", "Unique key column:", [no_key] + columns, 0, False)
+            key = key if ok and key != no_key else None
 
+            if key:
+                query = f"UNWIND $rows AS row MERGE (n:`{label}` {{`{key}`: row.`{key}`}}) SET n += row"
+            else:
+                query = f"UNWIND $rows AS row CREATE (n:`{label}`) SET n += row"
+
+            total = 0
             with self.neo4j_driver.session() as session:
                 # Clear existing nodes of this type
-                session.run(f"MATCH (n:{label}) DETACH DELETE n")
-
-                # Create nodes from DataFrame
-                for _, row in df.iterrows():
-                    properties = ', '.join([f"`{col}`: ${col}" for col in df.columns])
-                    cypher_query = f"""
-                    CREATE (:{label} {{{properties}}})
-                    """
-                    session.run(cypher_query, **row.to_dict())
-
-            self.log_message(f"CSV data uploaded to Neo4j as {label} nodes")
+                session.run(f"MATCH (n:`{label}`) DETACH DELETE n")
+                if key:
+                    try:
+                        session.run(f"CREATE CONSTRAINT IF NOT EXISTS FOR (n:`{label}`) REQUIRE n.`{key}` IS UNIQUE").consume()
+                    except neo4j.exceptions.CypherSyntaxError:
+                        # Neo4j before 4.4 only knows the older syntax
+                        session.run(f"CREATE CONSTRAINT ON (n:`{label}`) ASSERT n.`{key}` IS UNIQUE").consume()
+
+                # Read the CSV in chunks and write each one with a single UNWIND in its own transaction
+                for chunk in pd.read_csv(file_name, chunksize=10000):
+                    rows = chunk.astype(object).where(chunk.notna(), None).to_dict('records')
+                    session.execute_write(lambda tx: tx.run(query, rows=rows).consume())
+                    total += len(rows)
+
+            self.log_message(f"CSV data uploaded to Neo4j as {total} {label} nodes")
             self.update_status(f"Neo4j upload complete: {label}", "#A0A0A0")
         except Exception as e:
             self.log_message(f"Error uploading to Neo4j: {str(e)}")